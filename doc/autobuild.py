@@ -49,6 +49,7 @@ import kivy.modules.screen
 import kivy.storage
 import kivy.storage.dictstore
 import kivy.storage.jsonstore
+import kivy.storage.logstore
 import kivy.storage.redisstore
 import kivy.network.urlrequest
 import kivy.modules.webdebugger
@@ -73,6 +73,19 @@ To set an animation to repeat simply set the :data:`Sequence.repeat` property to
 
 For flow control of animations such as stopping and cancelling use the methods
 already in place in the animation module.
+
+Animation driver
+----------------
+
+.. versionadded:: 1.8.0
+
+All the running animations having the same `step` are updated from one
+:class:`~kivy.clock.Clock` event, instead of one event per animation. The
+start and end values of the animated properties are prepared when the
+animation starts: numbers and flat lists or tuples of numbers (like `pos`,
+`size` or a color) are interpolated without inspecting their type on each
+frame, and the transition is computed once for all the widgets started at the
+same time.
 '''
 
 __all__ = ('Animation', 'AnimationTransition')
@@ -110,6 +123,9 @@ class Animation(EventDispatcher):
 
     _instances = set()
 
+    # step -> _AnimationDriver
+    _drivers = {}
+
     __events__ = ('on_start', 'on_progress', 'on_complete')
 
     def __init__(self, **kw):
@@ -126,6 +142,9 @@ class Animation(EventDispatcher):
             kw.pop(key, None)
         self._animated_properties = kw
         self._widgets = {}
+        # the values can be interpolated without _calculate(), unless a
+        # subclass have its own
+        self._linear = type(self)._calculate == Animation._calculate
 
     @property
     def duration(self):
@@ -276,6 +295,7 @@ class Animation(EventDispatcher):
         p = d['properties']
         for key, value in self._animated_properties.items():
             p[key] = (getattr(widget, key), value)
+        d['flat'] = self._flatten(p)
 
         # install clock
         self._clock_install()
@@ -283,21 +303,55 @@ class Animation(EventDispatcher):
     def _clock_install(self):
         if self._clock_installed:
             return
-        Clock.schedule_interval(self._update, self._step)
+        driver = Animation._drivers.get(self._step)
+        if driver is None:
+            driver = Animation._drivers[self._step] = \
+                _AnimationDriver(self._step)
+        driver.add(self)
         self._clock_installed = True
 
     def _clock_uninstall(self):
         if self._widgets or not self._clock_installed:
             return
         self._clock_installed = False
-        Clock.unschedule(self._update)
+        driver = Animation._drivers.get(self._step)
+        if driver is not None:
+            driver.remove(self)
+
+    def _flatten(self, properties):
+        # prepare the interpolation of each property: (kind, a, b) where kind
+        # is 0 for a number, 1 for a flat list/tuple (a is the type, b the
+        # list of (start, end)), or 2 for anything else, left to _calculate()
+        flat = {}
+        if not self._linear:
+            for key, (a, b) in properties.items():
+                flat[key] = (2, a, b)
+            return flat
+        containers = (list, tuple, dict)
+        for key, (a, b) in properties.items():
+            if not isinstance(a, containers):
+                flat[key] = (0, a, b)
+            elif isinstance(a, dict) or \
+                    [x for x in a if isinstance(x, containers)]:
+                flat[key] = (2, a, b)
+            else:
+                flat[key] = (1, list if isinstance(a, list) else tuple,
+                             list(zip(a, b)))
+        return flat
 
     def _update(self, dt):
         widgets = self._widgets
         transition = self._transition
         calculate = self._calculate
-        for uid in list(widgets.keys())[:]:
-            anim = widgets[uid]
+        duration = self._duration
+        # (time -> progress, t), the widgets started at the same time share
+        # the transition
+        progressions = {}
+        for uid in list(widgets.keys()):
+            anim = widgets.get(uid)
+            if anim is None:
+                # stopped by a previous callback
+                continue
             widget = anim['widget']
             if anim['time'] is None:
                 anim['time'] = 0.
@@ -305,13 +359,25 @@ class Animation(EventDispatcher):
                 anim['time'] += dt
 
             # calculate progression
-            progress = min(1., anim['time'] / self._duration)
-            t = transition(progress)
+            progression = progressions.get(anim['time'])
+            if progression is None:
+                progress = min(1., anim['time'] / duration)
+                progression = progressions[anim['time']] = \
+                    progress, transition(progress)
+            progress, t = progression
+            u = 1. - t
 
             # apply progression on widget
-            for key, values in anim['properties'].items():
-                a, b = values
-                value = calculate(a, b, t)
+            properties = anim['properties']
+            flat = anim['flat']
+            for key in list(properties.keys()):
+                kind, a, b = flat[key]
+                if kind == 0:
+                    value = (a * u) + (b * t)
+                elif kind == 1:
+                    value = a([(x * u) + (y * t) for x, y in b])
+                else:
+                    value = calculate(a, b, t)
                 setattr(widget, key, value)
 
             self.dispatch('on_progress', widget, progress)
@@ -360,6 +426,32 @@ class Animation(EventDispatcher):
         return Parallel(self, animation)
 
 
+class _AnimationDriver(object):
+    # Update all the animations with the same step from one Clock event
+
+    def __init__(self, step):
+        super(_AnimationDriver, self).__init__()
+        self.step = step
+        self.animations = set()
+
+    def add(self, animation):
+        if not self.animations:
+            Clock.schedule_interval(self.tick, self.step)
+        self.animations.add(animation)
+
+    def remove(self, animation):
+        self.animations.discard(animation)
+        if not self.animations:
+            Clock.unschedule(self.tick)
+
+    def tick(self, dt):
+        animations = self.animations
+        for animation in list(animations):
+            # the animation might have been stopped by a previous one
+            if animation in animations:
+                animation._update(dt)
+
+
 class Sequence(Animation):
 
     def __init__(self, anim1, anim2):
@@ -3,8 +3,8 @@ Cache manager
 =============
 
 The cache manager can be used to store python object attached to an uniq key.
-The cache can be controlled in different manner, with a object limit or a
-timeout.
+The cache can be controlled in different manner, with a object limit, a
+size limit or a timeout.
 
 For example, we can create a new cache with a limit of 10 objects and a timeout
 of 5 seconds::
@@ -22,24 +22,55 @@ of 5 seconds::
 
 If the instance is NULL, the cache may have trash it, because you've
 not used the label since 5 seconds, and you've reach the limit.
+
+.. versionchanged:: 1.8.0
+    Each category is a LRU cache: when the `limit` (number of objects) or the
+    `size_limit` (in bytes) is reached, the least recently used objects are
+    evicted. The hits, misses and evictions are counted, check
+    :meth:`Cache.get_stats`.
 '''
 
 __all__ = ('Cache', )
 
 from os import environ
+from collections import OrderedDict
+from heapq import heappush, heappop
+from time import time
 from kivy.logger import Logger
 from kivy.clock import Clock
 
 
+def _get_size(obj):
+    # size hint in bytes of an object, available on Texture and ImageData
+    try:
+        return int(getattr(obj, 'cache_size', 0))
+    except Exception:
+        return 0
+
+
 class Cache(object):
     '''See module documentation for more information.
     '''
 
     _categories = {}
     _objects = {}
+    _stats = {}
+    # heap of (expiration time, seq, category, key), ordered by
+    # lastaccess + timeout at the time the entry was pushed. The item keeps
+    # the seq of its last entry, the others are outdated.
+    _expiry = []
+    _expiry_seq = 0
+    _expiry_pending = False
+
+    #: Maximum time (in seconds) spent on each frame to remove the objects
+    #: with an expired timeout. If there is more to remove, the work continues
+    #: on the next frame.
+    #:
+    #: .. versionadded:: 1.8.0
+    purge_budget = 0.002
 
     @staticmethod
-    def register(category, limit=None, timeout=None):
+    def register(category, limit=None, timeout=None, size_limit=None):
         '''Register a new category in cache, with limit
 
         :Parameters:
@@ -51,16 +82,33 @@ class Cache(object):
             `timeout` : double (optionnal)
                 Time to delete the object when it's not used.
                 if None, no timeout is applied.
+            `size_limit` : int (optionnal)
+                Maximum size of the objects in the cache, in bytes. The size
+                of an object is given by its `cache_size` attribute (available
+                on :class:`~kivy.graphics.texture.Texture` and
+                :class:`~kivy.core.image.ImageData`), or by the `size`
+                parameter of :meth:`append`.
+                If None, no size limit is applied.
+
+        .. versionchanged:: 1.8.0
+            `size_limit` parameter added.
         '''
         Cache._categories[category] = {
             'limit': limit,
-            'timeout': timeout}
-        Cache._objects[category] = {}
-        Logger.debug('Cache: register <%s> with limit=%s, timeout=%ss' %
-            (category, str(limit), str(timeout)))
+            'timeout': timeout,
+            'size_limit': size_limit}
+        Cache._objects[category] = OrderedDict()
+        Cache._stats[category] = {
+            'size': 0,
+            'hits': 0,
+            'misses': 0,
+            'evictions': 0}
+        Logger.debug('Cache: register <%s> with limit=%s, timeout=%ss, '
+            'size_limit=%s' % (category, str(limit), str(timeout),
+            str(size_limit)))
 
     @staticmethod
-    def append(category, key, obj, timeout=None):
+    def append(category, key, obj, timeout=None, size=None):
         '''Add a new object in the cache.
 
         :Parameters:
@@ -72,6 +120,13 @@ class Cache(object):
                 Object to store in cache
             `timeout` : double (optionnal)
                 Custom time to delete the object if it's not used.
+            `size` : int (optionnal)
+                Size of the object in bytes. If None, the `cache_size`
+                attribute of the object is used, if any.
+
+        .. versionchanged:: 1.8.0
+            `size` parameter added. If the category limits are reached, the
+            least recently used objects are removed from the cache.
         '''
         #check whether obj should not be cached first
         if getattr(obj, '_no_cache', False):
@@ -82,15 +137,28 @@ class Cache(object):
             Logger.warning('Cache: category <%s> not exist' % category)
             return
         timeout = timeout or cat['timeout']
-        # FIXME: activate purge when limit is hit
-        #limit = cat['limit']
-        #if limit is not None and len(Cache._objects[category]) >= limit:
-        #    Cache._purge_oldest(category)
-        Cache._objects[category][key] = {
+        if size is None:
+            size = _get_size(obj)
+        objects = Cache._objects[category]
+        stats = Cache._stats[category]
+        old = objects.pop(key, None)
+        if old is not None:
+            stats['size'] -= old['size']
+        item = objects[key] = {
             'object': obj,
             'timeout': timeout,
+            'size': size,
             'lastaccess': Clock.get_time(),
             'timestamp': Clock.get_time()}
+        stats['size'] += size
+        if timeout is not None:
+            Cache._push_expiry(category, key, item)
+
+        limit = cat['limit']
+        size_limit = cat['size_limit']
+        if (limit is not None and len(objects) > limit) or \
+                (size_limit is not None and stats['size'] > size_limit):
+            Cache._purge_oldest(category)
 
     @staticmethod
     def get(category, key, default=None):
@@ -105,10 +173,18 @@ class Cache(object):
                 Default value to be returned if key is not found
         '''
         try:
-            Cache._objects[category][key]['lastaccess'] = Clock.get_time()
-            return Cache._objects[category][key]['object']
+            objects = Cache._objects[category]
+            item = objects.pop(key)
         except Exception:
+            stats = Cache._stats.get(category)
+            if stats is not None:
+                stats['misses'] += 1
             return default
+        # move the object at the end: it is now the most recently used
+        objects[key] = item
+        item['lastaccess'] = Clock.get_time()
+        Cache._stats[category]['hits'] += 1
+        return item['object']
 
     @staticmethod
     def get_timestamp(category, key, default=None):
@@ -156,75 +232,128 @@ class Cache(object):
         '''
         try:
             if key is not None:
-                del Cache._objects[category][key]
+                item = Cache._objects[category].pop(key)
+                Cache._stats[category]['size'] -= item['size']
             else:
-                Cache._objects[category] = {}
+                Cache._objects[category] = OrderedDict()
+                Cache._stats[category]['size'] = 0
         except Exception:
             pass
 
     @staticmethod
-    def _purge_oldest(category, maxpurge=1):
-        print('PURGE', category)
-        import heapq
-        heap_list = []
-        for key in Cache._objects[category]:
-            obj = Cache._objects[category][key]
-            if obj['lastaccess'] == obj['timestamp']:
-                continue
-            heapq.heappush(heap_list, (obj['lastaccess'], key))
-            print('<<<', obj['lastaccess'])
-        n = 0
-        while n < maxpurge:
-            try:
-                lastaccess, key = heapq.heappop(heap_list)
-                print('=>', key, lastaccess, Clock.get_time())
-            except Exception:
-                return
-            del Cache._objects[category][key]
+    def get_stats(category=None):
+        '''Get the usage statistics of a category, as a dict with the keys:
+
+            - `count`: number of objects in the cache
+            - `size`: size of the objects in the cache, in bytes
+            - `limit`, `size_limit`, `timeout`: the category settings
+            - `hits`, `misses`: number of successful / failed :meth:`get`
+            - `hit_rate`: ratio of successful :meth:`get`, from 0 to 1
+            - `evictions`: number of objects removed because a limit was hit
+
+        If `category` is None, return a dict of the statistics for all the
+        categories.
+
+        .. versionadded:: 1.8.0
+        '''
+        if category is None:
+            return dict([(x, Cache.get_stats(x)) for x in Cache._categories])
+        cat = Cache._categories[category]
+        stats = dict(Cache._stats[category])
+        stats['count'] = len(Cache._objects[category])
+        stats['limit'] = cat['limit']
+        stats['size_limit'] = cat['size_limit']
+        stats['timeout'] = cat['timeout']
+        total = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / float(total) if total else 0.
+        return stats
 
     @staticmethod
-    def _purge_by_timeout(dt):
-        curtime = Clock.get_time()
+    def reset_stats(category=None):
+        '''Reset the hits, misses and evictions counters of a category, or
+        of all the categories if `category` is None.
 
-        for category in Cache._objects:
-            if category not in Cache._categories:
-                continue
-            timeout = Cache._categories[category]['timeout']
-            if timeout is not None and dt > timeout:
-                # XXX got a lag ! that may be because the frame take lot of
-                # time to draw. and the timeout is not adapted to the current
-                # framerate. So, increase the timeout by two.
-                # ie: if the timeout is 1 sec, and framerate go to 0.7, newly
-                # object added will be automaticly trashed.
-                timeout *= 2
-                Cache._categories[category]['timeout'] = timeout
-                continue
+        .. versionadded:: 1.8.0
+        '''
+        categories = Cache._stats.keys() if category is None else (category, )
+        for category in categories:
+            stats = Cache._stats[category]
+            stats['hits'] = stats['misses'] = stats['evictions'] = 0
 
-            for key in list(Cache._objects[category].keys())[:]:
-                lastaccess = Cache._objects[category][key]['lastaccess']
-                objtimeout = Cache._objects[category][key]['timeout']
+    @staticmethod
+    def _update_size(category):
+        # recalculate the size of a category, after its objects have been
+        # changed without going through append/remove.
+        Cache._stats[category]['size'] = sum(
+            [x['size'] for x in Cache._objects[category].values()])
 
-                # take the object timeout if available
-                if objtimeout is not None:
-                    timeout = objtimeout
+    @staticmethod
+    def _purge_oldest(category):
+        # remove the least recently used objects until the category is within
+        # its limits. The most recent object is never removed.
+        cat = Cache._categories[category]
+        limit = cat['limit']
+        size_limit = cat['size_limit']
+        objects = Cache._objects[category]
+        stats = Cache._stats[category]
+        while len(objects) > 1:
+            if (limit is None or len(objects) <= limit) and \
+                    (size_limit is None or stats['size'] <= size_limit):
+                break
+            key, item = objects.popitem(last=False)
+            stats['size'] -= item['size']
+            stats['evictions'] += 1
 
-                # no timeout, cancel
-                if timeout is None:
-                    continue
+    @staticmethod
+    def _push_expiry(category, key, item):
+        # the entry doesn't reference the item, a replaced or removed object
+        # must not be kept alive until its expiration time.
+        Cache._expiry_seq += 1
+        item['expiry_seq'] = Cache._expiry_seq
+        heappush(Cache._expiry, (item['lastaccess'] + item['timeout'],
+            Cache._expiry_seq, category, key))
 
-                if curtime - lastaccess > timeout:
-                    del Cache._objects[category][key]
+    @staticmethod
+    def _purge_by_timeout(*largs):
+        # the expiry index is only ordered by the lastaccess known when the
+        # entry was pushed: an object accessed since then is pushed back with
+        # its new expiration time. Entries of removed or replaced objects are
+        # dropped.
+        Cache._expiry_pending = False
+        curtime = Clock.get_time()
+        deadline = time() + Cache.purge_budget
+        expiry = Cache._expiry
+        objects = Cache._objects
+        while expiry and expiry[0][0] < curtime:
+            if time() > deadline:
+                # out of budget, continue on the next frame
+                if not Cache._expiry_pending:
+                    Cache._expiry_pending = True
+                    Clock.schedule_once(Cache._purge_by_timeout)
+                return
+            expire, seq, category, key = heappop(expiry)
+            item = objects.get(category, {}).get(key)
+            if item is None or item.get('expiry_seq') != seq:
+                continue
+            if curtime - item['lastaccess'] > item['timeout']:
+                Cache.remove(category, key)
+            else:
+                Cache._push_expiry(category, key, item)
 
     @staticmethod
     def print_usage():
         '''Print the cache usage on the console'''
         print('Cache usage :')
         for category in Cache._categories:
-            print(' * %s : %d / %s, timeout=%s' % (
-                category.capitalize(),
-                len(Cache._objects[category]),
-                str(Cache._categories[category]['limit']),
-                str(Cache._categories[category]['timeout'])))
+            stats = Cache.get_stats(category)
+            print(' * %s : %d / %s, size=%d / %s, timeout=%s, hits=%d, '
+                  'misses=%d, hit rate=%d%%, evictions=%d' % (
+                      category.capitalize(),
+                      stats['count'], str(stats['limit']),
+                      stats['size'], str(stats['size_limit']),
+                      str(stats['timeout']),
+                      stats['hits'], stats['misses'], stats['hit_rate'] * 100,
+                      stats['evictions']))
 
 if 'KIVY_DOC_INCLUDE' not in environ:
     # install the schedule clock for purging
@@ -163,6 +163,8 @@ from kivy.context import register_context
 from kivy.weakmethod import WeakMethod
 from kivy.config import Config
 from kivy.logger import Logger
+from heapq import heappush, heappop, heapify
+from itertools import count
 import time
 
 try:
@@ -236,18 +238,17 @@ class ClockEvent(object):
         self._is_triggered = False
         self._last_dt = starttime
         self._dt = 0.
+        # sequence number of the live entry in the clock scheduler, None when
+        # the event is not scheduled.
+        self._seq = None
 
     def __call__(self, *largs):
         # if the event is not yet triggered, do it !
         if self._is_triggered is False:
             self._is_triggered = True
-            events = self.clock._events
-            cid = self.cid
-            if cid not in events:
-                events[cid] = []
-            events[cid].append(self)
             # update starttime
             self._last_dt = self.clock._last_tick
+            self.clock._schedule_event(self)
             return True
 
     def get_callback(self):
@@ -263,12 +264,17 @@ class ClockEvent(object):
     def is_triggered(self):
         return self._is_triggered
 
+    @property
+    def deadline(self):
+        '''Time at which the event is due.
+
+        .. versionadded:: 1.8.0
+        '''
+        return self._last_dt + self.timeout
+
     def cancel(self):
         if self._is_triggered:
-            events = self.clock._events
-            cid = self.cid
-            if cid in events and self in events[cid]:
-                events[cid].remove(self)
+            self.clock._unschedule_event(self)
         self._is_triggered = False
 
     def do(self, dt):
@@ -322,10 +328,16 @@ class ClockEvent(object):
 
 class ClockBase(_ClockBase):
     '''A clock object with event support
+
+    .. versionchanged:: 1.8.0
+        Events are kept in a min-heap ordered by their deadline. Only the
+        events that are due are touched on each :meth:`tick`, and scheduling
+        or unscheduling an event costs O(log n) instead of O(n).
     '''
     __slots__ = ('_dt', '_last_fps_tick', '_last_tick', '_fps', '_rfps',
                  '_start_tick', '_fps_counter', '_rfps_counter', '_events',
-                 '_max_fps', 'max_iteration')
+                 '_max_fps', 'max_iteration', '_heap', '_before_frame',
+                 '_new_events', '_seq')
 
     MIN_SLEEP = 0.005
     SLEEP_UNDERSHOOT = MIN_SLEEP - 0.001
@@ -339,7 +351,16 @@ class ClockBase(_ClockBase):
         self._fps_counter = 0
         self._rfps_counter = 0
         self._last_fps_tick = None
+        # cid -> set of scheduled events, used to unschedule by callback
         self._events = {}
+        # min-heap of (deadline, seq, event) for the events with a timeout >= 0
+        self._heap = []
+        # list of (seq, event) for the events with a timeout of -1
+        self._before_frame = []
+        # events scheduled since the last tick, waiting for their release
+        self._new_events = []
+        # next(count) is atomic, triggers can be called from other threads
+        self._seq = count(1)
         self._max_fps = float(Config.getint('graphics', 'maxfps'))
 
         #: .. versionadded:: 1.0.5
@@ -424,6 +445,13 @@ class ClockBase(_ClockBase):
         '''Get time in seconds from the application start'''
         return self._last_tick - self._start_tick
 
+    def get_events_count(self):
+        '''Get the number of events currently scheduled.
+
+        .. versionadded:: 1.8.0
+        '''
+        return sum([len(x) for x in self._events.values()])
+
     def create_trigger(self, callback, timeout=0):
         '''Create a Trigger event. Check module documentation for more
         information.
@@ -447,10 +475,7 @@ class ClockBase(_ClockBase):
             raise ValueError('callback must be a callable, got %s' % callback)
         cid = _hash(callback)
         event = ClockEvent(self, False, callback, timeout, self._last_tick, cid)
-        events = self._events
-        if not cid in events:
-            events[cid] = []
-        events[cid].append(event)
+        self._schedule_event(event)
         return event
 
     def schedule_interval(self, callback, timeout):
@@ -459,38 +484,59 @@ class ClockBase(_ClockBase):
             raise ValueError('callback must be a callable, got %s' % callback)
         cid = _hash(callback)
         event = ClockEvent(self, True, callback, timeout, self._last_tick, cid)
-        events = self._events
-        if not cid in events:
-            events[cid] = []
-        events[cid].append(event)
+        self._schedule_event(event)
         return event
 
     def unschedule(self, callback):
         '''Remove a previously scheduled event.
         '''
-        events = self._events
         if isinstance(callback, ClockEvent):
-            # already done, nothing to schedule
-            if callback.is_done:
-                return
-            cid = callback.cid
-            if cid in events:
-                for event in events[cid][:]:
-                    if event is callback:
-                        events[cid].remove(event)
+            self._unschedule_event(callback)
+            callback._is_triggered = False
+            return
+        events = self._events.get(_hash(callback))
+        if not events:
+            return
+        for event in list(events):
+            if event.get_callback() == callback:
+                self._unschedule_event(event)
+                event._is_triggered = False
+
+    def _schedule_event(self, event):
+        # register the event by cid (for unschedule), and push it in the heap
+        # or in the before frame list, depending of the timeout.
+        events = self._events
+        cid = event.cid
+        if cid not in events:
+            events[cid] = set()
+        events[cid].add(event)
+        if event.callback is not None:
+            self._new_events.append(event)
+        self._push_event(event)
+
+    def _push_event(self, event):
+        seq = event._seq = next(self._seq)
+        if event.timeout == -1:
+            self._before_frame.append((seq, event))
         else:
-            cid = _hash(callback)
-            if cid in events:
-                for event in events[cid][:]:
-                    if event.get_callback() == callback:
-                        events[cid].remove(event)
+            heappush(self._heap, (event._last_dt + event.timeout, seq, event))
+
+    def _unschedule_event(self, event):
+        # the heap entry is not removed: it will be discarded when popped,
+        # because its sequence number doesn't match the event anymore.
+        event._seq = None
+        events = self._events.get(event.cid)
+        if events is not None:
+            events.discard(event)
 
     def _release_references(self):
         # call that function to release all the direct reference to any callback
         # and replace it with a weakref
-        events = self._events
-        for cid in list(events.keys())[:]:
-            [x.release() for x in events[cid] if x.callback is not None]
+        new_events = self._new_events
+        if not new_events:
+            return
+        self._new_events = []
+        [x.release() for x in new_events if x.callback is not None]
 
     def _remove_empty(self):
         # remove empty entry in the event list
@@ -498,20 +544,45 @@ class ClockBase(_ClockBase):
         for cid in list(events.keys())[:]:
             if not events[cid]:
                 del events[cid]
+        # drop the cancelled entries of the heap if they are dominating it
+        heap = self._heap
+        if len(heap) > 2 * self.get_events_count() + 64:
+            heap[:] = [x for x in heap if x[2]._seq == x[1]]
+            heapify(heap)
+
+    def _tick_event(self, event, seq):
+        if event.tick(self._last_tick) is False:
+            # the event may be already removed or rescheduled by the callback
+            if event._seq == seq:
+                self._unschedule_event(event)
+            return False
+        if event._seq == seq:
+            self._push_event(event)
+        return True
 
     def _process_events(self):
-        events = self._events
-        for cid in list(events.keys())[:]:
-            for event in events[cid][:]:
-                if event.tick(self._last_tick) is False:
-                    # event may be already removed by the callback
-                    if event in events[cid]:
-                        events[cid].remove(event)
+        # pop all the due events before calling any of them, so events
+        # scheduled from a callback will be processed on the next frame.
+        heap = self._heap
+        limit = self._last_tick + 0.005
+        due = []
+        while heap and heap[0][0] <= limit:
+            deadline, seq, event = heappop(heap)
+            if event._seq == seq:
+                due.append((seq, event))
+        before_frame = self._before_frame
+        if before_frame:
+            self._before_frame = []
+            due = before_frame + due
+
+        tick_event = self._tick_event
+        for seq, event in due:
+            if event._seq == seq:
+                tick_event(event, seq)
 
     def _process_events_before_frame(self):
         found = True
         count = self.max_iteration
-        events = self._events
         while found:
             count -= 1
             if count == -1:
@@ -520,17 +591,18 @@ class ClockBase(_ClockBase):
                                 ' the Clock.max_iteration attribute')
                 break
 
-            # search event that have timeout = -1
+            # process the events that have timeout = -1
             found = False
-            for cid in list(events.keys())[:]:
-                for event in events[cid][:]:
-                    if event.timeout != -1:
-                        continue
-                    found = True
-                    if event.tick(self._last_tick) is False:
-                        # event may be already removed by the callback
-                        if event in events[cid]:
-                            events[cid].remove(event)
+            pending = self._before_frame
+            if not pending:
+                break
+            self._before_frame = []
+            tick_event = self._tick_event
+            for seq, event in pending:
+                if event._seq != seq:
+                    continue
+                found = True
+                tick_event(event, seq)
 
 
 def mainthread(func):
@@ -104,6 +104,19 @@ class ImageData(object):
     def have_mipmap(self):
         return len(self.mipmaps) > 1
 
+    @property
+    def cache_size(self):
+        '''Size of the image data for all the mipmaps, in bytes. Used as a
+        size hint by the :class:`~kivy.cache.Cache`.
+
+        .. versionadded:: 1.8.0
+        '''
+        size = 0
+        for item in self.mipmaps.values():
+            if item[2] is not None:
+                size += len(item[2])
+        return size
+
     def __repr__(self):
         return ('<ImageData width=%d height=%d fmt=%s '
                 'source=%r with %d images>' % (
@@ -158,6 +171,15 @@ class ImageLoaderBase(object):
         '''Load an image'''
         return None
 
+    @property
+    def cache_size(self):
+        '''Size of the image data kept in memory, in bytes. Used as a size
+        hint by the :class:`~kivy.cache.Cache`.
+
+        .. versionadded:: 1.8.0
+        '''
+        return sum([x.cache_size for x in self._data or []])
+
     @staticmethod
     def can_save():
         '''Indicate if the loader can save the Image object
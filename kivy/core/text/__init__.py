@@ -11,13 +11,22 @@ of text rendering may vary.
 .. versionchanged:: 1.0.7
     The :class:`LabelBase` does not generate any texture if the text has a
     width <= 1.
+
+.. versionchanged:: 1.8.0
+    The labels with the same text and options share the same texture. The
+    textures in use are kept in the `kv.text` category of the
+    :class:`~kivy.cache.Cache`, check :meth:`LabelBase.get_cache_stats`.
 '''
 
 __all__ = ('LabelBase', 'Label')
 
 import re
 import os
+from bisect import bisect_right
+from copy import copy
+from weakref import ref
 from kivy import kivy_data_dir
+from kivy.cache import Cache
 from kivy.graphics.texture import Texture
 from kivy.core import core_select_lib
 from kivy.resources import resource_find
@@ -30,6 +39,65 @@ FONT_ITALIC = 1
 FONT_BOLD = 2
 FONT_BOLDITALIC = 3
 
+# rendered textures shared between the labels. An entry is removed when the
+# last label using it releases it, so the category has no limit.
+Cache.register('kv.text')
+
+# options that change the rendered texture
+_texture_options = ('font_size', 'font_name_r', 'bold', 'italic', 'halign',
+                    'valign', 'shorten', 'mipmap', 'line_height', 'color',
+                    'padding_x', 'padding_y')
+
+
+class _SharedTexture(object):
+    # a rendered texture, and the weak references to the labels using it.
+    # `shared` is set as soon as two labels used it: the texture may then be
+    # held outside of the labels, and is never rendered again with a new text.
+
+    __slots__ = ('texture', 'key', 'renderer', 'users', 'shared',
+                 '__weakref__')
+
+    def __init__(self, texture, key, renderer):
+        self.texture = texture
+        self.users = set()
+        self.shared = False
+        self.set_content(key, renderer)
+        # one observer for all the labels using the texture
+        texture.add_reload_observer(self._reload)
+
+    @property
+    def cache_size(self):
+        return self.texture.cache_size
+
+    def set_content(self, key, renderer):
+        # render the texture from a copy of the label
+        self.key = key
+        self.renderer = renderer
+        self.texture.ask_update(renderer._texture_fill)
+        Cache.append('kv.text', key, self)
+
+    def acquire(self, label):
+        if self.users:
+            self.shared = True
+        label_ref = ref(label, self.release)
+        self.users.add(label_ref)
+        return label_ref
+
+    def release(self, label_ref):
+        # also called when a label using the texture is garbage collected
+        self.users.discard(label_ref)
+        if not self.users:
+            self.uncache()
+
+    def uncache(self):
+        # don't remove a newer entry registered with the same key
+        item = Cache._objects['kv.text'].get(self.key)
+        if item is not None and item['object'] is self:
+            Cache.remove('kv.text', self.key)
+
+    def _reload(self, texture):
+        texture.ask_update(self.renderer._texture_fill)
+
 
 class LabelBase(object):
     '''Core text label.
@@ -75,18 +143,35 @@ class LabelBase(object):
             unexpected results.
         `mipmap` : bool, default to False
             Create a mipmap for the texture
+
+    .. versionchanged:: 1.8.0
+        The texture can be shared with other labels: it must not be modified.
     '''
 
     __slots__ = ('options', 'texture', '_label', '_text_size')
 
     _cache_glyphs = {}
 
+    _cache_words = {}
+
     _fonts = {}
 
     _fonts_cache = {}
 
     _texture_1px = None
 
+    #: If True, the texture is shared with the other labels having the same
+    #: text and options.
+    #:
+    #: .. versionadded:: 1.8.0
+    share_texture = True
+
+    #: Maximum number of word extents cached per font, used for wrapping the
+    #: text when the width of :data:`text_size` is set.
+    #:
+    #: .. versionadded:: 1.8.0
+    words_cache_limit = 10000
+
     def __init__(self, text='', font_size=12, font_name=DEFAULT_FONT,
                  bold=False, italic=False, halign='left', valign='bottom',
                  shorten=False, text_size=None, mipmap=False, color=None,
@@ -120,9 +205,14 @@ class LabelBase(object):
 
         self._text = options['text']
         self._internal_height = 0
+        self._lines = []
+        self._wrap_cache = None
 
         self.options = options
         self.texture = None
+        self._shared = None
+        self._shared_ref = None
+        self._texture_key = None
         self.resolve_font_name()
 
     @staticmethod
@@ -224,6 +314,82 @@ class LabelBase(object):
             segment = max_letters - 3  # length of '...'
             return u'{0}...'.format(text[:segment].strip())
 
+    def _get_extents_cache(self):
+        # extents of the words already measured with the current font
+        fontid = self.fontid
+        cache = LabelBase._cache_words.get(fontid)
+        if cache is None or len(cache) > self.words_cache_limit:
+            cache = LabelBase._cache_words[fontid] = {}
+        return cache
+
+    def _wrap_text(self, text, uw):
+        # Return the lines of the text wrapped at the width uw, as a list of
+        # ((width, height), is_last_line, words, widths of the words). Each
+        # paragraph is wrapped independently: the ones that didn't change
+        # since the previous call are reused, so appending text to a long
+        # text only wraps the new paragraphs.
+        key = (uw, self.options['line_height'], self.fontid)
+        previous = self._wrap_cache
+        if previous is None or previous[0] != key:
+            previous = {}
+        else:
+            previous = previous[1]
+        paragraphs = {}
+        lines = []
+        for paragraph in text.split('\n'):
+            plines = paragraphs.get(paragraph)
+            if plines is None:
+                plines = previous.get(paragraph)
+                if plines is None:
+                    plines = self._wrap_paragraph(paragraph, uw)
+                paragraphs[paragraph] = plines
+            lines.extend(plines)
+        self._wrap_cache = (key, paragraphs)
+        return lines
+
+    def _wrap_paragraph(self, paragraph, uw):
+        cache = self._get_extents_cache()
+        get_extents = self.get_extents
+        line_height = self.options['line_height']
+
+        words = [x for x in re.split(r'( )', paragraph) if x]
+        if not words:
+            size = cache.get(' ')
+            if size is None:
+                size = cache[' '] = get_extents(' ')
+            return [((0, size[1] * line_height), 1, [], [])]
+
+        # cumulated widths of the words, for finding each line break with a
+        # binary search
+        widths = []
+        heights = []
+        cumulated = [0]
+        for word in words:
+            size = cache.get(word)
+            if size is None:
+                size = cache[word] = get_extents(word)
+            widths.append(size[0])
+            heights.append(size[1])
+            cumulated.append(cumulated[-1] + size[0])
+
+        lines = []
+        count = len(words)
+        start = 0
+        while start < count:
+            end = bisect_right(cumulated, cumulated[start] + uw, start + 1) - 1
+            if end == start:
+                # the word is larger than the line, put it alone
+                end += 1
+            lh = max(heights[start:end]) * line_height
+            lines.append(((cumulated[end] - cumulated[start], lh),
+                          1 if end == count else 0,
+                          words[start:end], widths[start:end]))
+            start = end
+            # the space where the line is broken is not rendered
+            if start < count and words[start] == ' ':
+                start += 1
+        return lines
+
     def render(self, real=False):
         '''Return a tuple (width, height) to create the image
         with the user constraints.
@@ -231,7 +397,7 @@ class LabelBase(object):
         2 differents methods are used:
           * if the user does not set the width, split the line
             and calculate max width + height
-          * if the user sets a width, blit per glyph
+          * if the user sets a width, wrap the words and blit per word
         '''
 
         options = self.options
@@ -274,77 +440,19 @@ class LabelBase(object):
 
         # constraint
         else:
-            # precalculate id/name
-            if not self.fontid in self._cache_glyphs:
-                self._cache_glyphs[self.fontid] = {}
-            cache = self._cache_glyphs[self.fontid]
-
-            if not real:
-                # verify that each glyph have size
-                glyphs = list(set(self.text)) + ['.']
-                for glyph in glyphs:
-                    if not glyph in cache:
-                        cache[glyph] = get_extents(glyph)
-
             # Shorten the text that we actually display
             text = self.text
-            last_word_width = get_extents(text[text.rstrip().rfind(' '):])[0]
-            if (options['shorten'] and get_extents(text)[0] >
-                uw - last_word_width):
-                text = self.shorten(text)
-
-            # first, split lines
-            glyphs = []
-            lines = []
-            lw = lh = 0
-            for word in re.split(r'( |\n)', text):
-
-                # calculate the word width
-                ww, wh = 0, 0
-                if word == '':
-                    ww, wh = get_extents(' ')
-                for glyph in word:
-                    gw, gh = cache[glyph]
-                    ww += gw
-                    wh = max(gh, wh)
-                wh = wh * options['line_height']
-
-                # is the word fit on the uw ?
-                if ww > uw:
-                    lines.append(((ww, wh), 0, word))
-                    lw = lh = x = 0
-                    continue
-
-                # get the maximum height for this line
-                lh = max(wh, lh)
-                # is the word fit on the line ?
-                if (word == '\n' or x + ww > uw) and lw != 0:
-                    # no, push actuals glyph
-                    # lw, lh), is_last_line, glyphs)
-                    last_line = 1 if word == '\n' else 0
-                    lines.append(((lw, lh), last_line, glyphs))
-                    glyphs = []
-
-                    # reset size
-                    lw = lh = x = 0
-
-                    # new line ? don't render
-                    if word == '\n' or word == ' ':
-                        continue
-
-                # advance the width
-                lw += ww
-                x += ww
-                lh = max(wh, lh)
-                glyphs += list(word)
-
-            # got some char left ?
-            if lw != 0:
-                lines.append(((lw, lh), 1, glyphs))
-
+            if options['shorten']:
+                last_word_width = get_extents(
+                    text[text.rstrip().rfind(' '):])[0]
+                if get_extents(text)[0] > uw - last_word_width:
+                    text = self.shorten(text)
+
+            # the lines are calculated in the first pass, and reused for the
+            # real rendering
             if not real:
-                self._internal_height = sum([size[1] for size, last_line,
-                                            glyphs in lines])
+                self._lines = lines = self._wrap_text(text, uw)
+                self._internal_height = sum([line[0][1] for line in lines])
                 ll_h = lines[-1][0][1]
                 lh_offset = ll_h - (ll_h / self.options['line_height'])
                 self._internal_height = self._internal_height - lh_offset
@@ -352,7 +460,7 @@ class LabelBase(object):
                 w = uw
             else:
                 # really render now.
-                for size, last_line, glyphs in lines:
+                for size, last_line, words, widths in self._lines:
                     x = 0
                     if halign[0] == 'c':
                         # center
@@ -365,25 +473,24 @@ class LabelBase(object):
                     just_space = 0
                     if halign[-1] == 'y':
                         # justified
-                        if glyphs and not last_line:
+                        if words and not last_line:
                             x = 0
-                            last_space = 1 if glyphs[-1] == ' ' else 0
-                            _spaces = glyphs.count(' ') - last_space
+                            last_space = 1 if words[-1] == ' ' else 0
+                            _spaces = words.count(' ') - last_space
                             # divide left over space between `spaces`
                             # TODO implement a better method of stretching
                             # glyphs?
                             if _spaces:
-                                space_width = cache[' '][0] if last_space else 0
+                                space_width = widths[-1] if last_space else 0
                                 just_space = (((uw - size[0] + space_width) *
                                                1.) / (_spaces * 1.))
 
-                    for glyph in glyphs:
-                        lw, lh = cache[glyph]
-                        if glyph == ' ':
+                    for word, ww in zip(words, widths):
+                        if word == ' ':
                             x += just_space
-                        elif glyph != '\n':
-                            render_text(glyph, x, y)
-                        x += lw
+                        else:
+                            render_text(word, x, y)
+                        x += ww
                     y += size[1]
 
         if not real:
@@ -394,7 +501,9 @@ class LabelBase(object):
             return w, h
 
         # get data from provider
-        data = self._render_end()
+        self._render_blit(self._render_end())
+
+    def _render_blit(self, data):
         assert(data)
 
         # If the text is 1px width, usually, the data is black.
@@ -409,6 +518,81 @@ class LabelBase(object):
         # second pass, render for real
         self.render(real=True)
 
+    @staticmethod
+    def get_cache_stats():
+        '''Return the statistics of the shared textures: the
+        :meth:`Cache.get_stats <kivy.cache.Cache.get_stats>` of the `kv.text`
+        category, with `shared` the number of textures used by several labels.
+
+        .. versionadded:: 1.8.0
+        '''
+        stats = Cache.get_stats('kv.text')
+        stats['shared'] = len([x for x in Cache._objects['kv.text'].values()
+                               if len(x['object'].users) > 1])
+        return stats
+
+    def _get_texture_key(self):
+        options = self.options
+        key = [self.__class__, self.text, self._text_size]
+        key.extend([options[x] for x in _texture_options])
+        return tuple([tuple(x) if isinstance(x, list) else x for x in key])
+
+    def _copy_for_render(self, texture):
+        # the texture can be shared and filled later: render it from a copy of
+        # the label, unaffected by the next changes of this label.
+        label = copy(self)
+        label.options = copy(self.options)
+        label.texture = texture
+        label._shared = label._shared_ref = None
+        return label
+
+    def _acquire_texture(self, key, shared):
+        self._shared_ref = shared.acquire(self)
+        self._shared = shared
+        self._texture_key = key
+        self.texture = shared.texture
+
+    def _release_texture(self):
+        shared = self._shared
+        if shared is None:
+            return
+        shared.release(self._shared_ref)
+        self._shared = self._shared_ref = None
+        self._texture_key = None
+
+    def _refresh_shared_texture(self):
+        width, height = self._size
+        key = self._get_texture_key()
+        if key == self._texture_key:
+            # same content, the texture is up to date
+            return
+
+        shared = Cache.get('kv.text', key)
+        if shared is not None:
+            self._release_texture()
+            self._acquire_texture(key, shared)
+            return
+
+        # if the texture have never been used by another label, and it have
+        # the right size, render the new text in it
+        shared = self._shared
+        if shared is not None and not shared.shared and \
+                len(shared.users) == 1 and \
+                shared.texture.size == (width, height) and \
+                shared.texture.mipmap == self.options['mipmap']:
+            shared.uncache()
+            shared.set_content(key, self._copy_for_render(shared.texture))
+            self._texture_key = key
+            return
+
+        self._release_texture()
+        texture = Texture.create(size=(width, height),
+                mipmap=self.options['mipmap'])
+        texture.flip_vertical()
+        shared = _SharedTexture(texture, key,
+                                self._copy_for_render(texture))
+        self._acquire_texture(key, shared)
+
     def refresh(self):
         '''Force re-rendering of the text
         '''
@@ -423,9 +607,14 @@ class LabelBase(object):
         # if no text are rendered, return nothing.
         width, height = self._size
         if width <= 1 or height <= 1:
+            self._release_texture()
             self.texture = self.texture_1px
             return
 
+        if self.share_texture:
+            self._refresh_shared_texture()
+            return
+
         # create a delayed texture
         texture = self.texture
         if texture is None or \
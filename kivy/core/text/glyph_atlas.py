@@ -0,0 +1,267 @@
+'''
+Glyph atlas
+===========
+
+.. versionadded:: 1.8.0
+
+The :class:`GlyphLabel` is a core label that doesn't render its text into its
+own texture. Each glyph is rasterized once, by the current text provider, into
+a texture atlas shared by all the labels using the same font, font size and
+style: the :class:`GlyphAtlas`. The text is then drawn with one quad per
+glyph, batched in one :class:`~kivy.graphics.Mesh` per atlas page.
+
+Creating many labels, or changing their text, doesn't rasterize and upload a
+new texture anymore, as long as their glyphs are already in the atlas.
+
+The glyphs are rendered white and tinted with the current
+:class:`~kivy.graphics.Color`. Each glyph is placed with its own advance, so
+the kerning of the font is not applied. The markup is not supported.
+
+The :class:`~kivy.uix.label.Label` widget uses it when its
+:data:`~kivy.uix.label.Label.glyph_atlas` property is True::
+
+    Label(text='Hello world', glyph_atlas=True)
+'''
+
+__all__ = ('GlyphAtlas', 'GlyphLabel')
+
+from kivy.core.text import Label, LabelBase
+from kivy.graphics.texture import Texture
+
+# We need to do this trick when documentation is generated
+GlyphLabelBase = Label
+if Label is None:
+    GlyphLabelBase = LabelBase
+
+
+class GlyphAtlasPage(object):
+    '''A texture of a :class:`GlyphAtlas`, filled with rows of glyphs.
+    '''
+
+    def __init__(self, atlas, size):
+        super(GlyphAtlasPage, self).__init__()
+        self.atlas = atlas
+        self.size = size
+        # (glyph, x, y) of each glyph in the texture, used for the reload
+        self.glyphs = []
+        self._x = self._y = self._row_height = 0
+        self.texture = texture = Texture.create(
+            size=(size, size), colorfmt='rgba')
+        self._clear()
+        texture.add_reload_observer(self._reload)
+
+    def add(self, glyph, data):
+        '''Blit the data of a glyph in the page, and return its position, or
+        None if the page is full.
+        '''
+        w, h = data.width, data.height
+        # keep one transparent pixel between the glyphs, for filtering
+        if self._x + w > self.size:
+            self._x = 0
+            self._y += self._row_height + 1
+            self._row_height = 0
+        if self._y + h > self.size or w > self.size:
+            return None
+        x, y = self._x, self._y
+        self._x += w + 1
+        self._row_height = max(self._row_height, h)
+        self.texture.blit_buffer(data.data, size=(w, h), colorfmt=data.fmt,
+                                 pos=(x, y))
+        self.glyphs.append((glyph, x, y))
+        return x, y
+
+    def _clear(self):
+        size = self.size
+        self.texture.blit_buffer(b'\x00' * (size * size * 4),
+                                 colorfmt='rgba')
+
+    def _reload(self, texture):
+        self._clear()
+        rasterize = self.atlas.rasterize
+        for glyph, x, y in self.glyphs:
+            data = rasterize(glyph)
+            texture.blit_buffer(data.data, size=(data.width, data.height),
+                                colorfmt=data.fmt, pos=(x, y))
+
+
+class GlyphAtlas(object):
+    '''Texture atlas of the glyphs of one font, at one size and style. Use
+    :meth:`get_atlas` for getting the atlas shared by all the labels with the
+    same font.
+
+    :Parameters:
+        `options`: dict
+            Options of a core label: `font_name`, `font_size`, `bold` and
+            `italic` are used.
+    '''
+
+    #: Size of the textures of the atlas
+    page_size = 512
+
+    _atlases = {}
+
+    def __init__(self, options):
+        super(GlyphAtlas, self).__init__()
+        self.pages = []
+        # glyph -> (page, width, height, tex_coords), page is None when the
+        # glyph have nothing to draw
+        self.glyphs = {}
+        self._label = Label(
+            font_name=options['font_name'], font_size=options['font_size'],
+            bold=options['bold'], italic=options['italic'])
+
+    @staticmethod
+    def get_atlas(label):
+        '''Return the atlas of the font of a core label.
+        '''
+        fontid = label.fontid
+        atlas = GlyphAtlas._atlases.get(fontid)
+        if atlas is None:
+            atlas = GlyphAtlas._atlases[fontid] = GlyphAtlas(label.options)
+        return atlas
+
+    @staticmethod
+    def get_stats():
+        '''Return a dict with the number of atlases, pages and glyphs.
+        '''
+        atlases = list(GlyphAtlas._atlases.values())
+        return {
+            'atlases': len(atlases),
+            'pages': sum([len(x.pages) for x in atlases]),
+            'glyphs': sum([len(x.glyphs) for x in atlases])}
+
+    def rasterize(self, glyph):
+        '''Render a glyph with the text provider, and return its
+        :class:`~kivy.core.image.ImageData`, or None if it have no size.
+        '''
+        label = self._label
+        w, h = label.get_extents(glyph)
+        if w < 1 or h < 1:
+            return None
+        label._size = (w, h)
+        label._render_begin()
+        label._render_text(glyph, 0, 0)
+        return label._render_end()
+
+    def get_glyph(self, glyph):
+        '''Return a tuple (page, width, height, tex_coords) for a glyph,
+        rasterizing it in the atlas if needed. `page` is a
+        :class:`GlyphAtlasPage`, or None if there is nothing to draw.
+        '''
+        item = self.glyphs.get(glyph)
+        if item is not None:
+            return item
+        data = self.rasterize(glyph)
+        if data is None:
+            w, h = self._label.get_extents(glyph)
+            item = self.glyphs[glyph] = (None, w, h, None)
+            return item
+
+        w, h = data.width, data.height
+        page = self.pages[-1] if self.pages else None
+        pos = page.add(glyph, data) if page is not None else None
+        if pos is None:
+            size = self.page_size
+            while size < w or size < h:
+                size *= 2
+            page = GlyphAtlasPage(self, size)
+            self.pages.append(page)
+            pos = page.add(glyph, data)
+
+        # the glyph data is top-down: the top of the quad uses the first row
+        x, y = pos
+        size = float(page.size)
+        u0, u1 = x / size, (x + w) / size
+        vt, vb = y / size, (y + h) / size
+        item = self.glyphs[glyph] = (
+            page, w, h, (u0, vb, u1, vb, u1, vt, u0, vt))
+        return item
+
+
+class GlyphLabel(GlyphLabelBase):
+    '''Core label drawn from a :class:`GlyphAtlas`. The :data:`texture` is
+    always None: use :meth:`get_meshes` for drawing the text.
+
+    See module documentation for more information.
+    '''
+
+    #: Maximum number of glyphs in one mesh (4 vertices per glyph, the
+    #: indices of a mesh are limited to 65535)
+    max_mesh_glyphs = 16000
+
+    def __init__(self, *largs, **kwargs):
+        self._atlas = None
+        self._glyphs = []
+        super(GlyphLabel, self).__init__(*largs, **kwargs)
+
+    def refresh(self):
+        self.resolve_font_name()
+
+        # first pass, calculating width/height
+        sz = self.render()
+        self._size_texture = sz
+        self._size = sz[0] + self.options['padding_x'] * 2, \
+                     sz[1] + self.options['padding_y'] * 2
+        self.texture = None
+        self._glyphs = []
+
+        width, height = self._size
+        if width <= 1 or height <= 1:
+            return
+
+        # second pass, place the glyphs
+        self._atlas = GlyphAtlas.get_atlas(self)
+        self.render(real=True)
+
+    def get_meshes(self):
+        '''Return a list of (texture, vertices, indices) for drawing the text
+        with :class:`~kivy.graphics.Mesh` in triangles mode. The vertices are
+        relative to the bottom-left corner of the label.
+        '''
+        height = self._size[1]
+        meshes = {}
+        result = []
+        for page, x, y, w, h, tex_coords in self._glyphs:
+            mesh = meshes.get(page)
+            if mesh is None or len(mesh[2]) >= self.max_mesh_glyphs * 6:
+                mesh = meshes[page] = (page.texture, [], [])
+                result.append(mesh)
+            texture, vertices, indices = mesh
+            i = len(vertices) // 4
+            y = height - y - h
+            u0, v0, u1, v1, u2, v2, u3, v3 = tex_coords
+            vertices.extend((x, y, u0, v0, x + w, y, u1, v1,
+                             x + w, y + h, u2, v2, x, y + h, u3, v3))
+            indices.extend((i, i + 1, i + 2, i + 2, i + 3, i))
+        return result
+
+    @property
+    def content_width(self):
+        return self._size[0]
+
+    @property
+    def content_height(self):
+        return self._size[1]
+
+    @property
+    def content_size(self):
+        return self._size
+
+    def _render_begin(self):
+        self._glyphs = []
+
+    def _render_text(self, text, x, y):
+        get_glyph = self._atlas.get_glyph
+        glyphs = self._glyphs
+        for glyph in text:
+            page, w, h, tex_coords = get_glyph(glyph)
+            if page is not None:
+                glyphs.append((page, x, y, w, h, tex_coords))
+            x += w
+
+    def _render_end(self):
+        return self._glyphs
+
+    def _render_blit(self, data):
+        # nothing to upload, the glyphs are already in the atlas
+        pass
@@ -61,6 +61,9 @@ class MarkupLabel(MarkupLabelBase):
     See module documentation for more informations.
     '''
 
+    # the refs and anchors are computed when the texture is rendered
+    share_texture = False
+
     def __init__(self, *largs, **kwargs):
         self._style_stack = {}
         self._refs = {}
@@ -223,18 +226,9 @@ class MarkupLabel(MarkupLabelBase):
         return int(ceil(w)), int(ceil(h))
 
     def _pre_render_label(self, word, options, lines):
-        # precalculate id/name
-        if not self.fontid in self._cache_glyphs:
-            self._cache_glyphs[self.fontid] = {}
-        cache = self._cache_glyphs[self.fontid]
-
-        # verify that each glyph have size
-        glyphs = list(set(word))
-        glyphs.append(' ')
+        # extents of the words already measured with this font
+        cache = self._get_extents_cache()
         get_extents = self.get_extents
-        for glyph in glyphs:
-            if not glyph in cache:
-                cache[glyph] = get_extents(glyph)
 
         # get last line information
         if len(lines):
@@ -249,7 +243,12 @@ class MarkupLabel(MarkupLabelBase):
         uw, uh = self.text_size
 
         # split the word
-        default_line_height = get_extents(' ')[1] * self.options['line_height']
+        line_height = self.options['line_height']
+        size = cache.get(' ')
+        if size is None:
+            size = cache[' '] = get_extents(' ')
+        default_line_height = size[1] * line_height
+        options = copy(options)
         for part in re.split(r'( |\n)', word):
 
             if part == '':
@@ -269,14 +268,12 @@ class MarkupLabel(MarkupLabelBase):
             lw, lh = line[:2]
 
             # calculate the size of the part
-            # (extract all extents of the part,
-            # calculate width through extents due to kerning
-            # and get the maximum height)
-            pg = [cache[g] for g in part]
-            pw = get_extents(part)[0]
-            ph = max([g[1] for g in pg])
-            ph = ph * self.options['line_height']
-            options = copy(options)
+            # (calculate width through extents due to kerning)
+            size = cache.get(part)
+            if size is None:
+                size = cache[part] = get_extents(part)
+            pw = size[0]
+            ph = size[1] * line_height
 
             # check if the part can be put in the line
             if uw is None or lw + pw < uw:
@@ -400,13 +397,6 @@ class MarkupLabel(MarkupLabelBase):
                 x += pw
             y += line[1]
 
-        # get data from provider
-        data = self._render_end()
-        assert(data)
-
-        # update texture
-        # If the text is 1px width, usually, the data is black.
-        # Don't blit that kind of data, otherwise, you have a little black bar.
-        if data is not None and data.width > 1:
-            self.texture.blit_data(data)
+        # get data from provider, and update texture
+        self._render_blit(self._render_end())
 
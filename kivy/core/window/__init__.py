@@ -23,6 +23,7 @@ from kivy.properties import ListProperty, ObjectProperty, AliasProperty, \
         NumericProperty, OptionProperty, StringProperty
 from kivy.utils import platform, reify
 from kivy.context import get_current_context
+from kivy.graphics.stats import end_frame
 
 # late import
 VKeyboard = None
@@ -626,6 +627,8 @@ class WindowBase(EventDispatcher):
     def on_draw(self):
         self.clear()
         self.render_context.draw()
+        # the graphics stats of the frame are complete
+        end_frame()
 
     def on_motion(self, etype, me):
         '''Event called when a Motion Event is received.
@@ -1,6 +1,23 @@
 cdef class GraphicsCompiler
+cdef class BatchInstruction
 
-from instructions cimport InstructionGroup
+from instructions cimport Instruction, InstructionGroup, ContextInstruction, \
+    VertexInstruction
+from vbo cimport MergedVertexBatch
+
+cdef class BatchInstruction(Instruction):
+    cdef MergedVertexBatch batch
+
+    cdef void merge(self, list instructions)
+    cdef void apply(self)
 
 cdef class GraphicsCompiler:
+    cdef InstructionGroup compiled
+    cdef list batches
+    cdef int used
+    cdef int run_vertices
+
     cdef InstructionGroup compile(self, InstructionGroup group)
+    cdef int is_neutral(self, ContextInstruction ci, dict states)
+    cdef int can_batch(self, list run, VertexInstruction vi)
+    cdef void flush(self, list run, list children)
@@ -45,6 +45,41 @@ instruction with GI_IGNORE flag. As soon as a Color content change, the whole
 InstructionGroup will be recompiled, and maybe a previous unused Color will be
 used at the next compilation.
 
+Batching the vertex instructions
+--------------------------------
+
+.. versionadded:: 1.8.0
+
+Each vertex instruction have its own vertex buffer, and is drawn with its own
+draw call. In the reduced scheme above, the 3 rectangles are drawn with the
+same texture and color: the compiler merges their vertices into one
+:class:`~kivy.graphics.vbo.MergedVertexBatch`, and draws them in one call::
+
+    Color: change 'color' context to 1, 1, 1
+    BindTexture: change 'texture0' to `button.png texture`
+    Batch: push the vertices of the 3 rectangles to vbo & draw
+
+Consecutive vertex instructions are merged when:
+
+- the :class:`~kivy.graphics.context_instructions.Color` and
+  :class:`~kivy.graphics.context_instructions.BindTexture` between them set the
+  same values as the previous ones in the group,
+- they use the same vertex format, and the same independent mode
+  ('triangles', 'lines' or 'points'). A triangle fan or a line strip can't be
+  merged, neither the :class:`~kivy.graphics.vertex_instructions.Line` that
+  may use the stencil,
+- they have less than 65536 vertices in total, and don't use unsigned int
+  indices,
+- their indices form whole primitives: a lines or triangles instruction with
+  trailing indices is drawn alone, as OpenGL ignores them.
+
+Any other instruction between them stops the merge. When one of the merged
+instructions changes, only its vertices are copied again and uploaded to the
+GPU, as long as their number doesn't change.
+
+The number of draw calls can be checked with
+:func:`~kivy.graphics.stats.get_stats`.
+
 
 Note to any Kivy contributor / internal developer:
 
@@ -59,17 +94,73 @@ Note to any Kivy contributor / internal developer:
 
 include 'opcodes.pxi'
 
-from kivy.graphics.instructions cimport Instruction, RenderContext, ContextInstruction
-from kivy.graphics.context_instructions cimport BindTexture
+from kivy.graphics.instructions cimport Instruction, RenderContext, \
+    ContextInstruction, VertexInstruction
+from kivy.graphics.context_instructions cimport BindTexture, Color
+from kivy.graphics.vbo cimport VBO, VertexBatch, MergedVertexBatch
+from kivy.graphics.c_opengl cimport GL_TRIANGLES, GL_LINES, GL_POINTS, \
+    GL_UNSIGNED_SHORT
+
+
+cdef inline int whole_primitives(VertexBatch batch):
+    # Return 1 if the indices of the batch form whole primitives. Once merged,
+    # trailing indices would shift all the next primitives.
+    cdef int count = batch.elements.count()
+    if batch.mode == GL_LINES:
+        return count % 2 == 0
+    if batch.mode == GL_TRIANGLES:
+        return count % 3 == 0
+    return 1
+
+
+cdef class BatchInstruction(Instruction):
+    '''Instruction drawing the merged vertices of consecutive vertex
+    instructions. It is created by the compiler, see module documentation.
+
+    .. versionadded:: 1.8.0
+    '''
+    def __init__(self, **kwargs):
+        Instruction.__init__(self, noadd=True)
+        self.batch = None
+
+    cdef void merge(self, list instructions):
+        cdef VertexInstruction vi
+        cdef VertexBatch first = (<VertexInstruction>instructions[0]).batch
+        cdef list batches = []
+        if self.batch is None or \
+                self.batch.vbo.vertex_format is not first.vbo.vertex_format:
+            self.batch = MergedVertexBatch(vbo=VBO(first.vbo.vertex_format))
+        self.batch.set_mode(first.get_mode())
+        for vi in instructions:
+            batches.append(vi.batch)
+        self.batch.merge(batches)
+
+    cdef void apply(self):
+        self.batch.draw()
+
 
 cdef class GraphicsCompiler:
+    def __init__(self):
+        self.compiled = None
+        self.batches = []
+        self.used = 0
+        self.run_vertices = 0
+
     cdef InstructionGroup compile(self, InstructionGroup group):
         cdef int count = 0
         cdef Instruction c
         cdef ContextInstruction ci
+        cdef VertexInstruction vi
         cdef RenderContext rc = None, oldrc = None
         cdef dict cs_by_rc = {}
         cdef list cs
+        # states set in the group since the last unknown instruction
+        cdef dict states = {}
+        # vertex instructions to merge, and the instructions to execute at
+        # the next frames
+        cdef list run = []
+        cdef list children = []
+        cdef int neutral
 
         # Very simple compiler. We will apply all the element in the group.
         # If the render context is not changed between 2 call, we'll think that
@@ -77,6 +168,12 @@ cdef class GraphicsCompiler:
         # GI_IGNORE.
         # Also, flag ourself as GL_NO_APPLY_ONCE, to prevent to reapply all the
         # instructions when the compiler is leaving.
+        # The vertex instructions are batched: they are built when they are
+        # found, and drawn together when an instruction changes the context
+        # (see flush()).
+
+        self.used = 0
+        self.run_vertices = 0
 
         for c in group.children:
 
@@ -85,6 +182,13 @@ cdef class GraphicsCompiler:
                 # convert as a ContextInstruction
                 ci = c
 
+                # a context instruction setting the same values than before
+                # is useless at the next frames, and doesn't stop the batching
+                neutral = self.is_neutral(ci, states)
+                if not neutral:
+                    self.flush(run, children)
+                    children.append(ci)
+
                 # get the context, and flag as done
                 oldrc = rc
                 rc = ci.get_context()
@@ -135,16 +239,115 @@ cdef class GraphicsCompiler:
                 if needed == 0 and not (rc.flags & GI_NEEDS_UPDATE):
                     ci.flags |= GI_IGNORE
                     count += 1
+
+                # track the states of the group for the next instructions
+                if isinstance(ci, BindTexture):
+                    states[(<BindTexture>ci)._index] = \
+                        (<BindTexture>ci)._texture
+                elif isinstance(ci, Color):
+                    states.update(ci.context_state)
+                else:
+                    states = {}
+
+            elif isinstance(c, VertexInstruction):
+                vi = c
+                if vi.flags & GI_NEEDS_UPDATE:
+                    vi.build()
+                    vi.flag_update_done()
+                # the build can flag the instruction as not batchable
+                if vi.flags & GI_NO_BATCH:
+                    self.flush(run, children)
+                    vi.apply()
+                    children.append(vi)
+                else:
+                    if not self.can_batch(run, vi):
+                        self.flush(run, children)
+                    run.append(vi)
+                    self.run_vertices += vi.batch.elements_range
+
             else:
+                self.flush(run, children)
+                states = {}
                 if isinstance(c, InstructionGroup):
                     # we have potentially new childs, and them can fuck up our
                     # compilation, so reset our current cache.
                     cs_by_rc = {}
                 c.apply()
+                children.append(c)
+
+        self.flush(run, children)
 
         if rc:
             rc.flag_update(0)
 
         group.flags |= GI_NO_APPLY_ONCE
 
-        return group
+        # release the merged batches not used anymore
+        del self.batches[self.used:]
+        if self.used == 0:
+            return group
+
+        # the group is now drawn with the batches
+        if self.compiled is None:
+            self.compiled = InstructionGroup(noadd=True, nocompiler=True)
+        self.compiled.children = children
+        return self.compiled
+
+    cdef int is_neutral(self, ContextInstruction ci, dict states):
+        # Return 1 if the instruction only sets the values already set by the
+        # previous Color / BindTexture of the group.
+        cdef BindTexture bt
+        if isinstance(ci, BindTexture):
+            bt = ci
+            return bt._index in states and states[bt._index] is bt._texture
+        if not isinstance(ci, Color) or ci.context_push or ci.context_pop:
+            return 0
+        for name, value in ci.context_state.iteritems():
+            if name not in states or states[name] != value:
+                return 0
+        return 1
+
+    cdef int can_batch(self, list run, VertexInstruction vi):
+        cdef VertexBatch batch = vi.batch
+        cdef VertexBatch first
+        if not run:
+            return 1
+        first = (<VertexInstruction>run[0]).batch
+        if batch.index_type != GL_UNSIGNED_SHORT or \
+                first.index_type != GL_UNSIGNED_SHORT:
+            return 0
+        if batch.mode != first.mode:
+            return 0
+        if batch.mode != GL_TRIANGLES and batch.mode != GL_LINES and \
+                batch.mode != GL_POINTS:
+            return 0
+        if batch.vbo.vertex_format is not first.vbo.vertex_format:
+            return 0
+        if not whole_primitives(batch) or not whole_primitives(first):
+            return 0
+        # the indices are unsigned short
+        return self.run_vertices + batch.elements_range <= 65536
+
+    cdef void flush(self, list run, list children):
+        # Draw the vertex instructions found since the last flush, merged if
+        # there are more than one.
+        cdef BatchInstruction bi
+        cdef Instruction c
+        if not run:
+            return
+        if len(run) == 1:
+            c = run[0]
+            c.apply()
+            children.append(c)
+        else:
+            if self.used < len(self.batches):
+                bi = self.batches[self.used]
+            else:
+                bi = BatchInstruction()
+                self.batches.append(bi)
+            self.used += 1
+            bi.merge(run)
+            bi.apply()
+            children.append(bi)
+        del run[:]
+        self.run_vertices = 0
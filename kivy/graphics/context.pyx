@@ -220,6 +220,8 @@ cdef class Context:
         Cache._objects['kv.texture'] = texture_objects
         image_objects.update(Cache._objects['kv.image'])
         Cache._objects['kv.image'] = image_objects
+        Cache._update_size('kv.texture')
+        Cache._update_size('kv.image')
 
         Logger.debug('Context: Reload vbos')
         for item in self.l_vbo[:]:
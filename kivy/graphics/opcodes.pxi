@@ -7,4 +7,4 @@ cdef int GI_VERTEX_DATA  = 1 << 5
 cdef int GI_COMPILER	 = 1 << 6
 cdef int GI_NO_APPLY_ONCE = 1 << 7
 cdef int GI_NO_REMOVE    = 1 << 8
-
+cdef int GI_NO_BATCH     = 1 << 9
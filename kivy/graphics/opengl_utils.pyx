@@ -11,7 +11,8 @@ __all__ = ('gl_get_extensions', 'gl_has_extension',
         'gl_has_texture_format', 'gl_has_texture_conversion',
         'gl_has_texture_native_format', 'gl_get_texture_formats',
         'gl_get_version', 'gl_get_version_minor', 'gl_get_version_major',
-        'GLCAP_BGRA', 'GLCAP_NPOT', 'GLCAP_S3TC', 'GLCAP_DXT1', 'GLCAP_ETC1')
+        'GLCAP_BGRA', 'GLCAP_NPOT', 'GLCAP_S3TC', 'GLCAP_DXT1', 'GLCAP_ETC1',
+        'GLCAP_UINT_INDICES')
 
 include "opengl_utils_def.pxi"
 cimport c_opengl
@@ -91,6 +92,11 @@ cpdef int gl_has_capability(int cap):
         - GLCAP_S3TC: Test the support of S3TC texture (DXT1, DXT3, DXT5)
         - GLCAP_DXT1: Test the support of DXT texture (subset of S3TC)
         - GLCAP_ETC1: Test the support of ETC1 texture
+        - GLCAP_UINT_INDICES: Test the support of unsigned int vertex indices
+          (always available on desktop OpenGL)
+
+    .. versionchanged:: 1.8.0
+        GLCAP_UINT_INDICES added.
 
     '''
     cdef int value = _gl_caps.get(cap, -1)
@@ -148,6 +154,15 @@ cpdef int gl_has_capability(int cap):
         msg = 'ETC1 texture support'
         value = gl_has_extension('OES_compressed_ETC1_RGB8_texture')
 
+    elif cap == c_GLCAP_UINT_INDICES:
+        # OpenGL ES 2 needs an extension for GL_UNSIGNED_INT in glDrawElements
+        msg = 'Unsigned int vertex indices support'
+        sval = <char *>c_opengl.glGetString(c_opengl.GL_VERSION)
+        if sval.startswith('OpenGL ES'):
+            value = gl_has_extension('OES_element_index_uint')
+        else:
+            value = 1
+
     else:
         raise Exception('Unknown capability')
 
@@ -55,6 +55,21 @@ contain sections identified by a line starting with '---vertex' and
 
 The source property of the Shader should be set tpo the filename of a glsl
 shader file (of the above format), like e.g. `phong.glsl`
+
+
+Uniform upload
+--------------
+
+.. versionadded:: 1.8.0
+
+An OpenGL program keeps the values of its uniforms when another program is
+used. A uniform changed while its shader is in use is uploaded immediately;
+otherwise it's uploaded the next time the shader is used. The unchanged
+uniforms are never uploaded again, unless the program is linked again or the
+OpenGL context is reloaded.
+
+The shader switches and uniform uploads are counted in
+:mod:`kivy.graphics.stats`.
 '''
 
 __all__ = ('Shader', )
@@ -69,6 +84,7 @@ IF USE_OPENGL_DEBUG == 1:
 from kivy.graphics.vertex cimport vertex_attr_t
 from kivy.graphics.transformation cimport Matrix
 from kivy.graphics.context cimport get_context
+from kivy.graphics.stats cimport GraphicsStats, get_graphics_stats
 from kivy.logger import Logger
 from kivy.cache import Cache
 from kivy import kivy_shader_dir
@@ -87,6 +103,11 @@ with open(join(kivy_shader_dir, 'default.vs')) as fin:
 with open(join(kivy_shader_dir, 'default.fs')) as fin:
     default_fs = fin.read()
 
+# shader currently in use
+cdef Shader bound_shader = None
+
+cdef GraphicsStats stats = get_graphics_stats()
+
 
 cdef class ShaderSource:
 
@@ -163,6 +184,7 @@ cdef class Shader:
         self.fragment_shader = None
         self.uniform_locations = dict()
         self.uniform_values = dict()
+        self.uniform_dirty = set()
 
     def __init__(self, str vs=None, str fs=None, str source=None):
         get_context().register_shader(self)
@@ -181,11 +203,14 @@ cdef class Shader:
         # Note that we don't free previous created shaders. The current reload
         # is called only when the gl context is reseted. If we do it, we might
         # free newly created shaders (id collision)
+        global bound_shader
         glUseProgram(0)
+        bound_shader = None
         self.vertex_shader = None
         self.fragment_shader = None
         #self.uniform_values = dict()
         self.uniform_locations = dict()
+        self.uniform_dirty = set(self.uniform_values)
         self._success = 0
         self._current_vertex_format = None
         self.program = glCreateProgram()
@@ -195,9 +220,15 @@ cdef class Shader:
     cdef void use(self):
         '''Use the shader
         '''
+        global bound_shader
         glUseProgram(self.program)
-        for k, v in self.uniform_values.iteritems():
-            self.upload_uniform(k, v)
+        bound_shader = self
+        stats.shader_switches += 1
+        # the program kept the other values, upload only the changed ones
+        if self.uniform_dirty:
+            for k in self.uniform_dirty:
+                self.upload_uniform(k, self.uniform_values[k])
+            self.uniform_dirty.clear()
         IF USE_GLEW == 1:
             # XXX Very very weird bug. On virtualbox / win7 / glew, if we don't call
             # glFlush or glFinish or glGetIntegerv(GL_CURRENT_PROGRAM, ...), it seem
@@ -212,13 +243,18 @@ cdef class Shader:
     cdef void stop(self):
         '''Stop using the shader
         '''
+        global bound_shader
         glUseProgram(0)
+        bound_shader = None
 
     cdef void set_uniform(self, str name, value):
         if name in self.uniform_values and self.uniform_values[name] == value:
             return
         self.uniform_values[name] = value
-        self.upload_uniform(name, value)
+        if bound_shader is self:
+            self.upload_uniform(name, value)
+        else:
+            self.uniform_dirty.add(name)
 
     cdef void upload_uniform(self, str name, value):
         '''Pass a uniform variable to the shader
@@ -229,14 +265,16 @@ cdef class Shader:
         cdef tuple tuple_value
         cdef list list_value
         val_type = type(value)
-        loc = self.uniform_locations.get(name, -1)
-        if loc == -1:
+        # -1 is cached too, for the uniforms not used by the program
+        loc = self.uniform_locations.get(name, -2)
+        if loc == -2:
             loc = self.get_uniform_loc(name)
 
         #Logger.debug('Shader: uploading uniform %s (loc=%d, value=%r)' % (name, loc, value))
         if loc == -1:
             #Logger.debug('Shader: -> ignored')
             return
+        stats.uniform_uploads += 1
         #Logger.debug('Shader: -> (gl:%d) %s' % (glGetError(), str(value)))
 
         if val_type is Matrix:
@@ -375,6 +413,8 @@ cdef class Shader:
         glLinkProgram(self.program)
         self.process_message('program', self.get_program_log(self.program))
         self.uniform_locations = dict()
+        # the uniforms are reset by the link
+        self.uniform_dirty = set(self.uniform_values)
         error = glGetError()
         if error:
             Logger.error('Shader: GL error %d' % error)
@@ -0,0 +1,13 @@
+cdef class GraphicsStats:
+    cdef public long draw_calls
+    cdef public long texture_binds
+    cdef public long buffer_uploads
+    cdef public long buffer_updates
+    cdef public long buffer_bytes
+    cdef public long shader_switches
+    cdef public long uniform_uploads
+
+    cdef void reset(self)
+    cdef dict as_dict(self)
+
+cdef GraphicsStats get_graphics_stats()
@@ -0,0 +1,94 @@
+'''
+Graphics statistics
+===================
+
+.. versionadded:: 1.8.0
+
+The graphics instructions count the OpenGL work they do. The counters are
+always available, and cost only an integer increment:
+
+- `draw_calls`: number of glDrawElements calls
+- `texture_binds`: number of glBindTexture calls done by the textures
+- `buffer_uploads`: number of glBufferData calls, done when a vertex or
+  index buffer is created or grows
+- `buffer_updates`: number of glBufferSubData calls, done when a part of a
+  vertex or index buffer changes
+- `buffer_bytes`: number of bytes sent with glBufferData and glBufferSubData
+- `shader_switches`: number of glUseProgram calls done by the shaders
+- `uniform_uploads`: number of glUniform calls done by the shaders
+
+The :class:`~kivy.core.window.WindowBase` ends a frame after each draw: the
+counters of the last complete frame are returned by :func:`get_frame_stats`,
+and the counters are reset for the next frame::
+
+    from kivy.graphics.stats import get_frame_stats
+    stats = get_frame_stats()
+    print('%d draw calls' % stats['draw_calls'])
+
+Without a window, for example in a test drawing a
+:class:`~kivy.graphics.fbo.Fbo`, use :func:`reset_stats` and
+:func:`get_stats`.
+'''
+
+__all__ = ('get_stats', 'reset_stats', 'end_frame', 'get_frame_stats')
+
+
+cdef class GraphicsStats:
+    '''Counters of the OpenGL calls, see the module documentation.
+    '''
+
+    cdef void reset(self):
+        self.draw_calls = 0
+        self.texture_binds = 0
+        self.buffer_uploads = 0
+        self.buffer_updates = 0
+        self.buffer_bytes = 0
+        self.shader_switches = 0
+        self.uniform_uploads = 0
+
+    cdef dict as_dict(self):
+        return {
+            'draw_calls': self.draw_calls,
+            'texture_binds': self.texture_binds,
+            'buffer_uploads': self.buffer_uploads,
+            'buffer_updates': self.buffer_updates,
+            'buffer_bytes': self.buffer_bytes,
+            'shader_switches': self.shader_switches,
+            'uniform_uploads': self.uniform_uploads}
+
+
+cdef GraphicsStats stats = GraphicsStats()
+cdef dict frame_stats = stats.as_dict()
+
+
+cdef GraphicsStats get_graphics_stats():
+    return stats
+
+
+def get_stats():
+    '''Return a dict of the counters since the last :func:`reset_stats` or
+    :func:`end_frame`.
+    '''
+    return stats.as_dict()
+
+
+def reset_stats():
+    '''Reset all the counters to 0.
+    '''
+    stats.reset()
+
+
+def end_frame():
+    '''Save the counters as the stats of the last frame, and reset them. This
+    is called by the window after each draw.
+    '''
+    global frame_stats
+    frame_stats = stats.as_dict()
+    stats.reset()
+
+
+def get_frame_stats():
+    '''Return a dict of the counters of the last frame ended with
+    :func:`end_frame`.
+    '''
+    return frame_stats
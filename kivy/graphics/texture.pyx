@@ -195,6 +195,7 @@ from kivy.graphics.c_opengl cimport *
 IF USE_OPENGL_DEBUG == 1:
     from kivy.graphics.c_opengl_debug cimport *
 from kivy.graphics.opengl_utils cimport *
+from kivy.graphics.stats cimport GraphicsStats, get_graphics_stats
 
 # update flags
 cdef int TI_MIN_FILTER      = 1 << 0
@@ -204,6 +205,8 @@ cdef int TI_NEED_GEN        = 1 << 3
 cdef int TI_NEED_ALLOCATE   = 1 << 4
 cdef int TI_NEED_PIXELS     = 1 << 5
 
+cdef GraphicsStats stats = get_graphics_stats()
+
 
 # compatibility layer
 cdef GLuint GL_BGR = 0x80E0
@@ -653,7 +656,7 @@ cdef class Texture:
 
         '''
         for cb in self.observers[:]:
-            if cb.is_dead() or cb() is callback:
+            if cb.is_dead() or cb() == callback:
                 self.observers.remove(cb)
                 continue
 
@@ -723,6 +726,8 @@ cdef class Texture:
         '''Bind the texture to current opengl state'''
         cdef GLuint value
 
+        stats.texture_binds += 1
+
         # if we have no change to apply, just bind and exit
         if not self.flags:
             glBindTexture(self._target, self._id)
@@ -1020,6 +1025,23 @@ cdef class Texture:
         def __get__(self):
             return self._bufferfmt
 
+    property cache_size:
+        '''Return an estimation of the memory used by the texture, in bytes.
+        It is used as a size hint by the :class:`~kivy.cache.Cache`.
+        (readonly)
+
+        .. versionadded:: 1.8.0
+        '''
+        def __get__(self):
+            cdef int pixelsize
+            try:
+                pixelsize = _gl_format_size(
+                    _color_fmt_to_gl(self._colorfmt)) * \
+                    _buffer_type_to_gl_size(self._bufferfmt)
+            except Exception:
+                pixelsize = 4
+            return self._width * self._height * pixelsize
+
     property min_filter:
         '''Get/set the min filter texture. Available values:
 
@@ -1127,6 +1149,15 @@ cdef class TextureRegion(Texture):
     cpdef bind(self):
         self.owner.bind()
 
+    property cache_size:
+        '''A region shares the memory of its owner texture, so it doesn't
+        account for any memory. (readonly)
+
+        .. versionadded:: 1.8.0
+        '''
+        def __get__(self):
+            return 0
+
     property pixels:
         def __get__(self):
             from kivy.graphics.fbo import Fbo
@@ -17,6 +17,8 @@ cdef class VBO:
     cdef short flags
     cdef int vbo_size
     cdef VertexFormat vertex_format
+    cdef int dirty_start
+    cdef int dirty_end
 
     cdef void update_buffer(self)
     cdef void bind(self)
@@ -24,6 +26,7 @@ cdef class VBO:
     cdef void add_vertex_data(self, void *v, unsigned short* indices, int count)
     cdef void update_vertex_data(self, int index, void* v, int count)
     cdef void remove_vertex_data(self, unsigned short* indices, int count)
+    cdef void flag_dirty(self, int start, int end)
     cdef void reload(self)
     cdef int have_id(self)
 
@@ -40,15 +43,29 @@ cdef class VertexBatch:
     cdef int usage
     cdef short flags
     cdef int elements_size
+    cdef int elements_range
+    cdef int index_type
 
     cdef void clear_data(self)
     cdef void set_data(self, void *vertices, int vertices_count,
                        unsigned short *indices, int indices_count)
     cdef void append_data(self, void *vertices, int vertices_count,
                           unsigned short *indices, int indices_count)
+    cdef void update_data(self, int index, void *vertices, int count)
+    cdef void set_large_data(self, void *vertices, int vertices_count,
+                             unsigned int *indices, int indices_count)
     cdef void draw(self)
     cdef void set_mode(self, str mode)
     cdef str get_mode(self)
     cdef int count(self)
     cdef void reload(self)
     cdef int have_id(self)
+
+
+cdef class MergedVertexBatch(VertexBatch):
+    cdef list batches
+    cdef list ranges
+
+    cdef void merge(self, list batches)
+    cdef void copy_elements(self, VertexBatch batch, int vertex_offset,
+                            int elements_offset, int append)
@@ -14,9 +14,17 @@ OpenGL.
 .. versionchanged:: 1.6.0
     VBO now no longer has a fixed vertex format, if no VertexFormat is given
     at initialization, the default vertex format is used.
+
+.. versionchanged:: 1.8.0
+    The VBO only uploads the vertices changed since the last upload.
+    :class:`MergedVertexBatch` added, used by the graphics compiler for
+    drawing several vertex instructions in one call. The draw calls and
+    buffer uploads are counted in :mod:`kivy.graphics.stats`.
+    :class:`VertexBatch` can use unsigned int indices, for drawing more than
+    65536 vertices.
 '''
 
-__all__ = ('VBO', 'VertexBatch', 'VertexFormat')
+__all__ = ('VBO', 'VertexBatch', 'MergedVertexBatch', 'VertexFormat')
 
 include "config.pxi"
 include "common.pxi"
@@ -31,6 +39,7 @@ from kivy.logger import Logger
 from kivy.graphics.context cimport Context, get_context
 from kivy.graphics.instructions cimport getActiveContext
 from kivy.graphics.shader cimport Shader
+from kivy.graphics.stats cimport GraphicsStats, get_graphics_stats
 
 cdef VertexFormat default_vertex = VertexFormat( (b'vPosition', 2, 'float'),
         (b'vTexCoords0', 2, 'float'))
@@ -38,6 +47,9 @@ cdef VertexFormat default_vertex = VertexFormat( (b'vPosition', 2, 'float'),
 cdef short V_NEEDGEN = 1 << 0
 cdef short V_NEEDUPLOAD = 1 << 1
 cdef short V_HAVEID = 1 << 2
+cdef short V_NEEDMERGE = 1 << 3
+
+cdef GraphicsStats stats = get_graphics_stats()
 
 cdef class VBO:
     '''
@@ -56,6 +68,7 @@ cdef class VBO:
         self.format_size = vertex_format.vbytesize
         self.flags = V_NEEDGEN | V_NEEDUPLOAD
         self.vbo_size = 0
+        self.dirty_start = self.dirty_end = 0
 
     def __dealloc__(self):
         get_context().dealloc_vbo(self)
@@ -68,6 +81,7 @@ cdef class VBO:
         return self.flags & V_HAVEID
 
     cdef void update_buffer(self):
+        cdef int end
         # generate VBO if not done yet
         if self.flags & V_NEEDGEN:
             glGenBuffers(1, &self.id)
@@ -80,11 +94,21 @@ cdef class VBO:
             glBindBuffer(GL_ARRAY_BUFFER, self.id)
             glBufferData(GL_ARRAY_BUFFER, self.vbo_size, self.data.pointer(), self.usage)
             self.flags &= ~V_NEEDUPLOAD
+            stats.buffer_uploads += 1
+            stats.buffer_bytes += self.vbo_size
 
-        # if size match, update only what is needed
+        # if size match, update only the blocks changed since the last upload
         elif self.flags & V_NEEDUPLOAD:
-            glBindBuffer(GL_ARRAY_BUFFER, self.id)
-            glBufferSubData(GL_ARRAY_BUFFER, 0, self.data.size(), self.data.pointer())
+            end = min(self.dirty_end, self.data.block_count)
+            if end > self.dirty_start:
+                glBindBuffer(GL_ARRAY_BUFFER, self.id)
+                glBufferSubData(GL_ARRAY_BUFFER,
+                    self.dirty_start * self.format_size,
+                    (end - self.dirty_start) * self.format_size,
+                    self.data.offset_pointer(self.dirty_start))
+                stats.buffer_updates += 1
+                stats.buffer_bytes += (end - self.dirty_start) * \
+                    self.format_size
             self.flags &= ~V_NEEDUPLOAD
 
     cdef void bind(self):
@@ -106,16 +130,25 @@ cdef class VBO:
         glBindBuffer(GL_ARRAY_BUFFER, 0)
 
     cdef void add_vertex_data(self, void *v, unsigned short* indices, int count):
-        self.flags |= V_NEEDUPLOAD
         self.data.add(v, indices, count)
+        self.flag_dirty(0, self.data.block_count)
 
     cdef void update_vertex_data(self, int index, void* v, int count):
-        self.flags |= V_NEEDUPLOAD
         self.data.update(index, v, count)
+        self.flag_dirty(index, index + count)
 
     cdef void remove_vertex_data(self, unsigned short* indices, int count):
         self.data.remove(indices, count)
 
+    cdef void flag_dirty(self, int start, int end):
+        # extend the range of blocks to upload
+        if self.flags & V_NEEDUPLOAD:
+            start = min(start, self.dirty_start)
+            end = max(end, self.dirty_end)
+        self.dirty_start = start
+        self.dirty_end = end
+        self.flags |= V_NEEDUPLOAD
+
     cdef void reload(self):
         self.flags = V_NEEDUPLOAD | V_NEEDGEN
         self.vbo_size = 0
@@ -136,6 +169,7 @@ cdef class VertexBatch:
         self.vbo_index = Buffer(lushort) #index of every vertex in the vbo
         self.elements = Buffer(lushort) #indices translated to vbo indices
         self.elements_size = 0
+        self.index_type = GL_UNSIGNED_SHORT
         self.flags = V_NEEDGEN | V_NEEDUPLOAD
 
         self.set_data(NULL, 0, NULL, 0)
@@ -153,10 +187,20 @@ cdef class VertexBatch:
 
     cdef void clear_data(self):
         # clear old vertices from vbo and then reset index buffer
-        self.vbo.remove_vertex_data(<unsigned short*>self.vbo_index.pointer(),
-                                    self.vbo_index.count())
+        if self.index_type == GL_UNSIGNED_INT:
+            # the vertices of set_large_data() fill the whole vbo
+            self.vbo.data.clear()
+            self.index_type = GL_UNSIGNED_SHORT
+            self.elements = Buffer(sizeof(unsigned short))
+            self.elements_size = 0
+        else:
+            self.vbo.remove_vertex_data(
+                <unsigned short*>self.vbo_index.pointer(),
+                self.vbo_index.count())
         self.vbo_index.clear()
         self.elements.clear()
+        self.elements_range = 0
+        self.flags |= V_NEEDMERGE
 
     cdef void set_data(self, void *vertices, int vertices_count,
                        unsigned short *indices, int indices_count):
@@ -187,7 +231,43 @@ cdef class VertexBatch:
         for i in xrange(indices_count):
             local_index = indices[i]
             self.elements.add(&vbi[local_index], NULL, 1)
-        self.flags |= V_NEEDUPLOAD
+            if vbi[local_index] >= self.elements_range:
+                self.elements_range = vbi[local_index] + 1
+        self.flags |= V_NEEDUPLOAD | V_NEEDMERGE
+
+    cdef void update_data(self, int index, void *vertices, int count):
+        # replace count vertices starting at the local index, the indices are
+        # unchanged. Only the vbo blocks of these vertices will be uploaded.
+        cdef int i, size = self.vbo.format_size
+        cdef unsigned short *vbi = <unsigned short*>self.vbo_index.pointer()
+        if self.index_type == GL_UNSIGNED_INT:
+            self.vbo.update_vertex_data(index, vertices, count)
+            self.flags |= V_NEEDMERGE
+            return
+        for i in xrange(count):
+            self.vbo.update_vertex_data(vbi[index + i],
+                    <char *>vertices + i * size, 1)
+        self.flags |= V_NEEDMERGE
+
+    cdef void set_large_data(self, void *vertices, int vertices_count,
+                             unsigned int *indices, int indices_count):
+        # Same as set_data(), with unsigned int indices: the number of vertices
+        # is not limited to 65536. The vertices are copied as they are in the
+        # vbo, that must not be shared with another batch. Check
+        # GLCAP_UINT_INDICES before using it.
+        cdef int i
+        self.clear_data()
+        self.vbo.data.clear()
+        self.index_type = GL_UNSIGNED_INT
+        self.elements = Buffer(sizeof(unsigned int))
+        self.elements_size = 0
+
+        self.vbo.add_vertex_data(vertices, NULL, vertices_count)
+        self.elements.add(indices, NULL, indices_count)
+        for i in xrange(indices_count):
+            if indices[i] >= self.elements_range:
+                self.elements_range = indices[i] + 1
+        self.flags |= V_NEEDUPLOAD | V_NEEDMERGE
 
     cdef void draw(self):
         cdef int count = self.elements.count()
@@ -208,16 +288,20 @@ cdef class VertexBatch:
             if self.elements_size == self.elements.size():
                 glBufferSubData(GL_ELEMENT_ARRAY_BUFFER, 0, self.elements_size,
                     self.elements.pointer())
+                stats.buffer_updates += 1
             else:
                 glBufferData(GL_ELEMENT_ARRAY_BUFFER, self.elements.size(),
                     self.elements.pointer(), self.usage)
                 self.elements_size = self.elements.size()
+                stats.buffer_uploads += 1
+            stats.buffer_bytes += self.elements_size
             self.flags &= ~V_NEEDUPLOAD
 
         self.vbo.bind()
 
         # draw the elements pointed by indices in ELEMENT ARRAY BUFFER.
-        glDrawElements(self.mode, count, GL_UNSIGNED_SHORT, NULL)
+        glDrawElements(self.mode, count, self.index_type, NULL)
+        stats.draw_calls += 1
 
     cdef void set_mode(self, str mode):
         # most common case in top;
@@ -250,3 +334,82 @@ cdef class VertexBatch:
                 id(self), self.id if self.flags & V_HAVEID else None,
                 self.elements.count(), self.elements.size(), self.get_mode(),
                 id(self.vbo))
+
+
+cdef class MergedVertexBatch(VertexBatch):
+    '''VertexBatch drawing the content of other batches in one call. The
+    batches must use the same vertex format and mode, and have less than 65536
+    vertices in total.
+
+    When the batches are merged again, only the vertices and indices of the
+    batches that have changed are copied and uploaded, as long as their number
+    is the same.
+
+    .. versionadded:: 1.8.0
+    '''
+    def __init__(self, **kwargs):
+        VertexBatch.__init__(self, **kwargs)
+        self.batches = []
+        # (vertices, indices) count of each batch
+        self.ranges = []
+
+    cdef void merge(self, list batches):
+        cdef VertexBatch batch
+        cdef int i, count = len(batches)
+        cdef int vertex_offset = 0, elements_offset = 0
+        cdef int rebuild = count != len(self.batches)
+
+        if not rebuild:
+            for i in xrange(count):
+                batch = batches[i]
+                if batch is not self.batches[i]:
+                    rebuild = 1
+                    break
+                if batch.flags & V_NEEDMERGE and self.ranges[i] != (
+                        batch.elements_range, batch.elements.count()):
+                    rebuild = 1
+                    break
+
+        if rebuild:
+            self.vbo.data.clear()
+            self.elements.clear()
+            self.ranges = []
+
+        for i in xrange(count):
+            batch = batches[i]
+            if rebuild:
+                # the vertices are copied as they are in the vbo of the
+                # batch, the indices only need to be shifted
+                self.vbo.add_vertex_data(batch.vbo.data.pointer(), NULL,
+                                         batch.elements_range)
+                self.copy_elements(batch, vertex_offset, elements_offset, 1)
+                self.ranges.append(
+                    (batch.elements_range, batch.elements.count()))
+            elif batch.flags & V_NEEDMERGE:
+                self.vbo.update_vertex_data(vertex_offset,
+                        batch.vbo.data.pointer(), batch.elements_range)
+                self.copy_elements(batch, vertex_offset, elements_offset, 0)
+            batch.flags &= ~V_NEEDMERGE
+            vertex_offset += batch.elements_range
+            elements_offset += batch.elements.count()
+
+        self.batches = batches
+
+    cdef void copy_elements(self, VertexBatch batch, int vertex_offset,
+                            int elements_offset, int append):
+        cdef int i, count = batch.elements.count()
+        cdef unsigned short *src = <unsigned short *>batch.elements.pointer()
+        cdef unsigned short *dst
+        if count == 0:
+            return
+        dst = <unsigned short *>malloc(sizeof(unsigned short) * count)
+        if dst == NULL:
+            raise MemoryError('vertex index allocation')
+        for i in xrange(count):
+            dst[i] = src[i] + vertex_offset
+        if append:
+            self.elements.add(dst, NULL, count)
+        else:
+            self.elements.update(elements_offset, dst, count)
+        free(dst)
+        self.flags |= V_NEEDUPLOAD
@@ -11,21 +11,65 @@ __all__ = ('Triangle', 'Quad', 'Rectangle', 'BorderImage', 'Ellipse', 'Line',
 
 include "config.pxi"
 include "common.pxi"
+include "opcodes.pxi"
+include "opengl_utils_def.pxi"
 
 from kivy.graphics.vbo cimport *
 from kivy.graphics.vertex cimport *
 from kivy.graphics.instructions cimport *
 from kivy.graphics.c_opengl cimport *
+from kivy.graphics.opengl_utils cimport gl_has_capability
 IF USE_OPENGL_DEBUG == 1:
     from kivy.graphics.c_opengl_debug cimport *
 from kivy.logger import Logger
 from kivy.graphics.texture cimport Texture
+# needed for using array.array as a buffer with python 2
+from cpython.array cimport array
 
 
 class GraphicException(Exception):
     '''Exception fired when a graphic error is fired.
     '''
 
+
+cdef int is_float_buffer(object value):
+    # Return 1 if value can be used without copy as a contiguous buffer of
+    # floats
+    cdef float[::1] view
+    if isinstance(value, (list, tuple)):
+        return 0
+    try:
+        view = value
+    except (TypeError, ValueError, BufferError):
+        return 0
+    return 1
+
+
+cdef int is_ushort_buffer(object value):
+    # Return 1 if value can be used without copy as a contiguous buffer of
+    # unsigned shorts
+    cdef unsigned short[::1] view
+    if isinstance(value, (list, tuple)):
+        return 0
+    try:
+        view = value
+    except (TypeError, ValueError, BufferError):
+        return 0
+    return 1
+
+
+cdef int is_uint_buffer(object value):
+    # Return 1 if value can be used without copy as a contiguous buffer of
+    # unsigned ints
+    cdef unsigned int[::1] view
+    if isinstance(value, (list, tuple)):
+        return 0
+    try:
+        view = value
+    except (TypeError, ValueError, BufferError):
+        return 0
+    return 1
+
 include "vertex_instructions_line.pxi"
 
 
@@ -223,8 +267,12 @@ cdef class Mesh(VertexInstruction):
     release. Right now, each vertex is described with 2D coordinates (x, y) and
     a 2D texture coordinate (u, v).
 
-    In OpenGL ES 2.0 and in our graphics implementation, you cannot have more
-    than 65535 indices.
+    A mesh can have any number of vertices. Above 65536 vertices, the mesh is
+    drawn with unsigned int indices if the OpenGL implementation supports them
+    (see :data:`~kivy.graphics.opengl_utils.GLCAP_UINT_INDICES`). Otherwise,
+    the mesh is split into several vertex batches of less than 65536 vertices,
+    drawn one after the other: the strips, loops and fans are then converted
+    to independent points, lines or triangles.
 
     A list of vertices is described as::
 
@@ -237,24 +285,46 @@ cdef class Mesh(VertexInstruction):
 
         indices = [0, 1, 2]
 
+    The vertices and indices can also be given as any object supporting the
+    buffer protocol, like an `array.array`, or a numpy array. The vertices must
+    be a contiguous buffer of floats ('f'), and the indices a contiguous buffer
+    of unsigned shorts ('H') or unsigned ints ('I'). They are then used as
+    they are, without being converted to a list, and are copied directly into
+    the VBO::
+
+        from array import array
+        mesh = Mesh(vertices=array('f', [0, 0, 0, 0, 100, 0, 1, 0]),
+                    indices=array('H', [0, 1]), mode='lines')
+
+    Any other object is converted to a list.
+
     .. versionadded:: 1.1.0
 
+    .. versionchanged:: 1.8.0
+        Buffer protocol objects are accepted for the vertices and indices.
+        :meth:`update_vertices` added. The number of vertices and indices is
+        not limited anymore.
+
     :Parameters:
-        `vertices`: list
+        `vertices`: list or buffer
             List of vertices in the format (x1, y1, u1, v1, x2, y2, u2, v2...)
-        `indices`: list
+        `indices`: list or buffer
             List of indices in the format (i1, i2, i3...)
         `mode`: str
             Mode of the vbo. Check :data:`mode` for more information. Default to
             'points'.
 
     '''
-    cdef list _vertices
-    cdef list _indices
+    cdef object _vertices
+    cdef object _indices
     cdef VertexFormat vertex_format
+    cdef str _mode
+    # batches drawn after self.batch when the mesh is split
+    cdef list _batches
 
     def __init__(self, **kwargs):
         VertexInstruction.__init__(self, **kwargs)
+        self._batches = []
         v = kwargs.get('vertices')
         self.vertices = v if v is not None else []
         v = kwargs.get('indices')
@@ -270,56 +340,310 @@ cdef class Mesh(VertexInstruction):
         cdef int icount = len(self._indices)
         cdef float *vertices = NULL
         cdef unsigned short *indices = NULL
-        cdef list lvertices = self._vertices
-        cdef list lindices = self._indices
-        cdef vsize = self.batch.vbo.vertex_format.vsize
+        cdef unsigned int *indices32 = NULL
+        cdef float[::1] fvertices
+        cdef unsigned short[::1] uindices
+        cdef unsigned int[::1] uiindices
+        cdef int copy_vertices = isinstance(self._vertices, list)
+        cdef int copy_indices = 1
+        cdef int vsize = self.batch.vbo.vertex_format.vsize
+        cdef int large = vcount / vsize > 65536
+
+        self.batch.set_mode(self._mode)
+        self.flags &= ~GI_NO_BATCH
 
         if vcount == 0 or icount == 0:
             self.batch.clear_data()
+            del self._batches[:]
             return
 
-        vertices = <float *>malloc(vcount * sizeof(float))
-        if vertices == NULL:
-            raise MemoryError('vertices')
+        # buffers are used as they are, lists are converted
+        if copy_vertices:
+            vertices = <float *>malloc(vcount * sizeof(float))
+            if vertices == NULL:
+                raise MemoryError('vertices')
+            lvertices = self._vertices
+            for i in xrange(vcount):
+                vertices[i] = lvertices[i]
+        else:
+            fvertices = self._vertices
+            vertices = &fvertices[0]
+
+        # the indices are needed as unsigned int only for the large meshes
+        if large:
+            if is_uint_buffer(self._indices):
+                uiindices = self._indices
+                indices32 = &uiindices[0]
+                copy_indices = 0
+            else:
+                indices32 = <unsigned int *>malloc(
+                        icount * sizeof(unsigned int))
+                if indices32 != NULL:
+                    lindices = self._indices
+                    for i in xrange(icount):
+                        indices32[i] = lindices[i]
+        else:
+            if is_ushort_buffer(self._indices):
+                uindices = self._indices
+                indices = &uindices[0]
+                copy_indices = 0
+            else:
+                indices = <unsigned short *>malloc(
+                        icount * sizeof(unsigned short))
+                if indices != NULL:
+                    lindices = self._indices
+                    for i in xrange(icount):
+                        indices[i] = lindices[i]
+
+        if indices == NULL and indices32 == NULL:
+            if copy_vertices:
+                free(vertices)
+            raise MemoryError('indices')
 
-        indices = <unsigned short *>malloc(icount * sizeof(unsigned short))
-        if indices == NULL:
+        if not large:
+            self.batch.set_data(vertices, vcount / vsize, indices, icount)
+            del self._batches[:]
+        elif gl_has_capability(c_GLCAP_UINT_INDICES):
+            self.batch.set_large_data(vertices, vcount / vsize, indices32,
+                                      icount)
+            del self._batches[:]
+            self.flags |= GI_NO_BATCH
+        else:
+            self.split(vertices, vcount / vsize, indices32, icount)
+            self.flags |= GI_NO_BATCH
+
+        if copy_vertices:
             free(vertices)
-            raise MemoryError('indices')
+        if copy_indices:
+            free(indices)
+            free(indices32)
+
+    cdef void split(self, float *vertices, int vcount, unsigned int *indices,
+                    int icount):
+        # Split the mesh in batches of less than 65536 vertices, for the
+        # OpenGL implementations without unsigned int indices. The strips,
+        # loops and fans are converted to independent primitives first.
+        cdef int i, j, k, p, g, count, new, nlocal = 0, nindices = 0
+        cdef int used = 0
+        cdef int mode = self.batch.mode
+        cdef str split_mode
+        cdef unsigned int *prims = NULL
+        cdef int *remap = NULL
+        cdef unsigned int *local = NULL
+        cdef unsigned short *chunk = NULL
+        cdef float *chunk_vertices = NULL
+
+        if mode == GL_POINTS:
+            p = 1
+            split_mode = 'points'
+            count = icount
+        elif mode == GL_LINES or mode == GL_LINE_STRIP or \
+                mode == GL_LINE_LOOP:
+            p = 2
+            split_mode = 'lines'
+            if mode == GL_LINES:
+                count = icount / 2
+            elif mode == GL_LINE_STRIP:
+                count = max(icount - 1, 0)
+            else:
+                count = icount if icount > 1 else 0
+        else:
+            p = 3
+            split_mode = 'triangles'
+            if mode == GL_TRIANGLES:
+                count = icount / 3
+            else:
+                count = max(icount - 2, 0)
+
+        prims = <unsigned int *>malloc(count * p * sizeof(unsigned int))
+        remap = <int *>malloc(vcount * sizeof(int))
+        local = <unsigned int *>malloc(65536 * sizeof(unsigned int))
+        chunk = <unsigned short *>malloc(count * p * sizeof(unsigned short))
+        chunk_vertices = <float *>malloc(
+                65536 * self.batch.vbo.format_size)
+        if prims == NULL or remap == NULL or local == NULL or \
+                chunk == NULL or chunk_vertices == NULL:
+            free(prims)
+            free(remap)
+            free(local)
+            free(chunk)
+            free(chunk_vertices)
+            raise MemoryError('split')
 
+        for i in xrange(count):
+            k = i * p
+            if mode == GL_LINE_STRIP or mode == GL_LINE_LOOP:
+                prims[k] = indices[i]
+                prims[k + 1] = indices[(i + 1) % icount]
+            elif mode == GL_TRIANGLE_STRIP:
+                # keep the winding of the odd triangles
+                prims[k] = indices[i + i % 2]
+                prims[k + 1] = indices[i + 1 - i % 2]
+                prims[k + 2] = indices[i + 2]
+            elif mode == GL_TRIANGLE_FAN:
+                prims[k] = indices[0]
+                prims[k + 1] = indices[i + 1]
+                prims[k + 2] = indices[i + 2]
+            else:
+                for j in xrange(p):
+                    prims[k + j] = indices[k + j]
+
+        # fill the batches with the primitives, until a batch have 65536
+        # vertices. remap is the index of a vertex in the current batch.
         for i in xrange(vcount):
-            vertices[i] = lvertices[i]
-        for i in xrange(icount):
-            indices[i] = lindices[i]
+            remap[i] = -1
+        for i in xrange(count):
+            k = i * p
+            new = 0
+            for j in xrange(p):
+                g = prims[k + j]
+                # skip the primitives using an invalid vertex
+                if g < 0 or g >= vcount:
+                    break
+                if remap[g] == -1:
+                    new += 1
+            else:
+                if nlocal + new > 65536:
+                    self.add_split_batch(used, split_mode, vertices, local,
+                            nlocal, chunk, nindices, chunk_vertices)
+                    used += 1
+                    for j in xrange(nlocal):
+                        remap[local[j]] = -1
+                    nlocal = nindices = 0
+                for j in xrange(p):
+                    g = prims[k + j]
+                    if remap[g] == -1:
+                        remap[g] = nlocal
+                        local[nlocal] = g
+                        nlocal += 1
+                    chunk[nindices] = remap[g]
+                    nindices += 1
+
+        if nindices or used == 0:
+            self.add_split_batch(used, split_mode, vertices, local, nlocal,
+                    chunk, nindices, chunk_vertices)
+            used += 1
+        del self._batches[used - 1:]
+
+        free(prims)
+        free(remap)
+        free(local)
+        free(chunk)
+        free(chunk_vertices)
+
+    cdef void add_split_batch(self, int index, str mode, float *vertices,
+            unsigned int *local, int nlocal, unsigned short *indices,
+            int nindices, float *chunk_vertices):
+        # Copy the vertices of a part of a split mesh into its batch. The
+        # first part uses self.batch, the others the batches after it.
+        cdef int i, vsize = self.batch.vbo.vertex_format.vsize
+        cdef VertexBatch batch
+        for i in xrange(nlocal):
+            memcpy(&chunk_vertices[i * vsize], &vertices[local[i] * vsize],
+                   vsize * sizeof(float))
+        if index == 0:
+            batch = self.batch
+        elif index <= len(self._batches):
+            batch = self._batches[index - 1]
+        else:
+            batch = VertexBatch(vbo=VBO(self.batch.vbo.vertex_format))
+            self._batches.append(batch)
+        batch.set_mode(mode)
+        batch.set_data(chunk_vertices, nlocal, indices, nindices)
+
+    cdef void apply(self):
+        cdef VertexBatch batch
+        if self.flags & GI_NEEDS_UPDATE:
+            self.build()
+            self.flag_update_done()
+        self.batch.draw()
+        for batch in self._batches:
+            batch.draw()
+
+    def update_vertices(self, int index, vertices):
+        '''Replace the vertices of the mesh starting at the vertex `index`
+        with `vertices`, a list or a buffer of floats. The number of vertices
+        doesn't change, and only the new vertices are uploaded to the GPU::
+
+            # move the second vertex of a x, y, u, v mesh
+            mesh.update_vertices(1, [100, 50, 1, 0])
+
+        If :data:`vertices` is a buffer, the new values are written into it.
+
+        .. versionadded:: 1.8.0
+        '''
+        cdef int i, count = len(vertices)
+        cdef int vsize = self.batch.vbo.vertex_format.vsize
+        cdef int start = index * vsize
+        cdef float *data = NULL
+        cdef float[::1] dst, src
+
+        if count % vsize != 0:
+            raise GraphicException(
+                'The number of values must be a multiple of %d' % vsize)
+        if index < 0 or start + count > len(self._vertices):
+            raise GraphicException('Vertices out of the mesh')
+        if count == 0:
+            return
 
-        self.batch.set_data(vertices, vcount / vsize, indices, icount)
+        # store the new values
+        if isinstance(self._vertices, list):
+            self._vertices[start:start + count] = list(vertices)
+        else:
+            dst = self._vertices
+            if is_float_buffer(vertices):
+                src = vertices
+                dst[start:start + count] = src
+            else:
+                for i in xrange(count):
+                    dst[start + i] = vertices[i]
+
+        # the whole mesh will be built anyway
+        if self.flags & GI_NEEDS_UPDATE:
+            return
 
-        free(vertices)
-        free(indices)
+        # the vertices of a split mesh are spread into several batches
+        if self._batches:
+            self.flag_update()
+            return
+
+        if isinstance(self._vertices, list):
+            data = <float *>malloc(count * sizeof(float))
+            if data == NULL:
+                raise MemoryError('vertices')
+            for i in xrange(count):
+                data[i] = self._vertices[start + i]
+            self.batch.update_data(index, data, count / vsize)
+            free(data)
+        else:
+            self.batch.update_data(index, &dst[start], count / vsize)
+
+        if self.parent is not None:
+            self.parent.flag_update()
 
     property vertices:
-        '''List of x, y, u, v, ... used to construct the Mesh. Right now, the
-        Mesh instruction doesn't allow you to change the format of the vertices,
-        mean it's only x/y + one texture coordinate.
+        '''List or buffer of x, y, u, v, ... used to construct the Mesh. Right
+        now, the Mesh instruction doesn't allow you to change the format of the
+        vertices, mean it's only x/y + one texture coordinate.
         '''
         def __get__(self):
             return self._vertices
         def __set__(self, value):
-            self._vertices = list(value)
+            if not is_float_buffer(value):
+                value = list(value)
+            self._vertices = value
             self.flag_update()
 
     property indices:
-        '''Vertex indices used to know which order you wanna do for drawing the
-        mesh.
+        '''List or buffer of the vertex indices used to know which order you
+        wanna do for drawing the mesh.
         '''
         def __get__(self):
             return self._indices
         def __set__(self, value):
-            if len(value) > 65535:
-                raise GraphicException(
-                    'Cannot upload more than 65535 indices'
-                    '(OpenGL ES 2 limitation)')
-            self._indices = list(value)
+            if not is_ushort_buffer(value) and not is_uint_buffer(value):
+                value = list(value)
+            self._indices = value
             self.flag_update()
 
     property mode:
@@ -327,9 +651,11 @@ cdef class Mesh(VertexInstruction):
         'line_strip', 'line_loop', 'lines', 'triangle_strip', 'triangle_fan'
         '''
         def __get__(self):
-            self.batch.get_mode()
+            return self._mode
         def __set__(self, mode):
+            self._mode = mode
             self.batch.set_mode(mode)
+            self.flag_update()
 
 
 
@@ -349,8 +675,13 @@ cdef class Point(VertexInstruction):
         2 entry in the list (x + y) will be converted to 4 vertices. So the
         limit inside Point() class is 2^15-2.
 
+    .. versionchanged:: 1.8.0
+        The points can be a contiguous buffer of floats, like an
+        `array.array('f')` or a numpy float32 array. It is read without
+        being converted to a list.
+
     '''
-    cdef list _points
+    cdef object _points
     cdef float _pointsize
 
     def __init__(self, **kwargs):
@@ -362,7 +693,9 @@ cdef class Point(VertexInstruction):
     cdef void build(self):
         cdef float x, y, ps = self._pointsize
         cdef int i, iv, ii, count = <int>(len(self._points) * 0.5)
-        cdef list p = self.points
+        cdef float *p = NULL
+        cdef float[::1] fpoints
+        cdef int copy_points = isinstance(self._points, list)
         cdef float *tc = self._tex_coords
         cdef vertex_t *vertices = NULL
         cdef unsigned short *indices = NULL
@@ -372,13 +705,29 @@ cdef class Point(VertexInstruction):
             self.batch.clear_data()
             return
 
+        # a buffer is read as it is, a list is converted
+        if copy_points:
+            p = <float *>malloc(count * 2 * sizeof(float))
+            if p == NULL:
+                raise MemoryError('points')
+            lpoints = self._points
+            for i in xrange(count * 2):
+                p[i] = lpoints[i]
+        else:
+            fpoints = self._points
+            p = &fpoints[0]
+
         vertices = <vertex_t *>malloc(count * 4 * sizeof(vertex_t))
         if vertices == NULL:
+            if copy_points:
+                free(p)
             raise MemoryError('vertices')
 
         indices = <unsigned short *>malloc(count * 6 * sizeof(unsigned short))
         if indices == NULL:
             free(vertices)
+            if copy_points:
+                free(p)
             raise MemoryError('indices')
 
         for i in xrange(count):
@@ -414,6 +763,8 @@ cdef class Point(VertexInstruction):
 
         free(vertices)
         free(indices)
+        if copy_points:
+            free(p)
 
     def add_point(self, float x, float y):
         '''Add a point into the current :data:`points` list.
@@ -432,6 +783,8 @@ cdef class Point(VertexInstruction):
         if len(self._points) > 2**15 - 2:
             raise GraphicException('Cannot add elements (limit is 2^15-2)')
 
+        if not isinstance(self._points, list):
+            self._points = list(self._points)
         self._points.append(x)
         self._points.append(y)
 
@@ -472,12 +825,15 @@ cdef class Point(VertexInstruction):
         def __get__(self):
             return self._points
         def __set__(self, points):
-            if self._points == points:
+            if points is self._points:
                 return
-            cdef list _points = list(points)
-            if len(_points) > 2**15-2:
+            if not is_float_buffer(points):
+                points = list(points)
+                if isinstance(self._points, list) and self._points == points:
+                    return
+            if len(points) > 2**15-2:
                 raise GraphicException('Too many elements (limit is 2^15-2)')
-            self._points = list(points)
+            self._points = points
             self.flag_update()
 
     property pointsize:
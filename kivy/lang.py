@@ -14,10 +14,23 @@ interactions. You could compare this language to Qt's QML
     after dispatching input, and just before drawing the frame. If you want to
     force the execution of canvas drawing, just call :meth:`Builder.sync`.
 
+    Since 1.8.0, the other expressions can be delayed the same way with
+    :attr:`BuilderBase.delay_expressions`.
+
     A experimental profiling tool of kv lang is also done, you can activate it
     by setting the env `KIVY_PROFILE_LANG=1`. You will get an html file named
     `builder_stats.html`.
 
+.. versionchanged:: 1.8.0
+
+    With `KIVY_PROFILE_LANG=1`, the time spent in each rule, property
+    expression and event handler is also recorded, and a report sorted by
+    total cost is printed when the application exits. The profiling can also
+    be controlled with :meth:`Builder.start_profiling
+    <BuilderBase.start_profiling>`, :meth:`Builder.stop_profiling
+    <BuilderBase.stop_profiling>` and :meth:`Builder.print_profile
+    <BuilderBase.print_profile>`.
+
 Overview
 --------
 
@@ -607,26 +620,48 @@ Set a key that will be available anywhere in the kv. For example:
         canvas:
             Color:
                 rgb: my_color if self.state == 'normal' else my_color_hl
+
+Compiled kv cache
+-----------------
+
+.. versionadded:: 1.8.0
+
+Parsing a kv file and compiling all its expressions takes time, especially on
+slow devices. The first time a file is loaded with :meth:`Builder.load_file
+<BuilderBase.load_file>`, the result of the parsing (the rules, templates,
+dynamic classes and compiled expressions) is saved in the `kvcache` directory
+of the Kivy home directory. The next time, if neither the modification time
+nor the content of the file have changed, the parsing is skipped and the
+compiled rules are read from the cache, like Python does with the `.pyc`
+files.
+
+The cache is disabled if the `KIVY_NO_KVCACHE` environment variable is set,
+or if :attr:`BuilderBase.cache` is set to None.
 '''
 
 __all__ = ('Builder', 'BuilderBase', 'BuilderException',
-           'Parser', 'ParserException')
+           'Parser', 'ParserCache', 'ParserException')
 
 import codecs
+import marshal
 import re
 import sys
 from re import sub, findall
-from os import environ
-from os.path import join
+from hashlib import sha1
+from os import environ, listdir, makedirs, unlink, rename, close, write
+from os.path import join, abspath, exists, getmtime
+from tempfile import mkstemp
 from copy import copy
 from types import CodeType
 from functools import partial
+from itertools import count
+from timeit import default_timer as _profile_time
 from collections import OrderedDict
 from kivy.factory import Factory
 from kivy.logger import Logger
 from kivy.utils import QueryDict
 from kivy.cache import Cache
-from kivy import kivy_data_dir, require
+from kivy import kivy_data_dir, kivy_home_dir, require
 from kivy.compat import PY2, iteritems, iterkeys
 from kivy.context import register_context
 import kivy.metrics as Metrics
@@ -650,10 +685,22 @@ lang_tr = re.compile('(_\()')
 # delayed calls are canvas expression triggered during an loop
 _delayed_calls = []
 
+# magic number of the python bytecode, the marshal format of the code objects
+# depends on it
+try:
+    from importlib.util import MAGIC_NUMBER as _bytecode_magic
+except ImportError:
+    from imp import get_magic
+    _bytecode_magic = get_magic()
+
 # all the widget handlers, used to correctly unbind all the callbacks then the
 # widget is deleted
 _handlers = {}
 
+# profiling of the rules, (kind, filename, line, name) -> [count, total time],
+# or None if the profiling is disabled
+_profile = {} if 'KIVY_PROFILE_LANG' in environ else None
+
 
 class ProxyApp(object):
     # proxy app object
@@ -988,7 +1035,14 @@ class Parser(object):
         content = kwargs.get('content', None)
         if content is None:
             raise ValueError('No content passed')
-        self.parse(content)
+        cache = kwargs.get('cache', None)
+        objects = None
+        if cache is not None:
+            objects = cache.load(self, content)
+        if objects is None:
+            objects = self.parse(content)
+            if cache is not None:
+                cache.save(self, content, objects)
 
     def execute_directives(self):
         for ln, cmd in self.directives:
@@ -1046,7 +1100,7 @@ class Parser(object):
         # Read and parse the lines of the file
         lines = content.splitlines()
         if not lines:
-            return
+            return []
         num_lines = len(lines)
         lines = list(zip(list(range(num_lines)), lines))
         self.sourcecode = lines[:]
@@ -1073,6 +1127,8 @@ class Parser(object):
             ln, content = remaining_lines[0]
             raise ParserException(self, ln, 'Invalid data (not parsed)')
 
+        return objects
+
     def strip_comments(self, lines):
         '''Remove all comments from all lines in-place.
            Comments need to be on a single line and not at the end of a line.
@@ -1229,6 +1285,161 @@ class Parser(object):
         return objects, []
 
 
+class ParserCache(object):
+    '''Persistent cache of the parsed kv files. See the module documentation
+    for more information.
+
+    .. versionadded:: 1.8.0
+
+    :Parameters:
+        `directory`: str
+            Directory where the compiled files are stored. It is created if
+            needed.
+    '''
+
+    #: Version of the cache format. The cached files of another version are
+    #: ignored.
+    version = 1
+
+    def __init__(self, directory):
+        super(ParserCache, self).__init__()
+        self.directory = directory
+        #: Number of files read from the cache
+        self.hits = 0
+        #: Number of files that have been parsed
+        self.misses = 0
+
+    def get_filename(self, filename):
+        '''Return the filename of the cached version of a kv file.
+        '''
+        key = sha1(abspath(filename).encode('utf8')).hexdigest()
+        return join(self.directory, key + '.kvc')
+
+    def load(self, parser, content):
+        '''Restore the parser from the cache, and return the list of root
+        objects. None is returned if the file is not in the cache, or if it
+        has changed since it was cached.
+        '''
+        header = self._get_header(parser.filename, content)
+        if header is None:
+            return None
+        fn = self.get_filename(parser.filename)
+        try:
+            with open(fn, 'rb') as fd:
+                cached_header, data = marshal.loads(fd.read())
+            if cached_header != header:
+                self.misses += 1
+                return None
+            directives, objects = marshal.loads(data)
+        except IOError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            Logger.warning('Lang: Unable to read the kv cache {}: {}'.format(
+                fn, e))
+            self.misses += 1
+            return None
+        self.hits += 1
+
+        parser.sourcecode = list(enumerate(content.splitlines()))
+        parser.directives = [tuple(x) for x in directives]
+        parser.execute_directives()
+        return [self._load_rule(parser, x) for x in objects]
+
+    def save(self, parser, content, objects):
+        '''Save the root objects of a parser in the cache.
+        '''
+        header = self._get_header(parser.filename, content)
+        if header is None:
+            return
+        fn = self.get_filename(parser.filename)
+        try:
+            data = (parser.directives,
+                    [self._dump_rule(x) for x in objects])
+            # the header is checked before unmarshalling the rules
+            data = marshal.dumps((header, marshal.dumps(data)))
+        except ValueError:
+            # an expression evaluated to an object that cannot be marshalled
+            return
+        try:
+            if not exists(self.directory):
+                makedirs(self.directory)
+            fd, tmpfilename = mkstemp(dir=self.directory)
+            try:
+                write(fd, data)
+            finally:
+                close(fd)
+            if exists(fn):
+                unlink(fn)
+            rename(tmpfilename, fn)
+        except (IOError, OSError) as e:
+            Logger.warning('Lang: Unable to write the kv cache {}: {}'.format(
+                fn, e))
+
+    def clear(self):
+        '''Remove all the cached files.
+        '''
+        if not exists(self.directory):
+            return
+        for fn in listdir(self.directory):
+            if fn.endswith('.kvc'):
+                unlink(join(self.directory, fn))
+
+    def _get_header(self, filename, content):
+        # the file is identified by its path, its modification time and a
+        # hash of its content
+        if filename is None:
+            return None
+        try:
+            mtime = getmtime(filename)
+        except OSError:
+            return None
+        if not isinstance(content, bytes):
+            content = content.encode('utf8')
+        return (self.version, _bytecode_magic, abspath(filename), mtime,
+                sha1(content).hexdigest())
+
+    def _dump_property(self, prop):
+        return (prop.line, prop.name, prop.value, prop.mode, prop.co_value,
+                prop.watched_keys)
+
+    def _dump_rule(self, rule):
+        dump_property = self._dump_property
+        dump_rule = self._dump_rule
+        return (rule.line, rule.name, rule.level, rule.id,
+                [dump_property(x) for x in rule.properties.values()],
+                [dump_property(x) for x in rule.handlers],
+                [dump_rule(x) for x in rule.children],
+                [dump_rule(x) if x is not None else None for x in (
+                    rule.canvas_before, rule.canvas_root, rule.canvas_after)])
+
+    def _load_property(self, ctx, data):
+        line, name, value, mode, co_value, watched_keys = data
+        prop = ParserRuleProperty(ctx, line, name, value)
+        prop.mode = mode
+        prop.co_value = co_value
+        prop.watched_keys = watched_keys
+        return prop
+
+    def _load_rule(self, ctx, data):
+        line, name, level, rule_id, properties, handlers, children, \
+            canvas = data
+        # the rule is registered in the parser by the constructor, like
+        # during the parsing
+        rule = ParserRule(ctx, line, name, level)
+        rule.id = rule_id
+        load_property = self._load_property
+        for prop in properties:
+            prop = load_property(ctx, prop)
+            rule.properties[prop.name] = prop
+        rule.handlers = [load_property(ctx, x) for x in handlers]
+        rule.children = [self._load_rule(ctx, x) for x in children]
+        rule.canvas_before, rule.canvas_root, rule.canvas_after = [
+            self._load_rule(ctx, x) if x is not None else None
+            for x in canvas]
+        return rule
+
+
 def get_proxy(widget):
     try:
         return widget.proxy_ref
@@ -1236,8 +1447,25 @@ def get_proxy(widget):
         return widget
 
 
+def _profile_add(kind, rule, start):
+    profile = _profile
+    if profile is None:
+        return
+    key = (kind, rule.ctx.filename, rule.line, rule.name)
+    stat = profile.get(key)
+    if stat is None:
+        profile[key] = stat = [0, 0.]
+    stat[0] += 1
+    stat[1] += _profile_time() - start
+
+
 def custom_callback(__kvlang__, idmap, *largs, **kwargs):
     idmap['args'] = largs
+    if _profile is not None:
+        start = _profile_time()
+        exec(__kvlang__.co_value, idmap)
+        _profile_add('handler', __kvlang__, start)
+        return
     exec(__kvlang__.co_value, idmap)
 
 
@@ -1258,10 +1486,13 @@ def create_handler(iself, element, key, value, rule, idmap, delayed=False):
             trace('Builder: call_fn %s, key=%s, value=%r, %r' % (
                 element, key, value, rule.value))
         rule.count += 1
+        start = _profile_time() if _profile is not None else None
         e_value = eval(value, idmap)
         if __debug__:
             trace('Builder: call_fn => value=%r' % (e_value, ))
         setattr(element, key, e_value)
+        if start is not None:
+            _profile_add('update', rule, start)
 
     def delayed_call_fn(*args):
         _delayed_calls.append(call_fn)
@@ -1285,6 +1516,11 @@ def create_handler(iself, element, key, value, rule, idmap, delayed=False):
                 continue
 
     try:
+        if _profile is not None:
+            start = _profile_time()
+            e_value = eval(value, idmap)
+            _profile_add('expression', rule, start)
+            return e_value
         return eval(value, idmap)
     except Exception as e:
         raise BuilderException(rule.ctx, rule.line,
@@ -1320,24 +1556,34 @@ class ParserSelectorName(ParserSelector):
 
     parents = {}
 
-    def get_bases(self, cls):
-        for base in cls.__bases__:
+    @classmethod
+    def get_bases(cls, klass):
+        for base in klass.__bases__:
             if base.__name__ == 'object':
                 break
             yield base
             if base.__name__ == 'Widget':
                 break
-            for cbase in self.get_bases(base):
+            for cbase in cls.get_bases(base):
                 yield cbase
 
-    def match(self, widget):
+    @classmethod
+    def get_names(cls, klass):
+        # lowercase names of the class and its bases, up to Widget
         parents = ParserSelectorName.parents
-        cls = widget.__class__
-        if not cls in parents:
+        if not klass in parents:
             classes = [x.__name__.lower() for x in
-                       [cls] + list(self.get_bases(cls))]
-            parents[cls] = classes
-        return self.key in parents[cls]
+                       [klass] + list(cls.get_bases(klass))]
+            parents[klass] = classes
+        return parents[klass]
+
+    def match(self, widget):
+        return self.key in self.get_names(widget.__class__)
+
+
+# selectors that can be indexed by BuilderBase
+_indexed_selectors = (ParserSelectorName, ParserSelectorId,
+                      ParserSelectorClass)
 
 
 class BuilderBase(object):
@@ -1348,8 +1594,6 @@ class BuilderBase(object):
     that you can use to load other kv file in addition to the default one.
     '''
 
-    _cache_match = {}
-
     def __init__(self):
         super(BuilderBase, self).__init__()
         self.files = []
@@ -1357,6 +1601,36 @@ class BuilderBase(object):
         self.templates = {}
         self.rules = []
         self.rulectx = {}
+        # (selector class, key) -> [(order, selector, rule)], used for finding
+        # the rules that can match a widget without testing all of them
+        self._rules_index = {}
+        # rules with a custom selector, always tested
+        self._rules_others = []
+        self._rules_order = count()
+        # (widget class, id, cls) -> matching rules
+        self._match_cache = {}
+        #: If True, the expressions of the widget properties are not executed
+        #: as soon as one of their watched properties changes. Like the
+        #: canvas expressions, they are executed once in the next
+        #: :meth:`sync`, even if several watched properties changed.
+        #: It applies to the rules applied after the change, and the first
+        #: evaluation of an expression is never delayed.
+        #:
+        #: .. versionadded:: 1.8.0
+        self.delay_expressions = False
+        #: Maximum number of passes done by :meth:`sync`, when the delayed
+        #: expressions change properties watched by other delayed expressions.
+        #:
+        #: .. versionadded:: 1.8.0
+        self.max_sync_iteration = 10
+        #: :class:`ParserCache` used for the kv files loaded with
+        #: :meth:`load_file`, or None if the parsed files are not cached.
+        #:
+        #: .. versionadded:: 1.8.0
+        self.cache = None
+        if kivy_home_dir and 'KIVY_NO_CONFIG' not in environ and \
+                'KIVY_NO_KVCACHE' not in environ:
+            self.cache = ParserCache(join(kivy_home_dir, 'kvcache'))
 
     def load_file(self, filename, **kwargs):
         '''Insert a file into the language builder.
@@ -1395,8 +1669,9 @@ class BuilderBase(object):
             template invocation.
         '''
         # remove rules and templates
+        removed = [x for x in self.rules if x[1].ctx.filename == filename]
         self.rules = [x for x in self.rules if x[1].ctx.filename != filename]
-        self._clear_matchcache()
+        self._unindex_rules(removed)
         templates = {}
         for x, y in self.templates.items():
             if y[2] != filename:
@@ -1426,12 +1701,14 @@ class BuilderBase(object):
                     'you might have unwanted behaviors.'.format(fn))
 
         try:
-            # parse the string
-            parser = Parser(content=string, filename=fn)
+            # parse the string, or read it from the cache if it come from a
+            # file
+            parser = Parser(content=string, filename=fn,
+                            cache=self.cache if fn else None)
 
             # merge rules with our rules
             self.rules.extend(parser.rules)
-            self._clear_matchcache()
+            self._index_rules(parser.rules)
 
             # add the template found by the parser into ours
             for name, cls, template in parser.templates:
@@ -1505,9 +1782,74 @@ class BuilderBase(object):
             self._apply_rule(widget, rule, rule)
 
     def _clear_matchcache(self):
-        BuilderBase._match_cache = {}
+        self._match_cache = {}
+
+    def _index_rules(self, rules):
+        index = self._rules_index
+        order = self._rules_order
+        for selector, rule in rules:
+            item = (next(order), selector, rule)
+            if type(selector) in _indexed_selectors:
+                key = (type(selector), selector.key)
+                if key not in index:
+                    index[key] = []
+                index[key].append(item)
+            else:
+                self._rules_others.append(item)
+        self._invalidate_matchcache(rules)
+
+    def _unindex_rules(self, rules):
+        if not rules:
+            return
+        removed = set([rule for selector, rule in rules])
+        index = self._rules_index
+        for key in list(index.keys()):
+            items = [x for x in index[key] if x[2] not in removed]
+            if items:
+                index[key] = items
+            else:
+                del index[key]
+        self._rules_others = [x for x in self._rules_others
+                              if x[2] not in removed]
+        self._invalidate_matchcache(rules)
+
+    def _invalidate_matchcache(self, rules):
+        # forget only the matches of the widgets that can be affected by the
+        # rules
+        names = set()
+        ids = set()
+        classes = set()
+        for selector, rule in rules:
+            selector_type = type(selector)
+            if selector_type is ParserSelectorName:
+                names.add(selector.key)
+            elif selector_type is ParserSelectorId:
+                ids.add(selector.key)
+            elif selector_type is ParserSelectorClass:
+                classes.add(selector.key)
+            else:
+                self._clear_matchcache()
+                return
+        cache = self._match_cache
+        get_names = ParserSelectorName.get_names
+        for key in list(cache.keys()):
+            cls, wid, wcls = key
+            if (wid and wid.lower() in ids) or \
+                    not classes.isdisjoint(wcls) or \
+                    not names.isdisjoint(get_names(cls)):
+                del cache[key]
 
     def _apply_rule(self, widget, rule, rootrule, template_ctx=None):
+        if _profile is not None:
+            start = _profile_time()
+            try:
+                return self._apply_rule_internal(widget, rule, rootrule,
+                                                 template_ctx)
+            finally:
+                _profile_add('rule', rule, start)
+        return self._apply_rule_internal(widget, rule, rootrule, template_ctx)
+
+    def _apply_rule_internal(self, widget, rule, rootrule, template_ctx=None):
         # widget: the current instanciated widget
         # rule: the current rule
         # rootrule: the current root rule (for children of a rule)
@@ -1633,7 +1975,8 @@ class BuilderBase(object):
                     value = rule.co_value
                     if type(value) is CodeType:
                         value = create_handler(widget_set, widget_set, key,
-                                               value, rule, rctx['ids'])
+                                               value, rule, rctx['ids'],
+                                               self.delay_expressions)
                     setattr(widget_set, key, value)
         except Exception as e:
             if rule is not None:
@@ -1671,16 +2014,34 @@ class BuilderBase(object):
     def match(self, widget):
         '''Return a list of :class:`ParserRule` matching the widget.
         '''
-        cache = BuilderBase._match_cache
+        cache = self._match_cache
         k = (widget.__class__, widget.id, tuple(widget.cls))
         if k in cache:
             return cache[k]
+
+        # collect the rules indexed with the name of the widget class and its
+        # bases, its id and its classes
+        index = self._rules_index
+        keys = [(ParserSelectorName, x) for x in
+                ParserSelectorName.get_names(widget.__class__)]
+        if widget.id:
+            keys.append((ParserSelectorId, widget.id.lower()))
+        keys.extend([(ParserSelectorClass, x) for x in widget.cls])
+        candidates = {}
+        for key in keys:
+            for item in index.get(key, ()):
+                candidates[item[0]] = item
+        for item in self._rules_others:
+            if item[1].match(widget):
+                candidates[item[0]] = item
+
+        # apply them in the order they have been loaded
         rules = []
-        for selector, rule in self.rules:
-            if selector.match(widget):
-                if rule.avoid_previous_rules:
-                    del rules[:]
-                rules.append(rule)
+        for order in sorted(candidates.keys()):
+            rule = candidates[order][2]
+            if rule.avoid_previous_rules:
+                del rules[:]
+            rules.append(rule)
         cache[k] = rules
         return rules
 
@@ -1689,14 +2050,89 @@ class BuilderBase(object):
         expressions related to the canvas.
 
         .. versionadded:: 1.7.0
+
+        .. versionchanged:: 1.8.0
+            The expressions delayed by the execution of other expressions are
+            executed too, up to :attr:`max_sync_iteration` times.
         '''
-        l = set(_delayed_calls)
-        del _delayed_calls[:]
-        for func in l:
-            try:
-                func(None, None)
-            except ReferenceError:
-                continue
+        for x in range(self.max_sync_iteration):
+            if not _delayed_calls:
+                return
+            l = set(_delayed_calls)
+            del _delayed_calls[:]
+            for func in l:
+                try:
+                    func(None, None)
+                except ReferenceError:
+                    continue
+
+    def start_profiling(self):
+        '''Start recording the time spent in the rules, the property
+        expressions and the event handlers. The recorded stats are kept if the
+        profiling was already started.
+
+        The profiling is started automatically if the `KIVY_PROFILE_LANG`
+        environment variable is set.
+
+        .. versionadded:: 1.8.0
+        '''
+        global _profile
+        if _profile is None:
+            _profile = {}
+
+    def stop_profiling(self):
+        '''Stop the profiling and forget the recorded stats.
+
+        .. versionadded:: 1.8.0
+        '''
+        global _profile
+        _profile = None
+
+    def get_profile(self):
+        '''Return the stats recorded since :meth:`start_profiling`, as a list
+        of dict sorted by total time. Each dict have the keys:
+
+        `kind`
+            `rule` for the application of a rule on a widget (including its
+            children and canvas), `expression` for the first evaluation of a
+            property expression, `update` for its evaluation when a watched
+            property changed, and `handler` for an event handler like
+            `on_press`.
+        `filename`, `line`, `name`
+            Location and name of the rule or property
+        `count`
+            Number of calls
+        `time`
+            Total time of the calls, in seconds. The time of a rule includes
+            its children, and the time of an update includes the callbacks
+            triggered by the new value.
+
+        .. versionadded:: 1.8.0
+        '''
+        if _profile is None:
+            return []
+        stats = [{'kind': kind, 'filename': filename, 'line': line + 1,
+                  'name': name, 'count': stat[0], 'time': stat[1]}
+                 for (kind, filename, line, name), stat in
+                 list(_profile.items())]
+        stats.sort(key=lambda x: x['time'], reverse=True)
+        return stats
+
+    def print_profile(self, limit=None):
+        '''Print the stats returned by :meth:`get_profile`, limited to the
+        `limit` most expensive entries.
+
+        .. versionadded:: 1.8.0
+        '''
+        stats = self.get_profile()
+        if limit is not None:
+            stats = stats[:limit]
+        print('%10s %8s  %-10s  %s' % ('total ms', 'count', 'kind',
+                                       'location'))
+        for stat in stats:
+            print('%10.3f %8d  %-10s  %s:%d %s' % (
+                stat['time'] * 1000., stat['count'], stat['kind'],
+                stat['filename'] or '<inline>', stat['line'], stat['name']))
 
     def unbind_widget(self, uid):
         '''(internal) Unbind all the handlers created by the rules of the
@@ -1804,5 +2240,6 @@ if 'KIVY_PROFILE_LANG' in environ:
             fd.write(''.join(html))
 
         print('Profiling written at builder_stats.html')
+        Builder.print_profile(limit=50)
 
     atexit.register(dump_builder_stats)
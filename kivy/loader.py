@@ -31,6 +31,46 @@ parameters:
 - :data:`Loader.max_upload_per_frame` - define the maximum image uploads in
   GPU to do per frames.
 
+Priority and cancellation
+-------------------------
+
+.. versionadded:: 1.8.0
+
+The requests are loaded by priority: a request with a higher `priority` is
+loaded before the others. Requests for the same filename are merged into one.
+If you don't need an image anymore (for example, because the widget displaying
+it has been scrolled offscreen), you can cancel its loading::
+
+    image = Loader.image('http://mysite.com/test.png', priority=10)
+    # ...
+    image.cancel()
+
+The loader keeps the :class:`ProxyImage` alive until the image is loaded as
+long as a handler is bound to its `on_load` event. A ProxyImage without any
+live `on_load` handler is not kept: the loading is cancelled when it is
+garbage collected. A request that is already being loaded cannot be
+cancelled.
+
+When several requests are merged, the image is loaded with the
+`load_callback`, `post_callback` and keyword arguments of the first request.
+
+Decoding in worker processes
+----------------------------
+
+.. versionadded:: 1.8.0
+
+By default, the images are decoded in threads. As the decoding done by
+PIL or pygame holds the GIL most of the time, you don't gain a lot by
+increasing the number of workers. You can ask the loader to decode the local
+images in a pool of worker processes instead, by setting the `KIVY_LOADER`
+environment variable to `process` before importing Kivy::
+
+    $ KIVY_LOADER=process python main.py
+
+The raw pixels of the decoded images are sent back to the application
+process, and the textures are created in the main thread as usual. Atlas
+images are still loaded in the application process.
+
 '''
 
 __all__ = ('Loader', 'LoaderBase', 'ProxyImage')
@@ -39,10 +79,13 @@ from kivy import kivy_data_dir
 from kivy.logger import Logger
 from kivy.clock import Clock
 from kivy.cache import Cache
-from kivy.core.image import ImageLoader, Image
+from kivy.core.image import ImageLoader, Image, ImageLoaderBase, ImageData
 from kivy.compat import PY2
 
 from collections import deque
+from heapq import heappush, heappop
+from weakref import ref
+from functools import partial
 from time import sleep
 from os.path import join
 from os import write, close, unlink, environ
@@ -70,10 +113,42 @@ class ProxyImage(Image):
         kwargs.setdefault('loaded', False)
         super(ProxyImage, self).__init__(arg, **kwargs)
         self.loaded = kwargs.get('loaded')
+        self._loader = None
+        self._loader_filename = None
 
     def on_load(self):
         pass
 
+    def bind(self, **kwargs):
+        super(ProxyImage, self).bind(**kwargs)
+        # the loader keeps the image alive while someone waits for it
+        loader = getattr(self, '_loader', None)
+        if 'on_load' in kwargs and loader is not None:
+            loader._hold(self)
+
+    def unbind(self, **kwargs):
+        super(ProxyImage, self).unbind(**kwargs)
+        loader = getattr(self, '_loader', None)
+        if 'on_load' in kwargs and loader is not None and \
+                not self._has_load_handler():
+            loader._release(self)
+
+    def _has_load_handler(self):
+        for handler in self.get_property_observers('on_load'):
+            if not handler.is_dead():
+                return True
+        return False
+
+    def cancel(self):
+        '''Cancel the loading of the image. If no other :class:`ProxyImage`
+        is waiting for the same filename, the request is removed from the
+        loader queue. The `on_load` event will not be fired.
+
+        .. versionadded:: 1.8.0
+        '''
+        if self._loader is not None:
+            self._loader.cancel(self)
+
 
 class LoaderBase(object):
     '''Common base for Loader and specific implementation.
@@ -91,13 +166,33 @@ class LoaderBase(object):
         self._paused = False
         self._resume_cond = threading.Condition()
 
-        self._q_load = deque()
+        # heap of (-priority, seq, request)
+        self._q_load = []
+        self._q_seq = 0
         self._q_done = deque()
-        self._client = []
+        # filenames having a garbage collected client
+        self._q_cancel = deque()
+        # filename -> request queued or being loaded
+        self._requests = {}
+        # filename -> list of weakref to the ProxyImage waiting for it
+        self._client = {}
+        # ProxyImage waiting with an on_load handler, kept alive until loaded
+        self._held = set()
         self._running = False
         self._start_wanted = False
         self._trigger_update = Clock.create_trigger(self._update)
 
+        #: :class:`~kivy.network.diskcache.DiskCache` used for storing the
+        #: images downloaded from http and https urls. If None, the images
+        #: are downloaded each time they are loaded::
+        #:
+        #:     from kivy.network.diskcache import DiskCache
+        #:     Loader.download_cache = DiskCache('/path/to/cache',
+        #:         size_limit=50 * 1024 * 1024)
+        #:
+        #: .. versionadded:: 1.8.0
+        self.download_cache = None
+
     def __del__(self):
         try:
             Clock.unschedule(self._update)
@@ -260,7 +355,13 @@ class LoaderBase(object):
         elif proto in ('http', 'https', 'ftp', 'smb'):
             data = self._load_urllib(filename, kwargs['kwargs'])
         else:
-            data = self._load_local(filename, kwargs['kwargs'])
+            try:
+                data = self._load_local(filename, kwargs['kwargs'])
+            except Exception:
+                # the request must be completed, otherwise the next requests
+                # for this filename will wait for it forever.
+                Logger.exception('Failed to load image <%s>' % filename)
+                data = self.error_image
 
         if post_callback:
             data = post_callback(data)
@@ -291,6 +392,17 @@ class LoaderBase(object):
                 Logger.warning(
                     'Loader: can not load PySMB: make sure it is installed')
                 return
+        cache = self.download_cache
+        if cache is not None and proto in ('http', 'https'):
+            try:
+                data = self._load_local(cache.fetch(filename), kwargs)
+                for imdata in data._data:
+                    imdata.source = filename
+                return data
+            except Exception:
+                Logger.exception('Failed to load image <%s>' % filename)
+                return self.error_image
+
         import tempfile
         data = fd = _out_osfd = None
         try:
@@ -351,6 +463,9 @@ class LoaderBase(object):
             self._trigger_update()
             return
 
+        self._release_unbound()
+        self._process_cancel()
+
         for x in range(self.max_upload_per_frame):
             try:
                 filename, data = self._q_done.pop()
@@ -361,20 +476,99 @@ class LoaderBase(object):
             image = data  # ProxyImage(data)
             if not image.nocache:
                 Cache.append('kv.loader', filename, image)
+            self._requests.pop(filename, None)
 
             # update client
-            for c_filename, client in self._client[:]:
-                if filename != c_filename:
+            for client_ref in self._client.pop(filename, []):
+                client = client_ref()
+                if client is None:
                     continue
                 # got one client to update
+                client._loader = None
+                self._held.discard(client)
                 client.image = image
                 client.loaded = True
                 client.dispatch('on_load')
-                self._client.remove((c_filename, client))
 
         self._trigger_update()
 
-    def image(self, filename, load_callback=None, post_callback=None, **kwargs):
+    def _push_request(self, request):
+        self._q_seq += 1
+        request['seq'] = self._q_seq
+        heappush(self._q_load, (-request['priority'], self._q_seq, request))
+
+    def _pop_request(self):
+        '''(internal) Return the queued request with the highest priority, or
+        None if the queue is empty.
+        '''
+        q_load = self._q_load
+        while q_load:
+            priority, seq, request = heappop(q_load)
+            # skip the cancelled requests, and the old entries of the
+            # requests that have been pushed again with a higher priority
+            if request['seq'] != seq or request['cancelled']:
+                continue
+            request['loading'] = True
+            return request
+
+    def _hold(self, client):
+        self._held.add(client)
+
+    def _release(self, client):
+        self._held.discard(client)
+
+    def _release_unbound(self):
+        # stop keeping the clients whose on_load handlers are all dead (the
+        # widget waiting for the image has been garbage collected), so their
+        # request can be cancelled.
+        for client in [x for x in self._held if not x._has_load_handler()]:
+            self._held.discard(client)
+
+    def _on_client_dead(self, filename, client_ref):
+        # can be called from any thread by the garbage collector, the
+        # cancellation is done in the main thread.
+        self._q_cancel.append(filename)
+        self._trigger_update()
+
+    def _process_cancel(self):
+        q_cancel = self._q_cancel
+        while q_cancel:
+            self._cancel_request(q_cancel.pop())
+
+    def _cancel_request(self, filename):
+        '''(internal) Cancel the request of the filename if no client is
+        waiting for it anymore, and if it is not already being loaded.
+        '''
+        clients = self._client.get(filename)
+        if clients:
+            clients[:] = [x for x in clients if x() is not None]
+            if clients:
+                return
+        self._client.pop(filename, None)
+        request = self._requests.get(filename)
+        if request is None or request['loading']:
+            return
+        request['cancelled'] = True
+        del self._requests[filename]
+        if Cache.get('kv.loader', filename) is False:
+            Cache.remove('kv.loader', filename)
+
+    def cancel(self, client):
+        '''Cancel the loading of a :class:`ProxyImage` returned by
+        :meth:`image`. See :meth:`ProxyImage.cancel`.
+
+        .. versionadded:: 1.8.0
+        '''
+        filename = client._loader_filename
+        client._loader = None
+        self._held.discard(client)
+        clients = self._client.get(filename)
+        if clients:
+            clients[:] = [x for x in clients if x() is not client]
+        self._cancel_request(filename)
+
+    def image(self, filename, load_callback=None, post_callback=None,
+              priority=0, **kwargs):
         '''Load a image using the Loader. A ProxyImage is returned with a
         loading image. You can use it as follows::
 
@@ -396,6 +590,15 @@ class LoaderBase(object):
             TestApp().run()
 
         In order to cancel all background loading, call *Loader.stop()*.
+
+        .. versionchanged:: 1.8.0
+            `priority` parameter added: requests with a higher priority are
+            loaded first. The request is cancelled if
+            :meth:`ProxyImage.cancel` is called, or if the returned ProxyImage
+            is garbage collected (it is kept alive while a handler is bound to
+            its `on_load` event). The requests for a filename already queued
+            are merged: only the `load_callback`, `post_callback` and keyword
+            arguments of the first one are used.
         '''
         data = Cache.get('kv.loader', filename)
         if data not in (None, False):
@@ -406,22 +609,40 @@ class LoaderBase(object):
 
         client = ProxyImage(self.loading_image,
                     loading_image=self.loading_image, **kwargs)
-        self._client.append((filename, client))
-
-        if data is None:
-            # if data is None, this is really the first time
-            self._q_load.appendleft({
+        client._loader = self
+        client._loader_filename = filename
+        if filename not in self._client:
+            self._client[filename] = []
+        self._client[filename].append(
+            ref(client, partial(self._on_client_dead, filename)))
+
+        request = self._requests.get(filename)
+        if request is None:
+            # nobody asked for this file yet, or the request was cancelled
+            request = self._requests[filename] = {
                 'filename': filename,
                 'load_callback': load_callback,
                 'post_callback': post_callback,
-                'kwargs': kwargs})
+                'kwargs': kwargs,
+                'priority': priority,
+                'loading': False,
+                'cancelled': False}
+            self._push_request(request)
             if not kwargs.get('nocache', False):
                 Cache.append('kv.loader', filename, False)
             self._start_wanted = True
             self._trigger_update()
         else:
-            # already queued for loading
-            pass
+            if load_callback is not request['load_callback'] or \
+                    post_callback is not request['post_callback'] or \
+                    kwargs != request['kwargs']:
+                Logger.warning('Loader: <%s> is already loading, the '
+                               'callbacks and options of this request are '
+                               'ignored' % filename)
+            if priority > request['priority'] and not request['loading']:
+                # already queued for loading, but now more urgent
+                request['priority'] = priority
+                self._push_request(request)
 
         return client
 
@@ -496,14 +717,83 @@ else:
             self.pool.stop()
 
         def run(self, *largs):
-            while self._running:
-                try:
-                    parameters = self._q_load.pop()
-                except:
+            self._process_cancel()
+            # only keep a few requests in the pool queue, so the requests
+            # pushed later with a higher priority still get loaded first.
+            tasks = self.pool.tasks
+            while self._running and \
+                    tasks.unfinished_tasks < self._num_workers * 2:
+                parameters = self._pop_request()
+                if parameters is None:
                     return
                 self.pool.add_task(self._load, parameters)
 
-    Loader = LoaderThreadPool()
-    Logger.info('Loader: using a thread pool of {} workers'.format(
-        Loader.num_workers))
+    def _decode_image(filename, kwargs):
+        # executed in a worker process: decode the image, and return the raw
+        # pixels of all the ImageData. No texture is created here.
+        im = ImageLoader.load(filename, keep_data=True, **kwargs)
+        return [(imdata.fmt, imdata.source, imdata.flip_vertical,
+                 list(imdata.iterate_mipmaps())) for imdata in im._data]
+
+    class _ImageLoaderDecoded(ImageLoaderBase):
+        '''Image loader that recreates the ImageData decoded in a worker
+        process.
+        '''
+        def __init__(self, filename, decoded, **kwargs):
+            self._decoded = decoded
+            super(_ImageLoaderDecoded, self).__init__(filename, **kwargs)
+
+        def load(self, filename):
+            data = []
+            for fmt, source, flip_vertical, mipmaps in self._decoded:
+                level, width, height, pixels = mipmaps[0]
+                imdata = ImageData(width, height, fmt, pixels, source=source,
+                                   flip_vertical=flip_vertical)
+                for level, width, height, pixels in mipmaps[1:]:
+                    imdata.add_mipmap(level, width, height, pixels)
+                data.append(imdata)
+            self._decoded = None
+            return data
+
+    class LoaderProcessPool(LoaderThreadPool):
+        '''Loader decoding the local images in a pool of worker processes.
+        The threads of :class:`LoaderThreadPool` are still used for
+        downloading and for the callbacks, but they wait for the decoding
+        without holding the GIL.
+
+        .. versionadded:: 1.8.0
+        '''
+        def __init__(self):
+            super(LoaderProcessPool, self).__init__()
+            self.process_pool = None
+
+        def start(self):
+            from multiprocessing import Pool
+            self.process_pool = Pool(self._num_workers)
+            super(LoaderProcessPool, self).start()
+
+        def stop(self):
+            super(LoaderProcessPool, self).stop()
+            if self.process_pool is not None:
+                self.process_pool.close()
+                self.process_pool.join()
+                self.process_pool = None
+
+        def _load_local(self, filename, kwargs):
+            pool = self.process_pool
+            if pool is None or filename[:8] == 'atlas://':
+                return super(LoaderProcessPool, self)._load_local(
+                    filename, kwargs)
+            decoded = pool.apply(_decode_image, (filename, kwargs))
+            return _ImageLoaderDecoded(filename, decoded, keep_data=True,
+                                       **kwargs)
+
+    if environ.get('KIVY_LOADER') == 'process':
+        Loader = LoaderProcessPool()
+        Logger.info('Loader: using a process pool of {} workers'.format(
+            Loader.num_workers))
+    else:
+        Loader = LoaderThreadPool()
+        Logger.info('Loader: using a thread pool of {} workers'.format(
+            Loader.num_workers))
 
@@ -6,8 +6,14 @@ The Monitor module is a toolbar that shows the activity of your current
 application :
 
 * FPS
+* Graphics statistics of the last frame: draw calls, texture binds, buffer
+  uploads (glBufferData) and updates (glBufferSubData), shader switches and
+  uniform uploads. See :mod:`kivy.graphics.stats`.
 * Graph of input events
 
+.. versionchanged:: 1.8.0
+    The graphics statistics are shown.
+
 Usage
 -----
 
@@ -17,6 +23,7 @@ For normal module usage, please see the :mod:`~kivy.modules` documentation.
 
 from kivy.uix.label import Label
 from kivy.graphics import Rectangle, Color
+from kivy.graphics.stats import get_frame_stats
 from kivy.clock import Clock
 from kivy.input.postproc import kivy_postproc_modules
 from functools import partial
@@ -26,7 +33,13 @@ _maxinput = -1
 
 
 def update_fps(ctx, *largs):
-    ctx.label.text = 'FPS: %f' % Clock.get_fps()
+    stats = get_frame_stats()
+    ctx.label.text = ('FPS: %f - draws: %d, textures: %d, buffers: %d/%d, '
+                      'shaders: %d, uniforms: %d') % (
+                          Clock.get_fps(), stats['draw_calls'],
+                          stats['texture_binds'], stats['buffer_uploads'],
+                          stats['buffer_updates'], stats['shader_switches'],
+                          stats['uniform_uploads'])
     ctx.rectangle.texture = ctx.label.texture
     ctx.rectangle.size = ctx.label.texture_size
 
@@ -0,0 +1,308 @@
+'''
+Disk cache
+==========
+
+.. versionadded:: 1.8.0
+
+The :class:`DiskCache` stores downloaded files in a directory, so they can be
+reused across requests and application restarts. When a cached file is
+requested again, it is revalidated with the server using the `ETag` and
+`Last-Modified` headers of the original response: if the server answers
+`304 Not Modified`, the local file is used and nothing is downloaded.
+
+The total size of the cached files can be limited. When the limit is reached,
+the least recently used files are removed.
+
+The cache can be used by the :class:`~kivy.loader.Loader` for the remote
+images, and by :class:`~kivy.network.urlrequest.UrlRequest`::
+
+    from kivy.network.diskcache import DiskCache
+    from kivy.network.urlrequest import UrlRequest
+    from kivy.loader import Loader
+
+    cache = DiskCache('/path/to/cache', size_limit=50 * 1024 * 1024)
+
+    # remote images are now kept on disk
+    Loader.download_cache = cache
+
+    # the result of the request is stored in the cache too
+    req = UrlRequest('http://mysite.com/data.json', on_success, cache=cache)
+'''
+
+__all__ = ('DiskCache', )
+
+import json
+import shutil
+import threading
+from hashlib import sha1
+from os import makedirs, unlink, rename, close, write
+from os.path import join, exists, getsize, splitext
+from tempfile import mkstemp
+from time import time
+from kivy.logger import Logger
+from kivy.compat import PY2
+
+if PY2:
+    from urlparse import urlparse
+else:
+    from urllib.parse import urlparse
+
+
+class DiskCache(object):
+    '''Cache of downloaded files stored in a directory. See module
+    documentation for more information.
+
+    :Parameters:
+        `directory`: str
+            Directory where the files are stored. It is created if needed.
+        `size_limit`: int, defaults to None
+            Maximum size of the cached files, in bytes. If None, no limit is
+            applied.
+    '''
+
+    index_filename = 'index.json'
+
+    def __init__(self, directory, size_limit=None):
+        super(DiskCache, self).__init__()
+        self.directory = directory
+        self.size_limit = size_limit
+        self._lock = threading.RLock()
+        # url -> {'filename', 'size', 'etag', 'last_modified', 'expires',
+        #         'lastaccess'}
+        self._index = {}
+        self._size = 0
+        if not exists(directory):
+            makedirs(directory)
+        self._load_index()
+
+    @property
+    def size(self):
+        '''Size of the cached files, in bytes.
+        '''
+        return self._size
+
+    def get_filename(self, url):
+        '''Return the local filename of a cached url, or None if the url is
+        not in the cache.
+        '''
+        with self._lock:
+            entry = self._get_entry(url)
+            if entry is None:
+                return None
+            entry['lastaccess'] = time()
+            self.sync()
+            return join(self.directory, entry['filename'])
+
+    def is_fresh(self, url):
+        '''Return True if the cached url can be used without revalidation,
+        according to the `Cache-Control: max-age` header of the response.
+        '''
+        with self._lock:
+            entry = self._get_entry(url)
+            return entry is not None and entry['expires'] > time()
+
+    def get_validators(self, url):
+        '''Return the headers to add to a request for revalidating a cached
+        url (`If-None-Match` and `If-Modified-Since`). The dict is empty if
+        the url is not cached.
+        '''
+        headers = {}
+        with self._lock:
+            entry = self._get_entry(url)
+            if entry is not None:
+                if entry['etag']:
+                    headers['If-None-Match'] = entry['etag']
+                if entry['last_modified']:
+                    headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def put(self, url, data=None, filename=None, headers=None):
+        '''Store the content of an url in the cache, and return the local
+        filename.
+
+        :Parameters:
+            `url`: str
+                Url of the content
+            `data`: bytes
+                Content to store
+            `filename`: str
+                If `data` is None, the content is copied from this file
+            `headers`: dict or list of (key, value)
+                Headers of the response, used for revalidation
+        '''
+        fd, tmpfilename = mkstemp(prefix='download', dir=self.directory)
+        try:
+            if data is not None:
+                write(fd, data)
+                close(fd)
+            else:
+                close(fd)
+                shutil.copyfile(filename, tmpfilename)
+        except Exception:
+            unlink(tmpfilename)
+            raise
+
+        with self._lock:
+            self._remove_entry(url)
+            # keep the extension, the image loaders are selected with it
+            ext = splitext(urlparse(url).path)[1][:8]
+            entry = {
+                'filename': sha1(url.encode('utf8')).hexdigest() + ext,
+                'size': getsize(tmpfilename),
+                'lastaccess': time()}
+            self._update_validators(entry, headers)
+            local_filename = join(self.directory, entry['filename'])
+            if exists(local_filename):
+                unlink(local_filename)
+            rename(tmpfilename, local_filename)
+            self._index[url] = entry
+            self._size += entry['size']
+            self._purge(keep=url)
+            self.sync()
+        return local_filename
+
+    def touch(self, url, headers=None):
+        '''Mark a cached url as revalidated (the server answered 304), with the
+        headers of the response.
+        '''
+        with self._lock:
+            entry = self._get_entry(url)
+            if entry is None:
+                return
+            entry['lastaccess'] = time()
+            self._update_validators(entry, headers, keep=True)
+            self.sync()
+
+    def remove(self, url):
+        '''Remove an url from the cache.
+        '''
+        with self._lock:
+            self._remove_entry(url)
+            self.sync()
+
+    def clear(self):
+        '''Remove all the files from the cache.
+        '''
+        with self._lock:
+            for url in list(self._index.keys()):
+                self._remove_entry(url)
+            self.sync()
+
+    def sync(self):
+        '''Write the index of the cache on the disk. It is done automatically
+        when the content of the cache changes.
+        '''
+        with self._lock:
+            try:
+                fn = join(self.directory, self.index_filename)
+                with open(fn, 'w') as fd:
+                    json.dump(self._index, fd)
+            except Exception:
+                Logger.exception('DiskCache: unable to write the index')
+
+    def fetch(self, url, timeout=None):
+        '''Download an url in the cache if needed, and return the local
+        filename. If the url is cached, it is revalidated with the server,
+        unless it is still fresh.
+        '''
+        if PY2:
+            import urllib2 as urllib_request
+            from urllib2 import HTTPError
+        else:
+            import urllib.request as urllib_request
+            from urllib.error import HTTPError
+
+        if self.is_fresh(url):
+            filename = self.get_filename(url)
+            if filename is not None:
+                return filename
+
+        request = urllib_request.Request(url,
+                headers=self.get_validators(url))
+        args = {}
+        if timeout is not None:
+            args['timeout'] = timeout
+        try:
+            fd = urllib_request.urlopen(request, **args)
+        except HTTPError as e:
+            filename = self.get_filename(url)
+            if e.code != 304 or filename is None:
+                raise
+            self.touch(url, e.info().items())
+            return filename
+        try:
+            data = fd.read()
+            headers = fd.info().items()
+        finally:
+            fd.close()
+        return self.put(url, data=data, headers=headers)
+
+    def _get_entry(self, url):
+        entry = self._index.get(url)
+        if entry is None:
+            return None
+        if not exists(join(self.directory, entry['filename'])):
+            # the file have been removed behind our back
+            self._size -= entry['size']
+            del self._index[url]
+            return None
+        return entry
+
+    def _update_validators(self, entry, headers, keep=False):
+        headers = dict([(k.lower(), v)
+                        for k, v in dict(headers or {}).items()])
+        etag = headers.get('etag')
+        last_modified = headers.get('last-modified')
+        if not keep or etag:
+            entry['etag'] = etag
+        if not keep or last_modified:
+            entry['last_modified'] = last_modified
+        expires = 0
+        for directive in headers.get('cache-control', '').split(','):
+            directive = directive.strip().lower()
+            if directive in ('no-cache', 'no-store'):
+                expires = 0
+                break
+            if directive.startswith('max-age='):
+                try:
+                    expires = time() + int(directive[8:])
+                except ValueError:
+                    pass
+        entry['expires'] = expires
+
+    def _remove_entry(self, url):
+        entry = self._index.pop(url, None)
+        if entry is None:
+            return
+        self._size -= entry['size']
+        try:
+            unlink(join(self.directory, entry['filename']))
+        except OSError:
+            pass
+
+    def _purge(self, keep=None):
+        # remove the least recently used files, until we are within the limit
+        if self.size_limit is None or self._size <= self.size_limit:
+            return
+        entries = sorted(self._index.items(),
+                         key=lambda item: item[1]['lastaccess'])
+        for url, entry in entries:
+            if self._size <= self.size_limit:
+                break
+            if url != keep:
+                self._remove_entry(url)
+
+    def _load_index(self):
+        fn = join(self.directory, self.index_filename)
+        if not exists(fn):
+            return
+        try:
+            with open(fn) as fd:
+                index = json.load(fd)
+        except Exception:
+            Logger.exception('DiskCache: unable to read the index')
+            return
+        for url, entry in index.items():
+            if exists(join(self.directory, entry['filename'])):
+                self._index[url] = entry
+                self._size += entry['size']
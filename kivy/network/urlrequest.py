@@ -52,19 +52,35 @@ Example of Posting data (adapted from httplib example)::
 
 If you want a synchronous request, you can call the wait() method.
 
+.. versionchanged:: 1.8.0
+    The requests are not run in their own thread anymore, but dispatched on a
+    pool of threads shared by all the requests. The connections are kept alive
+    and reused by the next requests on the same host. The limits can be
+    changed with :data:`UrlRequest.max_workers`,
+    :data:`UrlRequest.max_requests_per_host` and
+    :data:`UrlRequest.max_idle_connections`.
+
+.. versionadded:: 1.8.0
+    The results of the GET requests can be stored on the disk by passing a
+    :class:`~kivy.network.diskcache.DiskCache` as `cache`. A cached result is
+    revalidated with the server, and is used if the server answers 304.
+
 '''
 
 from collections import deque
-from threading import Thread
+from threading import Thread, Condition, Event, Lock
+import socket
 from json import loads
-from time import sleep
+from time import sleep, time
+from os.path import getsize, exists
+import shutil
 from kivy.compat import PY2
 
 if PY2:
-    from httplib import HTTPConnection
+    from httplib import HTTPConnection, BadStatusLine
     from urlparse import urlparse
 else:
-    from http.client import HTTPConnection
+    from http.client import HTTPConnection, BadStatusLine
     from urllib.parse import urlparse
 
 try:
@@ -87,6 +103,94 @@ from kivy.logger import Logger
 g_requests = []
 
 
+class _ConnectionPool(object):
+    '''Idle keep-alive connections, by connection class, host, port and
+    timeout.
+    '''
+
+    def __init__(self):
+        super(_ConnectionPool, self).__init__()
+        self._lock = Lock()
+        self._idle = {}
+
+    def get(self, cls, host, port, args):
+        '''Return (connection, reused).
+        '''
+        key = (cls, host, port, args.get('timeout'))
+        with self._lock:
+            connections = self._idle.get(key)
+            if connections:
+                return connections.pop(), True
+        return cls(host, port, **args), False
+
+    def release(self, connection, cls, host, port, args):
+        key = (cls, host, port, args.get('timeout'))
+        with self._lock:
+            connections = self._idle.setdefault(key, [])
+            if len(connections) < UrlRequest.max_idle_connections:
+                connections.append(connection)
+                return
+        connection.close()
+
+
+class _RequestPool(object):
+    '''Pool of threads running the UrlRequest, with a limit of concurrent
+    requests per host.
+    '''
+
+    def __init__(self):
+        super(_RequestPool, self).__init__()
+        self._cond = Condition()
+        self._pending = deque()
+        self._active = {}
+        self._workers = 0
+        self._idle = 0
+
+    def add(self, request):
+        with self._cond:
+            self._pending.append(request)
+            # an idle worker stays idle until it wakes up, so a burst of
+            # requests needs a worker for each request pending
+            if (len(self._pending) > self._idle and
+                    self._workers < UrlRequest.max_workers):
+                self._workers += 1
+                worker = Thread(target=self._work)
+                worker.daemon = True
+                worker.start()
+            self._cond.notify()
+
+    def _next(self):
+        # must be called with the lock acquired
+        active = self._active
+        limit = UrlRequest.max_requests_per_host
+        for request in self._pending:
+            host = request._host
+            if active.get(host, 0) < limit:
+                self._pending.remove(request)
+                active[host] = active.get(host, 0) + 1
+                return request
+
+    def _work(self):
+        while True:
+            with self._cond:
+                request = self._next()
+                while request is None:
+                    self._idle += 1
+                    self._cond.wait()
+                    self._idle -= 1
+                    request = self._next()
+            try:
+                request.run()
+            finally:
+                with self._cond:
+                    self._active[request._host] -= 1
+                    self._cond.notify_all()
+
+
+_connection_pool = _ConnectionPool()
+_request_pool = _RequestPool()
+
+
 class UrlRequest(Thread):
     '''A UrlRequest. See module documentation for usage.
 
@@ -133,21 +237,60 @@ class UrlRequest(Thread):
         `debug`: bool, defaults to False
             If True, it will use the Logger.debug to print information about url
             access/progression/errors.
-        `file_path`: str, defaults to None
+        `file_path`: str or file object, defaults to None
             If set, the result of the UrlRequest will be written to this path
-            instead of in memory.
+            instead of in memory. It can also be a writable object (with a
+            `write()` method): the chunks are written into it as they are
+            received, and it is not closed at the end.
+        `resume`: bool, defaults to False
+            If True and `file_path` is the path of an existing file, only the
+            missing part of the file is requested (using a `Range` header), and
+            appended to it. If the server doesn't support ranges, the whole
+            file is downloaded again. The file is never modified by an error
+            response, like the 416 answered for an already complete file.
+        `progress_interval`: float, defaults to None
+            Minimum time in seconds between two `on_progress` events. If None,
+            `on_progress` is called after each chunk.
+        `cache`: :class:`~kivy.network.diskcache.DiskCache`, defaults to None
+            If set, the result of a GET request is stored in this cache, and
+            the cached result is used if the server answers 304 Not Modified.
+
+    .. versionchanged:: 1.8.0
+        The request is run in a shared pool of threads, instead of its own
+        thread.
 
     .. versionadded:: 1.8.0
         Parameter `decode` added.
         Parameter `file_path` added.
         Parameter `on_redirect` added.
         Parameter `on_failure` added.
+        Parameter `cache` added.
+        Parameter `resume` added.
+        Parameter `progress_interval` added.
     '''
 
+    #: Maximum number of threads used for running the requests.
+    #:
+    #: .. versionadded:: 1.8.0
+    max_workers = 8
+
+    #: Maximum number of requests running at the same time on the same host.
+    #: The other requests are waiting in the queue.
+    #:
+    #: .. versionadded:: 1.8.0
+    max_requests_per_host = 4
+
+    #: Maximum number of idle keep-alive connections kept for each host. Set
+    #: it to 0 for closing the connections after each request.
+    #:
+    #: .. versionadded:: 1.8.0
+    max_idle_connections = 4
+
     def __init__(self, url, on_success=None, on_redirect=None,
             on_failure=None, on_error=None, on_progress=None, req_body=None,
             req_headers=None, chunk_size=8192, timeout=None, method=None,
-            decode=True, debug=False, file_path=None):
+            decode=True, debug=False, file_path=None, cache=None,
+            resume=False, progress_interval=None):
         super(UrlRequest, self).__init__()
         self._queue = deque()
         self._trigger_result = Clock.create_trigger(self._dispatch_result, 0)
@@ -159,6 +302,10 @@ class UrlRequest(Thread):
         self.on_progress = WeakMethod(on_progress) if on_progress else None
         self.decode = decode
         self.file_path = file_path
+        self.cache = cache
+        self.resume = resume
+        self.progress_interval = progress_interval
+        self._from_cache = False
         self._debug = debug
         self._result = None
         self._error = None
@@ -172,6 +319,9 @@ class UrlRequest(Thread):
 
         #: Url of the request
         self.url = url
+        parse = urlparse(url)
+        self._host = (parse.scheme, parse.netloc)
+        self._finished_event = Event()
 
         #: Request body passed in __init__
         self.req_body = req_body
@@ -199,17 +349,27 @@ class UrlRequest(Thread):
         else:
             q(('success', resp, result))
 
-        # using trigger can result in a missed on_success event
+        # the request is removed from g_requests when the result is
+        # dispatched
         self._trigger_result()
+        self._finished_event.set()
 
-        # clean ourself when the queue is empty
-        while len(self._queue):
-            sleep(.1)
-            self._trigger_result()
+    def start(self):
+        '''Dispatch the request on the pool of threads. It is called
+        automatically when the request is created.
 
-        # ok, authorize the GC to clean us.
-        if self in g_requests:
-            g_requests.remove(self)
+        .. versionchanged:: 1.8.0
+            The request doesn't start its own thread anymore.
+        '''
+        _request_pool.add(self)
+
+    def join(self, timeout=None):
+        '''Wait until the request have been fetched (the result might not be
+        dispatched yet, see :meth:`wait`).
+
+        .. versionadded:: 1.8.0
+        '''
+        self._finished_event.wait(timeout)
 
     def _fetch_url(self, url, body, headers, q):
         # Parse and fetch the current url
@@ -218,6 +378,12 @@ class UrlRequest(Thread):
         report_progress = self.on_progress is not None
         timeout = self._timeout
         file_path = self.file_path
+        progress_interval = self.progress_interval
+        # file_path can be a path, or a writable object
+        file_obj = None
+        if file_path is not None and hasattr(file_path, 'write'):
+            file_obj, file_path = file_path, None
+        stream = file_path is not None or file_obj is not None
 
         if self._debug:
             Logger.debug('UrlRequest: {0} Fetch url <{1}>'.format(
@@ -240,11 +406,11 @@ class UrlRequest(Thread):
             port = int(host[1])
         host = host[0]
 
-        # create connection instance
+        # get a connection instance, reuse an idle one if possible
         args = {}
         if timeout is not None:
             args['timeout'] = timeout
-        req = cls(host, port, **args)
+        req, reused = _connection_pool.get(cls, host, port, args)
 
         # reconstruct path to pass on the request
         path = parse.path
@@ -259,26 +425,78 @@ class UrlRequest(Thread):
         method = self._method
         if method is None:
             method = 'GET' if body is None else 'POST'
-        req.request(method, path, body, headers or {})
-
-        # read header
-        resp = req.getresponse()
+        cache = self.cache if method == 'GET' else None
+        if cache is not None:
+            headers = dict(headers or {})
+            headers.update(cache.get_validators(url))
+
+        # resume the download of a partial file
+        offset = 0
+        if self.resume and file_path is not None and exists(file_path):
+            offset = getsize(file_path)
+            if offset:
+                headers = dict(headers or {})
+                headers['Range'] = 'bytes=%d-' % offset
+        try:
+            req.request(method, path, body, headers or {})
+
+            # read header
+            resp = req.getresponse()
+        except (BadStatusLine, socket.error):
+            if not reused:
+                raise
+            # the server closed the idle connection, retry with a new one
+            req.close()
+            req = cls(host, port, **args)
+            req.request(method, path, body, headers or {})
+            resp = req.getresponse()
+
+        # the server ignored the range, download everything
+        resumed = offset
+        if offset and resp.status != 206:
+            offset = 0
+
+        # not modified, use the cached result
+        if cache is not None and resp.status == 304:
+            cache_filename = cache.get_filename(url)
+            if cache_filename is not None:
+                resp.read()
+                self._release_connection(req, resp, cls, host, port, args)
+                cache.touch(url, resp.getheaders())
+                self._from_cache = True
+                if file_path is not None:
+                    shutil.copyfile(cache_filename, file_path)
+                    result = b''
+                elif file_obj is not None:
+                    with open(cache_filename, 'rb') as fd:
+                        shutil.copyfileobj(fd, file_obj)
+                    result = b''
+                else:
+                    with open(cache_filename, 'rb') as fd:
+                        result = fd.read()
+                if report_progress:
+                    size = getsize(cache_filename)
+                    q(('progress', resp, (0, size)))
+                    q(('progress', resp, (size, size)))
+                    trigger()
+                return result, resp
 
         # read content
-        if report_progress or file_path is not None:
+        if report_progress or stream:
             try:
-                total_size = int(resp.getheader('content-length'))
+                total_size = int(resp.getheader('content-length')) + offset
             except:
                 total_size = -1
 
             # before starting the download, send a fake progress to permit the
             # user to initialize his ui
             if report_progress:
-                q(('progress', resp, (0, total_size)))
+                q(('progress', resp, (offset, total_size)))
 
             def get_chunks(fd=None):
-                bytes_so_far = 0
-                result = b''
+                bytes_so_far = offset
+                chunks = []
+                last_report = time()
                 while 1:
                     chunk = resp.read(chunk_size)
                     if not chunk:
@@ -287,17 +505,31 @@ class UrlRequest(Thread):
                     if fd:
                         fd.write(chunk)
                     else:
-                        result += chunk
+                        chunks.append(chunk)
 
                     bytes_so_far += len(chunk)
                     # report progress to user
                     if report_progress:
+                        if progress_interval is not None:
+                            now = time()
+                            if now - last_report < progress_interval:
+                                continue
+                            last_report = now
                         q(('progress', resp, (bytes_so_far, total_size)))
                         trigger()
-                return bytes_so_far, result
-
-            if file_path is not None:
-                with open(file_path, 'wb') as fd:
+                return bytes_so_far, b''.join(chunks)
+
+            # only a successful response is written in the file: an error
+            # body (like 416 for an already complete file) is kept in memory
+            # and the file is left untouched. When resuming, the file is only
+            # rewritten if the server sent the whole content.
+            if resp.status // 100 != 2 or (
+                    resumed and resp.status not in (200, 206)):
+                bytes_so_far, result = get_chunks()
+            elif file_obj is not None:
+                bytes_so_far, result = get_chunks(file_obj)
+            elif file_path is not None:
+                with open(file_path, 'ab' if offset else 'wb') as fd:
                     bytes_so_far, result = get_chunks(fd)
             else:
                 bytes_so_far, result = get_chunks()
@@ -309,11 +541,26 @@ class UrlRequest(Thread):
                 trigger()
         else:
             result = resp.read()
-        req.close()
+        self._release_connection(req, resp, cls, host, port, args)
+
+        # the content written in a file object can't be cached
+        if cache is not None and resp.status == 200 and file_obj is None:
+            if file_path is not None:
+                cache.put(url, filename=file_path, headers=resp.getheaders())
+            else:
+                cache.put(url, data=result, headers=resp.getheaders())
 
         # return everything
         return result, resp
 
+    def _release_connection(self, req, resp, cls, host, port, args):
+        # the response have been read entirely, the connection can be reused
+        # if the server didn't ask to close it.
+        if resp.will_close or UrlRequest.max_idle_connections <= 0:
+            req.close()
+        else:
+            _connection_pool.release(req, cls, host, port, args)
+
     def get_connection_for_scheme(self, scheme):
         '''Return the Connection class for a particular scheme.
         This is an internal function that can be expanded to support custom
@@ -361,6 +608,9 @@ class UrlRequest(Thread):
                 self._resp_status = resp.status
             if result == 'success':
                 status_class = resp.status // 100
+                if self._from_cache:
+                    # 304, but we got the result from the cache
+                    status_class = 2
 
                 if status_class in (1, 2):
                     if self._debug:
@@ -419,6 +669,10 @@ class UrlRequest(Thread):
             else:
                 assert(0)
 
+            # ok, authorize the GC to clean us.
+            if self._is_finished and self in g_requests:
+                g_requests.remove(self)
+
     @property
     def is_finished(self):
         '''Return True if the request has finished, whether it's a
@@ -454,6 +708,15 @@ class UrlRequest(Thread):
         '''
         return self._error
 
+    @property
+    def from_cache(self):
+        '''Return True if the result has been read from the :data:`cache`,
+        because the server answered 304 Not Modified.
+
+        .. versionadded:: 1.8.0
+        '''
+        return self._from_cache
+
     @property
     def chunk_size(self):
         '''Return the size of a chunk, used only in "progress" mode (when
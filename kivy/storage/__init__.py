@@ -18,6 +18,8 @@ implementations such as:
 
 - :class:`kivy.storage.dictstore.DictStore`: use a python dict as a store
 - :class:`kivy.storage.jsonstore.JsonStore`: use a JSON file as a store
+- :class:`kivy.storage.logstore.LogStore`: use an append-only log file as a
+  store, for large stores that are often updated
 - :class:`kivy.storage.redistore.RedisStore`: use a `Redis <http://redis.io>`_
   database with `redis-py <https://github.com/andymccurdy/redis-py>`_
 
@@ -87,6 +89,25 @@ result)`::
 #. `entry` is the result of the lookup for the `key`.
 
 
+Indexes
+-------
+
+.. versionadded:: 1.8.0
+
+By default, :meth:`~AbstractStore.find` compares the filters with every entry
+of the store. If you often search on the same field, you can create an index
+on it: the keys are then grouped by value of the field, and a
+:meth:`~AbstractStore.find` with this field only looks at the matching
+entries::
+
+    store.create_index('name')
+
+    # only the entries with name == 'Gabriel' are read
+    key, tshirtman = next(store.find(name='Gabriel'))
+
+The indexes are kept in memory, and updated by the store methods. They are not
+updated if the data of the store is changed by other means.
+
 Synchronous container type
 --------------------------
 
@@ -125,6 +146,8 @@ class AbstractStore(EventDispatcher):
     '''
 
     def __init__(self, **kwargs):
+        # field -> (value -> set of keys, set of keys with unhashable value)
+        self._indexes = {}
         super(AbstractStore, self).__init__(**kwargs)
         self.store_load()
 
@@ -169,7 +192,9 @@ class AbstractStore(EventDispatcher):
     def put(self, key, **values):
         '''Put a new key/value in the storage
         '''
+        self._index_delete(key)
         need_sync = self.store_put(key, values)
+        self._index_put(key, values)
         if need_sync:
             self.store_sync()
         return need_sync
@@ -192,6 +217,7 @@ class AbstractStore(EventDispatcher):
     def delete(self, key):
         '''Delete a key from the storage. If the key is not found, a `KeyError`
         exception will be thrown.'''
+        self._index_delete(key)
         need_sync = self.store_delete(key)
         if need_sync:
             self.store_sync()
@@ -226,8 +252,12 @@ class AbstractStore(EventDispatcher):
             entries = list(store.find(name='Mathieu'))
             # get only the entry from (key, entry)
             entries = list((x[1] for x in store.find(name='Mathieu')))
+
+        .. versionchanged:: 1.8.0
+            If an index exists for one of the filters, only the entries
+            matching it are compared. See :meth:`create_index`.
         '''
-        return self.store_find(filters)
+        return self._find(filters)
 
     def async_find(self, callback, **filters):
         '''Asynchronous version of :meth:`find`.
@@ -247,6 +277,33 @@ class AbstractStore(EventDispatcher):
         self._schedule(self.store_find_async,
                 callback=callback, filters=filters)
 
+    def create_index(self, field):
+        '''Create an index on a field of the entries, used by :meth:`find` and
+        :meth:`async_find` when filtering on this field. The index is kept
+        in memory and updated on :meth:`put` and :meth:`delete`.
+
+        .. versionadded:: 1.8.0
+        '''
+        if field in self._indexes:
+            return
+        self._indexes[field] = ({}, set())
+        for key in list(self.store_keys()):
+            self._index_put(key, self.store_get(key), (field, ))
+
+    def drop_index(self, field):
+        '''Remove an index created with :meth:`create_index`.
+
+        .. versionadded:: 1.8.0
+        '''
+        self._indexes.pop(field, None)
+
+    def get_indexes(self):
+        '''Return the list of the indexed fields.
+
+        .. versionadded:: 1.8.0
+        '''
+        return list(self._indexes.keys())
+
     def keys(self):
         '''Return a list of all the keys in the storage
         '''
@@ -270,6 +327,7 @@ class AbstractStore(EventDispatcher):
     def clear(self):
         '''Wipe the whole storage.
         '''
+        self._index_clear()
         return self.store_clear()
 
     def async_clear(self, callback):
@@ -334,7 +392,7 @@ class AbstractStore(EventDispatcher):
         return len(self.store_keys())
 
     def store_clear(self):
-        for key in self.store_keys():
+        for key in list(self.store_keys()):
             self.store_delete(key)
 
     def store_get_async(self, key, callback):
@@ -346,7 +404,10 @@ class AbstractStore(EventDispatcher):
 
     def store_put_async(self, key, value, callback):
         try:
-            value = self.store_put(key, value)
+            self._index_delete(key)
+            values = value
+            value = self.store_put(key, values)
+            self._index_put(key, values)
             callback(self, key, value)
         except:
             callback(self, key, None)
@@ -360,13 +421,14 @@ class AbstractStore(EventDispatcher):
 
     def store_delete_async(self, key, callback):
         try:
+            self._index_delete(key)
             value = self.store_delete(key)
             callback(self, key, value)
         except:
             callback(self, key, None)
 
     def store_find_async(self, filters, callback):
-        for key, entry in self.store_find(filters):
+        for key, entry in self._find(filters):
             callback(self, filters, key, entry)
         callback(self, filters, None, None)
 
@@ -385,6 +447,7 @@ class AbstractStore(EventDispatcher):
             callback(self, [])
 
     def store_clear_async(self, callback):
+        self._index_clear()
         self.store_clear()
         callback(self)
 
@@ -392,6 +455,86 @@ class AbstractStore(EventDispatcher):
     # Privates
     #
 
+    def _find(self, filters):
+        # search the smallest set of candidates from the indexes, and fallback
+        # on the store implementation if no index can be used.
+        candidates = None
+        for field, value in filters.items():
+            index = self._indexes.get(field)
+            if index is None:
+                continue
+            try:
+                keys = index[0].get(value, ())
+            except TypeError:
+                # unhashable value, the index can't be used
+                continue
+            if index[1]:
+                keys = set(keys) | index[1]
+            if candidates is None or len(keys) < len(candidates):
+                candidates = keys
+        if candidates is None:
+            return self.store_find(filters)
+        return self._find_candidates(list(candidates), filters)
+
+    def _find_candidates(self, keys, filters):
+        for key in keys:
+            try:
+                values = self.store_get(key)
+            except KeyError:
+                continue
+            found = True
+            for fkey, fvalue in filters.items():
+                if fkey not in values:
+                    found = False
+                    break
+                if values[fkey] != fvalue:
+                    found = False
+                    break
+            if found:
+                yield key, values
+
+    def _index_put(self, key, values, fields=None):
+        indexes = self._indexes
+        if not indexes:
+            return
+        for field in fields or indexes.keys():
+            if field not in values:
+                continue
+            index, unhashable = indexes[field]
+            try:
+                keys = index.get(values[field])
+                if keys is None:
+                    keys = index[values[field]] = set()
+            except TypeError:
+                unhashable.add(key)
+                continue
+            keys.add(key)
+
+    def _index_delete(self, key):
+        indexes = self._indexes
+        if not indexes:
+            return
+        try:
+            values = self.store_get(key)
+        except KeyError:
+            return
+        for field, (index, unhashable) in indexes.items():
+            if field not in values:
+                continue
+            unhashable.discard(key)
+            try:
+                keys = index.get(values[field])
+            except TypeError:
+                continue
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del index[values[field]]
+
+    def _index_clear(self):
+        for field in self._indexes:
+            self._indexes[field] = ({}, set())
+
     def _schedule(self, callback, **kwargs):
         # XXX not entirely sure about the best value (0 or -1).
         Clock.schedule_once(partial(callback, **kwargs), 0)
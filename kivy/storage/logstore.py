@@ -0,0 +1,184 @@
+'''
+Log store
+=========
+
+.. versionadded:: 1.8.0
+
+Can be used to save/load key-value pairs from an append-only log file.
+
+Unlike the :class:`~kivy.storage.jsonstore.JsonStore`, the whole file is not
+rewritten each time the store changes: every :meth:`~AbstractStore.put` and
+:meth:`~AbstractStore.delete` appends one record at the end of the file. Only
+the keys are read when the store is loaded, the values are read from the file
+when they are requested.
+
+Old records of updated or deleted keys are removed from the file when the
+store is compacted. It is done automatically when the size of the obsolete
+records reaches `compact_ratio` of the file size, or manually with
+:meth:`LogStore.compact`.
+'''
+
+__all__ = ('LogStore', )
+
+
+from os import remove, rename
+from os.path import exists
+from json import loads, dumps
+from kivy.compat import iteritems
+from kivy.storage import AbstractStore
+
+try:
+    from os import replace as _replace
+except ImportError:
+    # Python 2: rename doesn't replace an existing file on Windows
+    def _replace(src, dst):
+        if exists(dst):
+            remove(dst)
+        rename(src, dst)
+
+
+class LogStore(AbstractStore):
+    '''Store implementation using an append-only log file for storing the
+    keys-value pairs. See the :mod:`kivy.storage` module documentation for
+    more information.
+
+    :Parameters:
+        `filename`: str
+            Filename of the log
+        `compact_ratio`: float, defaults to 0.5
+            Ratio of obsolete records in the file that triggers a compaction
+        `compact_min_size`: int, defaults to 65536
+            The file is never compacted automatically below this size, in
+            bytes
+    '''
+    def __init__(self, filename, compact_ratio=.5, compact_min_size=65536,
+                 **kwargs):
+        self.filename = filename
+        self.compact_ratio = compact_ratio
+        self.compact_min_size = compact_min_size
+        # key -> (record offset, record length, value offset, value length)
+        self._index = {}
+        self._fd = None
+        self._size = 0
+        self._live_size = 0
+        super(LogStore, self).__init__(**kwargs)
+
+    def compact(self):
+        '''Rewrite the log file with only the current value of each key.
+        '''
+        fd = self._fd
+        fd.flush()
+        tmpfilename = self.filename + '.compact'
+        index = {}
+        offset = 0
+        with open(tmpfilename, 'wb') as out:
+            for key, item in iteritems(self._index):
+                roffset, rlength, voffset, vlength = item
+                fd.seek(roffset)
+                out.write(fd.read(rlength))
+                index[key] = (offset, rlength, voffset - roffset + offset,
+                              vlength)
+                offset += rlength
+        fd.close()
+        _replace(tmpfilename, self.filename)
+        self._fd = open(self.filename, 'a+b')
+        self._index = index
+        self._size = self._live_size = offset
+
+    def store_load(self):
+        self._fd = fd = open(self.filename, 'a+b')
+        fd.seek(0)
+        index = self._index
+        offset = live_size = 0
+        for line in fd:
+            if not line.endswith(b'\n'):
+                # incomplete record, the last write was interrupted
+                break
+            length = len(line)
+            op = line[:1]
+            if op == b'P':
+                sep = line.index(b'\t', 2)
+                key = loads(line[2:sep].decode('utf8'))
+                if key in index:
+                    live_size -= index[key][1]
+                index[key] = (offset, length, offset + sep + 1,
+                              length - sep - 2)
+                live_size += length
+            elif op == b'D':
+                key = loads(line[2:-1].decode('utf8'))
+                if key in index:
+                    live_size -= index.pop(key)[1]
+            offset += length
+        fd.seek(0, 2)
+        if fd.tell() != offset:
+            fd.truncate(offset)
+        self._size = offset
+        self._live_size = live_size
+
+    def store_sync(self):
+        self._fd.flush()
+        size = self._size
+        if size > self.compact_min_size and \
+                size - self._live_size > size * self.compact_ratio:
+            self.compact()
+
+    def store_exists(self, key):
+        return key in self._index
+
+    def store_get(self, key):
+        roffset, rlength, voffset, vlength = self._index[key]
+        fd = self._fd
+        fd.seek(voffset)
+        return loads(fd.read(vlength).decode('utf8'))
+
+    def store_put(self, key, value):
+        record = 'P\t%s\t' % dumps(key)
+        voffset = self._size + len(record.encode('utf8'))
+        value = dumps(value).encode('utf8')
+        record = record.encode('utf8') + value + b'\n'
+        self._append(record)
+        if key in self._index:
+            self._live_size -= self._index[key][1]
+        self._index[key] = (self._size - len(record), len(record), voffset,
+                            len(value))
+        self._live_size += len(record)
+        return True
+
+    def store_delete(self, key):
+        item = self._index.pop(key)
+        self._live_size -= item[1]
+        self._append(('D\t%s\n' % dumps(key)).encode('utf8'))
+        return True
+
+    def store_find(self, filters):
+        for key in list(self._index.keys()):
+            values = self.store_get(key)
+            found = True
+            for fkey, fvalue in iteritems(filters):
+                if fkey not in values:
+                    found = False
+                    break
+                if values[fkey] != fvalue:
+                    found = False
+                    break
+            if found:
+                yield key, values
+
+    def store_count(self):
+        return len(self._index)
+
+    def store_keys(self):
+        return list(self._index.keys())
+
+    def store_clear(self):
+        fd = self._fd
+        fd.seek(0)
+        fd.truncate()
+        self._index = {}
+        self._size = self._live_size = 0
+
+    def _append(self, record):
+        fd = self._fd
+        fd.seek(0, 2)
+        fd.write(record)
+        self._size += len(record)
@@ -0,0 +1,87 @@
+'''
+Animation performance test
+==========================
+
+Measure the cost of a frame (:meth:`ClockBase.tick`) according to the number
+of concurrent animations, one per particle, with the shared animation driver
+and with the previous implementation (one Clock event per animation, values
+interpolated with :meth:`Animation._calculate`)::
+
+    python kivy/tests/perf_test_animation.py
+'''
+
+from kivy.animation import Animation
+from kivy.clock import Clock
+from kivy.event import EventDispatcher
+from kivy.properties import NumericProperty, ListProperty
+
+import timeit
+
+
+class Particle(EventDispatcher):
+    x = NumericProperty(0)
+    y = NumericProperty(0)
+    color = ListProperty([1, 1, 1, 1])
+
+
+class LegacyAnimation(Animation):
+    # Animation updated like before the shared driver
+
+    def _clock_install(self):
+        if self._clock_installed:
+            return
+        Clock.schedule_interval(self._update, self._step)
+        self._clock_installed = True
+
+    def _clock_uninstall(self):
+        if self._widgets or not self._clock_installed:
+            return
+        self._clock_installed = False
+        Clock.unschedule(self._update)
+
+    def _update(self, dt):
+        widgets = self._widgets
+        transition = self._transition
+        calculate = self._calculate
+        for uid in list(widgets.keys())[:]:
+            anim = widgets[uid]
+            widget = anim['widget']
+            if anim['time'] is None:
+                anim['time'] = 0.
+            else:
+                anim['time'] += dt
+            progress = min(1., anim['time'] / self._duration)
+            t = transition(progress)
+            for key, values in anim['properties'].items():
+                a, b = values
+                setattr(widget, key, calculate(a, b, t))
+            self.dispatch('on_progress', widget, progress)
+            if progress >= 1.:
+                self.stop(widget)
+
+
+def frame_cost(cls, count, frames=60):
+    Clock._max_fps = 0
+    particles = [Particle() for x in range(count)]
+    animations = []
+    for i, particle in enumerate(particles):
+        anim = cls(x=i, y=-i, color=[0, 0, 0, 1], d=3600., t='in_out_quad',
+                   s=0)
+        anim.start(particle)
+        animations.append(anim)
+    Clock.tick()
+
+    ttk = timeit.Timer(Clock.tick).timeit(frames)
+    for anim, particle in zip(animations, particles):
+        anim.cancel(particle)
+    return ttk / frames
+
+
+if __name__ in ('__main__', ):
+    print('------------------------------------------')
+    for count in (100, 1000, 5000):
+        legacy = frame_cost(LegacyAnimation, count)
+        shared = frame_cost(Animation, count)
+        print('%5d animations: %.3f ms per frame (previously %.3f ms)' % (
+            count, shared * 1000., legacy * 1000.))
+    print('------------------------------------------')
@@ -0,0 +1,38 @@
+'''
+Clock performance test
+======================
+
+Measure the cost of a frame (:meth:`ClockBase.tick`) according to the number
+of scheduled events. Only one event is due on each frame, all the others are
+scheduled far in the future::
+
+    python kivy/tests/perf_test_clock.py
+'''
+
+from kivy.clock import ClockBase
+
+import timeit
+
+
+def noop(dt):
+    pass
+
+
+def frame_cost(count, frames=100):
+    clock = ClockBase()
+    clock._max_fps = 0
+    events = [clock.schedule_once(noop, 3600.) for x in range(count)]
+    clock.schedule_interval(noop, 0)
+
+    t = timeit.Timer(clock.tick)
+    ttk = t.timeit(frames)
+    del events
+    return ttk / frames
+
+
+if __name__ in ('__main__', ):
+    print('------------------------------------------')
+    for count in (10, 1000, 100000):
+        print('%6d events: %.3f ms per frame' % (
+            count, frame_cost(count) * 1000.))
+    print('------------------------------------------')
@@ -0,0 +1,92 @@
+'''
+Kv language performance test
+============================
+
+Measure the time needed to load the default `style.kv`, when it is parsed and
+when the compiled rules are read from the :class:`~kivy.lang.ParserCache`.
+
+Then measure the cost of updating a form of 1000 fields, each field text
+depending on two properties of the form that both change on every frame, with
+and without :attr:`~kivy.lang.BuilderBase.delay_expressions`::
+
+    python kivy/tests/perf_test_lang.py
+'''
+
+from kivy import kivy_data_dir
+from kivy.lang import Builder, Parser, ParserCache
+from os.path import join
+
+import shutil
+import tempfile
+import timeit
+
+
+def load_time(filename, cache=None, count=20):
+    with open(filename) as fd:
+        content = fd.read()
+    t = timeit.Timer(lambda: Parser(content=content, filename=filename,
+                                    cache=cache))
+    return t.timeit(count) / count
+
+
+def form_update_time(delay, frames=20):
+    from kivy.factory import Factory
+
+    Builder.delay_expressions = delay
+    try:
+        form = Factory.PerfForm()
+    finally:
+        Builder.delay_expressions = False
+    rules = [x.properties['text'] for x in Builder.match(form)[-1].children]
+    evaluations = sum([x.count for x in rules])
+
+    def frame():
+        form.a += 1
+        form.b += 1
+        Builder.sync()
+
+    t = timeit.Timer(frame)
+    ttk = t.timeit(frames) / frames
+    evaluations = (sum([x.count for x in rules]) - evaluations) / frames
+    return ttk, evaluations
+
+
+def register_form(fields=1000):
+    from kivy.factory import Factory
+    from kivy.properties import NumericProperty, StringProperty
+    from kivy.uix.widget import Widget
+
+    class PerfField(Widget):
+        text = StringProperty('')
+
+    class PerfForm(Widget):
+        a = NumericProperty(0)
+        b = NumericProperty(0)
+
+    Factory.register('PerfField', cls=PerfField)
+    Factory.register('PerfForm', cls=PerfForm)
+    Builder.load_string('<PerfForm>:\n' + ''.join([
+        '    PerfField:\n'
+        '        text: "%d/%d" % (root.a, root.b)\n'] * fields))
+
+
+if __name__ in ('__main__', ):
+    filename = join(kivy_data_dir, 'style.kv')
+    directory = tempfile.mkdtemp()
+    try:
+        cache = ParserCache(directory)
+        # fill the cache
+        Parser(content=open(filename).read(), filename=filename, cache=cache)
+        print('------------------------------------------')
+        print('parsing:    %.3f ms' % (load_time(filename) * 1000.))
+        print('from cache: %.3f ms' % (load_time(filename, cache) * 1000.))
+        print('------------------------------------------')
+    finally:
+        shutil.rmtree(directory)
+
+    register_form()
+    for delay in (False, True):
+        ttk, evaluations = form_update_time(delay)
+        print('delay_expressions=%-5s: %.3f ms per frame, '
+              '%d evaluations per frame' % (delay, ttk * 1000., evaluations))
+    print('------------------------------------------')
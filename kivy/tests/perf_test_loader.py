@@ -0,0 +1,53 @@
+'''
+Loader performance test
+=======================
+
+Compare the decoding throughput of the thread loader and the process loader,
+by loading all the images of kivy/data several times::
+
+    python kivy/tests/perf_test_loader.py [count] [num_workers]
+'''
+
+import sys
+from os import walk
+from os.path import join
+from time import time
+
+from kivy import kivy_data_dir
+from kivy.loader import LoaderThreadPool, LoaderProcessPool
+
+
+def find_images():
+    filenames = []
+    for root, dirs, files in walk(kivy_data_dir):
+        for fn in files:
+            if fn.split('.')[-1].lower() in ('png', 'jpg'):
+                filenames.append(join(root, fn))
+    return filenames
+
+
+def throughput(loader_cls, filenames, num_workers):
+    loader = loader_cls()
+    loader.num_workers = num_workers
+    loader.start()
+    try:
+        start = time()
+        for fn in filenames:
+            loader.pool.add_task(loader._load_local, fn, {'nocache': True})
+        loader.pool.tasks.join()
+        return len(filenames) / (time() - start)
+    finally:
+        loader.stop()
+
+
+if __name__ in ('__main__', ):
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    num_workers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    filenames = find_images() * count
+    print('------------------------------------------')
+    print('Decoding %d images with %d workers' % (len(filenames),
+        num_workers))
+    for loader_cls in (LoaderThreadPool, LoaderProcessPool):
+        print('%-20s %.1f images/s' % (loader_cls.__name__,
+            throughput(loader_cls, filenames, num_workers)))
+    print('------------------------------------------')
@@ -42,7 +42,8 @@ class PerfApp(App, FloatLayout):
         super(PerfApp, self).__init__(**kwargs)
         self.tests = []
         tests = (self.load_large_text, self.stress_insert,
-            self.stress_del, self.stress_selection)
+            self.stress_del, self.stress_selection, self.load_large_buffer,
+            self.stress_edit_top, self.stress_backspace_top, self.stress_undo)
         for test in tests:
             but = type(self.but)(text=test.__name__)
             self.but.parent.add_widget(but)
@@ -157,6 +158,91 @@ class PerfApp(App, FloatLayout):
             Clock.schedule_once(pste)
         Clock.schedule_once(pste)
 
+    def load_large_buffer(self, *largs):
+        self.test_done = False
+        text = '\n'.join(['line %05d: the quick brown fox jumps over the lazy '
+                          'dog' % x for x in range(50000)])
+
+        def load_text(*l):
+            self.text_input.text = text
+
+        ttk = timeit.Timer(load_text).timeit(1)
+        self.text_input.reset_undo()
+        print('------------------------------------------')
+        print('Loaded', len(self.text_input._lines), 'lines', ttk, 'secs')
+        print('------------------------------------------')
+        self.test_done = True
+
+    def _report_edits(self, name, count, tot_time):
+        text_input = self.text_input
+        print('Done!')
+        print(name, count, 'times')
+        print('total lines in text input:', len(text_input._lines))
+        print('--------------------------------------')
+        print('total time elapsed:', tot_time)
+        print('time per edit:', tot_time / count)
+        print('--------------------------------------')
+
+    def stress_edit_top(self, *largs):
+        # type a word and a newline near the top of the large buffer
+        self.test_done = False
+        text_input = self.text_input
+        text_input.cursor = (0, 10)
+        self.edits = 0
+        self.tot_time = 0
+
+        def edit(*l):
+            if self.edits >= 200:
+                self._report_edits('inserted a line at the top', self.edits,
+                                   self.tot_time)
+                self.test_done = True
+                return
+
+            def insert():
+                text_input.insert_text(u'edit')
+                text_input.insert_text(u'\n')
+
+            self.tot_time += timeit.Timer(insert).timeit(1)
+            self.edits += 1
+            Clock.schedule_once(edit)
+        Clock.schedule_once(edit)
+
+    def stress_backspace_top(self, *largs):
+        self.test_done = False
+        text_input = self.text_input
+        text_input.cursor = (5, 20)
+        self.edits = 0
+        self.tot_time = 0
+
+        def edit(*l):
+            if self.edits >= 500:
+                self._report_edits('deleted a character at the top',
+                                   self.edits, self.tot_time)
+                self.test_done = True
+                return
+            self.tot_time += timeit.Timer(text_input.do_backspace).timeit(1)
+            self.edits += 1
+            Clock.schedule_once(edit)
+        Clock.schedule_once(edit)
+
+    def stress_undo(self, *largs):
+        # undo the edits of the previous tests
+        self.test_done = False
+        text_input = self.text_input
+        self.edits = 0
+        self.tot_time = 0
+
+        def edit(*l):
+            if not text_input._undo:
+                self._report_edits('undone an edit', max(1, self.edits),
+                                   self.tot_time)
+                self.test_done = True
+                return
+            self.tot_time += timeit.Timer(text_input.do_undo).timeit(1)
+            self.edits += 1
+            Clock.schedule_once(edit)
+        Clock.schedule_once(edit)
+
     def start_test(self, *largs):
         self.but.text = 'test started'
         self.slider.max = len(self.tests)
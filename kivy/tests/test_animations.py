@@ -61,6 +61,20 @@ class AnimationTestCase(unittest.TestCase):
         self.sleep(1.5)
         self.assertAlmostEqual(instruction.x, 100)
 
+    def test_shared_driver(self):
+        a2 = Animation(pos=(50, 60), size=[10, 20], d=1)
+        w2 = Widget()
+        self.a.start(self.w)
+        a2.start(w2)
+        driver = Animation._drivers[self.a._step]
+        self.assertTrue(self.a in driver.animations)
+        self.assertTrue(a2 in driver.animations)
+        self.sleep(1.5)
+        self.assertAlmostEqual(self.w.x, 100)
+        self.assertEqual(list(w2.pos), [50, 60])
+        self.assertEqual(list(w2.size), [10, 20])
+        self.assertFalse(driver.animations)
+
 
 class SequentialAnimationTestCase(unittest.TestCase):
 
@@ -0,0 +1,118 @@
+'''
+Cache tests
+===========
+'''
+
+import gc
+import unittest
+import weakref
+
+
+class Sized(object):
+
+    def __init__(self, cache_size):
+        self.cache_size = cache_size
+
+
+class CacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        from kivy.cache import Cache
+        Cache.register('test.cache', limit=3)
+        Cache.register('test.cache.size', size_limit=100)
+        Cache.register('test.cache.timeout', timeout=10)
+
+    def test_get(self):
+        from kivy.cache import Cache
+        Cache.append('test.cache', 'a', 1)
+        self.assertEqual(Cache.get('test.cache', 'a'), 1)
+        self.assertEqual(Cache.get('test.cache', 'b'), None)
+        self.assertEqual(Cache.get('test.cache', 'b', 2), 2)
+        stats = Cache.get_stats('test.cache')
+        self.assertEqual(stats['hits'], 1)
+        self.assertEqual(stats['misses'], 2)
+
+    def test_limit(self):
+        from kivy.cache import Cache
+        for key in 'abcde':
+            Cache.append('test.cache', key, key)
+        self.assertEqual(Cache.get('test.cache', 'a'), None)
+        self.assertEqual(Cache.get('test.cache', 'b'), None)
+        self.assertEqual(Cache.get('test.cache', 'c'), 'c')
+        stats = Cache.get_stats('test.cache')
+        self.assertEqual(stats['count'], 3)
+        self.assertEqual(stats['evictions'], 2)
+
+    def test_lru(self):
+        from kivy.cache import Cache
+        for key in 'abc':
+            Cache.append('test.cache', key, key)
+        # a is now the most recently used, b must be evicted first
+        Cache.get('test.cache', 'a')
+        Cache.append('test.cache', 'd', 'd')
+        self.assertEqual(Cache.get('test.cache', 'b'), None)
+        self.assertEqual(Cache.get('test.cache', 'a'), 'a')
+
+    def test_size_limit(self):
+        from kivy.cache import Cache
+        Cache.append('test.cache.size', 'a', Sized(40))
+        Cache.append('test.cache.size', 'b', Sized(40))
+        self.assertEqual(Cache.get_stats('test.cache.size')['size'], 80)
+        Cache.append('test.cache.size', 'c', None, size=40)
+        self.assertEqual(Cache.get('test.cache.size', 'a'), None)
+        self.assertEqual(Cache.get_stats('test.cache.size')['size'], 80)
+        Cache.remove('test.cache.size', 'b')
+        self.assertEqual(Cache.get_stats('test.cache.size')['size'], 40)
+        Cache.remove('test.cache.size')
+        self.assertEqual(Cache.get_stats('test.cache.size')['size'], 0)
+
+    def test_timeout(self):
+        from kivy.cache import Cache
+        from kivy.clock import Clock
+        start = Clock._last_tick
+        try:
+            Cache.append('test.cache.timeout', 'a', 'a')
+            Cache.append('test.cache.timeout', 'b', 'b')
+            Cache.append('test.cache.timeout', 'c', 'c', timeout=100)
+            Clock._last_tick = start + 5
+            Cache.get('test.cache.timeout', 'a')
+            Clock._last_tick = start + 11
+            Cache._purge_by_timeout()
+            self.assertEqual(Cache.get('test.cache.timeout', 'b'), None)
+            self.assertEqual(Cache.get('test.cache.timeout', 'a'), 'a')
+            Clock._last_tick = start + 22
+            Cache._purge_by_timeout()
+            self.assertEqual(Cache.get('test.cache.timeout', 'a'), None)
+            self.assertEqual(Cache.get('test.cache.timeout', 'c'), 'c')
+        finally:
+            Clock._last_tick = start
+
+    def test_timeout_removed(self):
+        from kivy.cache import Cache
+        from kivy.clock import Clock
+        start = Clock._last_tick
+        try:
+            # an object replaced by one without timeout is never expired
+            Cache.append('test.cache', 'a', 'a', timeout=5)
+            Cache.append('test.cache', 'a', 'b')
+            Clock._last_tick = start + 10
+            Cache._purge_by_timeout()
+            self.assertEqual(Cache.get('test.cache', 'a'), 'b')
+        finally:
+            Clock._last_tick = start
+
+    def test_timeout_release(self):
+        from kivy.cache import Cache
+        # the expiry index doesn't keep the replaced and removed objects alive
+        obj = Sized(1)
+        ref = weakref.ref(obj)
+        Cache.append('test.cache.timeout', 'a', obj)
+        Cache.append('test.cache.timeout', 'a', Sized(1))
+        obj2 = Sized(1)
+        ref2 = weakref.ref(obj2)
+        Cache.append('test.cache.timeout', 'b', obj2)
+        Cache.remove('test.cache.timeout', 'b')
+        del obj, obj2
+        gc.collect()
+        self.assertEqual(ref(), None)
+        self.assertEqual(ref2(), None)
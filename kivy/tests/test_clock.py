@@ -20,6 +20,8 @@ class ClockTestCase(unittest.TestCase):
         global counter
         counter = 0
         Clock._events = {}
+        Clock._heap = []
+        Clock._before_frame = []
 
     def test_schedule_once(self):
         from kivy.clock import Clock
@@ -73,3 +75,50 @@ class ClockTestCase(unittest.TestCase):
         Clock.unschedule(callback)
         Clock.tick()
         self.assertEqual(counter, 0)
+
+    def test_unschedule_event(self):
+        from kivy.clock import Clock
+        event = Clock.schedule_once(callback)
+        Clock.unschedule(event)
+        Clock.tick()
+        self.assertEqual(counter, 0)
+
+    def test_trigger(self):
+        from kivy.clock import Clock
+        trigger = Clock.create_trigger(callback)
+        trigger()
+        trigger()
+        Clock.tick()
+        self.assertEqual(counter, 1)
+        trigger()
+        Clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_trigger_cancel(self):
+        from kivy.clock import Clock
+        trigger = Clock.create_trigger(callback)
+        trigger()
+        trigger.cancel()
+        Clock.tick()
+        self.assertEqual(counter, 0)
+
+    def test_schedule_interval(self):
+        from kivy.clock import Clock
+        Clock.schedule_interval(callback, 0)
+        Clock.tick()
+        Clock.tick()
+        self.assertEqual(counter, 2)
+        Clock.unschedule(callback)
+        Clock.tick()
+        self.assertEqual(counter, 2)
+
+    def test_only_due_events(self):
+        from kivy.clock import Clock
+        for x in range(1000):
+            Clock.schedule_once(callback, 100.)
+        Clock.schedule_once(callback)
+        Clock.tick()
+        self.assertEqual(counter, 1)
+        self.assertEqual(Clock.get_events_count(), 1000)
+        Clock.unschedule(callback)
+        self.assertEqual(Clock.get_events_count(), 0)
@@ -0,0 +1,126 @@
+'''
+DiskCache tests
+===============
+'''
+
+import unittest
+import shutil
+import threading
+from tempfile import mkdtemp
+from time import sleep
+
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append(self.path)
+        if self.headers.get('If-None-Match') == server.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(len(server.content)))
+        self.send_header('ETag', server.etag)
+        self.end_headers()
+        self.wfile.write(server.content)
+
+    def log_message(self, *largs):
+        pass
+
+
+class DiskCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.server = HTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.requests = []
+        self.server.content = b'hello'
+        self.server.etag = '"1"'
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = 'http://127.0.0.1:%d/data.bin' % self.server.server_port
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.directory)
+
+    def read(self, filename):
+        with open(filename, 'rb') as fd:
+            return fd.read()
+
+    def test_fetch(self):
+        from kivy.network.diskcache import DiskCache
+        cache = DiskCache(self.directory)
+        filename = cache.fetch(self.url)
+        self.assertEqual(self.read(filename), b'hello')
+        self.assertTrue(filename.endswith('.bin'))
+
+        # revalidated, not downloaded again
+        self.assertEqual(cache.fetch(self.url), filename)
+        self.assertEqual(len(self.server.requests), 2)
+        self.assertEqual(self.read(filename), b'hello')
+
+        # changed on the server
+        self.server.content = b'world'
+        self.server.etag = '"2"'
+        filename = cache.fetch(self.url)
+        self.assertEqual(self.read(filename), b'world')
+
+    def test_persistent(self):
+        from kivy.network.diskcache import DiskCache
+        DiskCache(self.directory).fetch(self.url)
+        cache = DiskCache(self.directory)
+        self.assertEqual(cache.size, 5)
+        self.assertEqual(cache.get_validators(self.url),
+                         {'If-None-Match': '"1"'})
+
+    def test_persistent_lastaccess(self):
+        from kivy.network.diskcache import DiskCache
+        cache = DiskCache(self.directory)
+        cache.put('http://a/1', data=b'12345')
+        sleep(.01)
+        cache.put('http://a/2', data=b'12345')
+        sleep(.01)
+        cache.get_filename('http://a/1')
+        # the last access is saved in the index
+        cache = DiskCache(self.directory, size_limit=10)
+        cache.put('http://a/3', data=b'12345')
+        self.assertEqual(cache.get_filename('http://a/2'), None)
+        self.assertNotEqual(cache.get_filename('http://a/1'), None)
+
+    def test_size_limit(self):
+        from kivy.network.diskcache import DiskCache
+        cache = DiskCache(self.directory, size_limit=10)
+        cache.put('http://a/1', data=b'12345')
+        sleep(.01)
+        cache.put('http://a/2', data=b'12345')
+        sleep(.01)
+        cache.get_filename('http://a/1')
+        cache.put('http://a/3', data=b'12345')
+        self.assertEqual(cache.size, 10)
+        self.assertEqual(cache.get_filename('http://a/2'), None)
+        self.assertNotEqual(cache.get_filename('http://a/1'), None)
+
+    def test_urlrequest(self):
+        from kivy.network.diskcache import DiskCache
+        from kivy.network.urlrequest import UrlRequest
+        cache = DiskCache(self.directory)
+        req = UrlRequest(self.url, cache=cache)
+        req.wait(.05)
+        self.assertEqual(req.result, b'hello')
+        self.assertFalse(req.from_cache)
+
+        req = UrlRequest(self.url, cache=cache)
+        req.wait(.05)
+        self.assertEqual(req.resp_status, 304)
+        self.assertEqual(req.result, b'hello')
+        self.assertTrue(req.from_cache)
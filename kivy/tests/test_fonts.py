@@ -1,4 +1,5 @@
 #-*- coding: utf-8 -*-
+import gc
 import unittest
 
 
@@ -19,3 +20,61 @@ class FontTestCase(unittest.TestCase):
         lbl = Label(font_name=self.font_name)
         lbl.refresh()
         self.assertNotEqual(lbl.get_extents(''), None)
+
+    def test_shared_texture(self):
+        from kivy.core.text import Label
+        lbl = Label(text='shared text')
+        lbl.refresh()
+        lbl2 = Label(text='shared text')
+        lbl2.refresh()
+        self.assertTrue(lbl.texture is lbl2.texture)
+        stats = Label.get_cache_stats()
+        self.assertTrue(stats['shared'] >= 1)
+        self.assertTrue(stats['hits'] >= 1)
+
+        # changing the text of a label doesn't change the other one
+        lbl2.text = 'other text'
+        lbl2.refresh()
+        self.assertFalse(lbl.texture is lbl2.texture)
+
+        # a texture used by several labels is not rendered again with a new
+        # text, even by its last label: it can still be held elsewhere
+        texture = lbl.texture
+        lbl.text = 'shared texu'
+        lbl.refresh()
+        self.assertFalse(lbl.texture is texture)
+
+        # a texture never shared is rendered again if the size is the same
+        lbl3 = Label(text='1234')
+        lbl3.refresh()
+        texture = lbl3.texture
+        lbl3.text = '5678'
+        lbl3.refresh()
+        self.assertTrue(lbl3.texture is texture)
+
+        # the texture is released with its last label
+        count = Label.get_cache_stats()['count']
+        del lbl3
+        gc.collect()
+        self.assertEqual(Label.get_cache_stats()['count'], count - 1)
+        lbl4 = Label(text='5678')
+        lbl4.refresh()
+        self.assertFalse(lbl4.texture is texture)
+
+    def test_wrap_text(self):
+        from kivy.core.text import Label
+        lbl = Label(text='word ' * 50 + '\nlast line', text_size=(100, None))
+        lbl.refresh()
+        lines = lbl._lines
+        self.assertTrue(len(lines) > 2)
+        for size, last_line, words, widths in lines[:-2]:
+            self.assertTrue(size[0] <= 100)
+            self.assertFalse(last_line)
+            self.assertNotEqual(words[0], ' ')
+        self.assertEqual(lines[-1][1:3], (1, ['last', ' ', 'line']))
+
+        # only the new paragraph is wrapped again
+        lbl.text = lbl.text + '\nnew line'
+        lbl.refresh()
+        self.assertTrue(lbl._lines[0] is lines[0])
+        self.assertEqual(lbl._lines[-1][2], ['new', ' ', 'line'])
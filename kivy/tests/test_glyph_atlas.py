@@ -0,0 +1,44 @@
+'''
+Glyph atlas tests
+=================
+'''
+
+from kivy.tests.common import GraphicUnitTest
+
+
+class GlyphAtlasTestCase(GraphicUnitTest):
+
+    def test_glyph_label(self):
+        from kivy.core.text.glyph_atlas import GlyphAtlas, GlyphLabel
+
+        label = GlyphLabel(text='hello')
+        label.refresh()
+        self.assertEqual(label.texture, None)
+        meshes = label.get_meshes()
+        self.assertEqual(len(meshes), 1)
+        texture, vertices, indices = meshes[0]
+        self.assertEqual(len(indices), 5 * 6)
+        self.assertEqual(len(vertices), 5 * 4 * 4)
+
+        # the glyphs are shared by the labels with the same font
+        atlas = GlyphAtlas.get_atlas(label)
+        count = len(atlas.glyphs)
+        label2 = GlyphLabel(text='hole')
+        label2.refresh()
+        self.assertTrue(GlyphAtlas.get_atlas(label2) is atlas)
+        self.assertEqual(len(atlas.glyphs), count)
+        self.assertTrue(label2.get_meshes()[0][0] is texture)
+
+    def test_label_widget(self):
+        from kivy.uix.label import Label
+
+        wid = Label(text='Hello world', glyph_atlas=True)
+        wid.texture_update()
+        self.assertTrue(wid._glyph_group is not None)
+        self.assertNotEqual(wid.texture_size, [0, 0])
+        self.render(wid)
+
+        wid.glyph_atlas = False
+        wid.texture_update()
+        self.assertTrue(wid._glyph_group is None)
+        self.render(wid)
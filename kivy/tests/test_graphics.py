@@ -107,3 +107,143 @@ class FBOInstructionTestCase(unittest.TestCase):
         pygame.image.save(surface, "results.png")
 
 
+class BatchingTestCase(unittest.TestCase):
+
+    def test_batching(self):
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, Color, \
+            Rectangle
+        from kivy.graphics.stats import get_stats, reset_stats
+
+        fbo = Fbo(size=(64, 64))
+        rects = []
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+            for y in range(64):
+                Color(1, 0, 0)
+                rects.append(Rectangle(pos=(0, y), size=(32, 1)))
+
+        # all the rectangles are drawn in one call
+        reset_stats()
+        fbo.draw()
+        self.assertEqual(get_stats()['draw_calls'], 1)
+        self.assertEqual(fbo.get_pixel_color(16, 10), [255, 0, 0, 255])
+        self.assertEqual(fbo.get_pixel_color(48, 10), [0, 0, 0, 255])
+
+        # move one rectangle, the batch is updated
+        rects[10].pos = (32, 10)
+        fbo.draw()
+        self.assertEqual(fbo.get_pixel_color(16, 10), [0, 0, 0, 255])
+        self.assertEqual(fbo.get_pixel_color(48, 10), [255, 0, 0, 255])
+        self.assertEqual(fbo.get_pixel_color(16, 11), [255, 0, 0, 255])
+
+    def test_partial_primitive(self):
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, Color, Mesh
+
+        # the trailing index of the first mesh is ignored, and doesn't shift
+        # the line of the second mesh
+        fbo = Fbo(size=(64, 64))
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+            Color(1, 0, 0)
+            Mesh(vertices=[0, 10.5, 0, 0, 64, 10.5, 0, 0, 0, 0, 0, 0],
+                 indices=[0, 1, 2], mode='lines')
+            Mesh(vertices=[0, 20.5, 0, 0, 64, 20.5, 0, 0],
+                 indices=[0, 1], mode='lines')
+        fbo.draw()
+        self.assertEqual(fbo.get_pixel_color(32, 10), [255, 0, 0, 255])
+        self.assertEqual(fbo.get_pixel_color(32, 20), [255, 0, 0, 255])
+
+
+class MeshBufferTestCase(unittest.TestCase):
+
+    def test_mesh_buffer(self):
+        from array import array
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, Color, Mesh
+
+        fbo = Fbo(size=(64, 64))
+        vertices = array('f', [0, 0, 0, 0, 32, 0, 0, 0,
+                               32, 64, 0, 0, 0, 64, 0, 0])
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+            Color(0, 1, 0)
+            mesh = Mesh(vertices=vertices,
+                        indices=array('H', [0, 1, 2, 2, 3, 0]),
+                        mode='triangles')
+        self.assertIs(mesh.vertices, vertices)
+        fbo.draw()
+        self.assertEqual(fbo.get_pixel_color(16, 10), [0, 255, 0, 255])
+        self.assertEqual(fbo.get_pixel_color(48, 10), [0, 0, 0, 255])
+
+        # extend the right side of the mesh
+        mesh.update_vertices(1, array('f', [64, 0, 0, 0, 64, 64, 0, 0]))
+        self.assertEqual(vertices[4], 64)
+        fbo.draw()
+        self.assertEqual(fbo.get_pixel_color(48, 10), [0, 255, 0, 255])
+
+    def test_large_mesh(self):
+        from array import array
+        from kivy.graphics import Fbo, ClearColor, ClearBuffers, Color, Mesh
+
+        # 25000 triangles, only the last one is visible
+        fbo = Fbo(size=(64, 64))
+        count = 25000
+        vertices = array('f', [0, 0, 0, 0] * 3 * (count - 1) +
+                         [32, 0, 0, 0, 64, 0, 0, 0, 64, 64, 0, 0])
+        with fbo:
+            ClearColor(0, 0, 0, 1)
+            ClearBuffers()
+            Color(0, 0, 1)
+            Mesh(vertices=vertices, indices=range(count * 3),
+                 mode='triangles')
+        fbo.draw()
+        self.assertEqual(fbo.get_pixel_color(60, 10), [0, 0, 255, 255])
+        self.assertEqual(fbo.get_pixel_color(16, 10), [0, 0, 0, 255])
+
+
+class UniformUploadTestCase(unittest.TestCase):
+
+    def test_unchanged_uniforms(self):
+        from kivy.graphics import Fbo, Rectangle
+        from kivy.graphics.stats import get_stats, reset_stats
+
+        fbo = Fbo(size=(16, 16))
+        with fbo:
+            Rectangle(size=(16, 16))
+        fbo.draw()
+
+        # nothing changed, the program still have all the values
+        fbo.ask_update()
+        reset_stats()
+        fbo.draw()
+        self.assertEqual(get_stats()['uniform_uploads'], 0)
+
+        # only the new value is uploaded
+        fbo['opacity'] = 0.5
+        fbo.ask_update()
+        fbo.draw()
+        self.assertEqual(get_stats()['uniform_uploads'], 1)
+
+
+class GraphicsStatsTestCase(unittest.TestCase):
+
+    def test_frame_stats(self):
+        from kivy.graphics import Fbo, Rectangle
+        from kivy.graphics.stats import get_stats, reset_stats, end_frame, \
+            get_frame_stats
+
+        fbo = Fbo(size=(16, 16))
+        with fbo:
+            Rectangle(size=(16, 16))
+        reset_stats()
+        fbo.draw()
+        stats = get_stats()
+        self.assertEqual(stats['draw_calls'], 1)
+        self.assertEqual(stats['buffer_uploads'], 2)
+        self.assertTrue(stats['shader_switches'] >= 1)
+
+        end_frame()
+        self.assertEqual(get_frame_stats(), stats)
+        self.assertEqual(get_stats()['draw_calls'], 0)
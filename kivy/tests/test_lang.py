@@ -224,3 +224,117 @@ class LangTestCase(unittest.TestCase):
         self.assertTrue('on_press' in wid.binded_func)
         wid.binded_func['on_press']()
         self.assertEquals(wid.a, 1)
+
+    def test_parser_cache(self):
+        import os
+        import shutil
+        import tempfile
+        from kivy.lang import ParserCache
+        directory = tempfile.mkdtemp()
+        try:
+            fn = os.path.join(directory, 'test.kv')
+            with open(fn, 'w') as fd:
+                fd.write('<TestClass>:\n    obj: (1, 2)\n'
+                         '    TestClass2:\n        id: child\n'
+                         '        obj: root.obj\n')
+            cache = ParserCache(os.path.join(directory, 'kvcache'))
+
+            for x in range(2):
+                Builder = self.import_builder()
+                Builder.cache = cache
+                Builder.load_file(fn)
+                wid = TestClass()
+                Builder.apply(wid)
+                self.assertEqual(wid.obj, (1, 2))
+                self.assertEqual(wid.children[0].obj, (1, 2))
+            self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+            # a modified file must be parsed again
+            with open(fn, 'w') as fd:
+                fd.write('<TestClass>:\n    obj: (3, 4)\n')
+            os.utime(fn, (0, 0))
+            Builder = self.import_builder()
+            Builder.cache = cache
+            Builder.load_file(fn)
+            wid = TestClass()
+            Builder.apply(wid)
+            self.assertEqual(wid.obj, (3, 4))
+            self.assertEqual((cache.hits, cache.misses), (1, 2))
+        finally:
+            shutil.rmtree(directory)
+
+    def test_match_index(self):
+        Builder = self.import_builder()
+        Builder.load_string('''
+<TestClass,BaseClass>:
+    obj: 1
+<.special>:
+    obj: 2
+<#myid>:
+    obj: 3
+''')
+        wid = TestClass()
+        self.assertEqual(len(Builder.match(wid)), 2)
+        wid = TestClass2()
+        wid.cls = ['special']
+        wid.id = 'MyId'
+        self.assertEqual([x.properties['obj'].co_value
+                          for x in Builder.match(wid)], [1, 2, 3])
+
+        # loading a rule invalidates only the affected matches
+        wid = TestClass()
+        rules = Builder.match(wid)
+        Builder.load_string('<TestClass2>:\n    obj: 4\n')
+        self.assertTrue(Builder.match(wid) is rules)
+        Builder.load_string('<-TestClass>:\n    obj: 5\n')
+        self.assertEqual([x.properties['obj'].co_value
+                          for x in Builder.match(wid)], [5])
+        wid = TestClass2()
+        self.assertEqual([x.properties['obj'].co_value
+                          for x in Builder.match(wid)], [1, 4])
+
+    def test_profile(self):
+        Builder = self.import_builder()
+        Builder.load_string('''
+<TestClass>:
+    obj: self.a
+    on_press: self.a = 2
+''')
+        Builder.start_profiling()
+        try:
+            wid = TestClass()
+            wid.a = 1
+            Builder.apply(wid)
+            wid.binded_func['on_press']()
+            stats = dict([(x['kind'], x) for x in Builder.get_profile()])
+            self.assertEqual(set(stats.keys()),
+                             set(['rule', 'expression', 'handler']))
+            self.assertEqual(stats['expression']['name'], 'obj')
+            self.assertEqual(stats['expression']['line'], 3)
+            self.assertEqual(stats['handler']['count'], 1)
+        finally:
+            Builder.stop_profiling()
+        self.assertEqual(Builder.get_profile(), [])
+
+    def test_delay_expressions(self):
+        Builder = self.import_builder()
+        Builder.delay_expressions = True
+        Builder.load_string('''
+<TestClass>:
+    obj: '%s/%s' % (self.a, self.b)
+''')
+        wid = TestClass()
+        wid.a = wid.b = 1
+        Builder.apply(wid)
+        self.assertEqual(wid.obj, '1/1')
+        rule = Builder.match(wid)[0].properties['obj']
+        count = rule.count
+
+        # both changes are evaluated once, in the next sync
+        wid.a = wid.b = 2
+        wid.binded_func['a'](wid, 2)
+        wid.binded_func['b'](wid, 2)
+        self.assertEqual(wid.obj, '1/1')
+        Builder.sync()
+        self.assertEqual(wid.obj, '2/2')
+        self.assertEqual(rule.count, count + 1)
@@ -26,6 +26,44 @@ class StorageTestCase(unittest.TestCase):
         finally:
             unlink(tmpfn)
 
+    def test_log_storage(self):
+        from kivy.storage.logstore import LogStore
+        from tempfile import mkstemp
+        from os import unlink, close
+
+        try:
+            tmpfd, tmpfn = mkstemp('.log')
+            close(tmpfd)
+            self._do_store_test_empty(LogStore(tmpfn))
+            self._do_store_test_filled(LogStore(tmpfn))
+            store = LogStore(tmpfn, compact_min_size=0)
+            store.put('key1', name='Compacted')
+            store.compact()
+            store = LogStore(tmpfn)
+            self.assertTrue(store.count() == 3)
+            self.assertTrue(store.get('key1').get('name') == 'Compacted')
+        finally:
+            unlink(tmpfn)
+
+    def test_dict_storage_index(self):
+        from kivy.storage.dictstore import DictStore
+        store = DictStore({})
+        store.create_index('attr1')
+        self._do_store_test_empty(store)
+        store.create_index('name')
+        self.assertTrue(sorted(store.get_indexes()) == ['attr1', 'name'])
+        store.put('key1', name='Name1', attr1='Changed')
+        self.assertTrue(len(list(store.find(attr1='Common'))) == 2)
+        self.assertTrue(list(store.find(attr1='Changed'))[0][0] == 'key1')
+        store.delete('key2')
+        self.assertTrue(len(list(store.find(attr1='Common'))) == 1)
+        store.put('key4', name=['unhashable'], attr1='Common')
+        self.assertTrue(
+            list(store.find(name=['unhashable']))[0][0] == 'key4')
+        self.assertTrue(list(store.find(name='Name3'))[0][0] == 'key3')
+        store.clear()
+        self.assertTrue(len(list(store.find(attr1='Common'))) == 0)
+
     def test_redis_storage(self):
         try:
             from kivy.storage.redisstore import RedisStore
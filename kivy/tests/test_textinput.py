@@ -0,0 +1,74 @@
+'''
+TextInput tests
+===============
+'''
+
+import unittest
+
+
+class TextInputTestCase(unittest.TestCase):
+
+    def test_line_index(self):
+        from random import Random
+        from kivy.uix.textinput import _LineIndex
+
+        rnd = Random(0)
+        sizes = [rnd.randint(1, 40) for x in range(1000)]
+        index = _LineIndex(sizes)
+
+        def check():
+            self.assertEqual(index.count, len(sizes))
+            self.assertEqual(index.total, sum(sizes))
+            offset = 0
+            for row, size in enumerate(sizes):
+                self.assertEqual(index.get_offset(row), offset)
+                self.assertEqual(index.get_row(offset + size), (row, offset))
+                offset += size
+
+        check()
+        for x in range(200):
+            start = rnd.randint(0, len(sizes))
+            finish = min(len(sizes), start + rnd.randint(0, 3))
+            new_sizes = [rnd.randint(1, 40) for y in range(rnd.randint(0, 3))]
+            sizes[start:finish] = new_sizes
+            index.splice(start, finish, new_sizes)
+            row = rnd.randint(0, len(sizes) - 1)
+            sizes[row] = rnd.randint(1, 40)
+            index.set(row, sizes[row])
+        check()
+
+    def test_cursor_index(self):
+        from kivy.uix.textinput import TextInput
+
+        text = u'\n'.join([u'line %d' % x for x in range(500)])
+        ti = TextInput(text=text)
+        for index in (0, 1, 6, 7, 100, 1000, len(text)):
+            ti.cursor = ti.get_cursor_from_index(index)
+            self.assertEqual(ti.cursor_index(), index)
+
+        # edit near the top
+        ti.cursor = (0, 10)
+        ti.insert_text(u'new\n')
+        self.assertEqual(ti.text,
+                         text.replace(u'line 10\n', u'new\nline 10\n', 1))
+        self.assertEqual(ti.cursor_index(), text.index(u'line 10') + 4)
+        ti.do_undo()
+        self.assertEqual(ti.text, text)
+
+    def test_lines_window(self):
+        from kivy.uix.textinput import TextInput
+
+        text = u'\n'.join([u'line %d' % x for x in range(1000)])
+        ti = TextInput(text=text, size=(200, 100), lines_margin=5)
+        ti._update_graphics()
+        usage = ti.get_memory_usage()
+        self.assertEqual(usage['lines'], 1000)
+        self.assertTrue(0 < usage['rendered'] < 50)
+        self.assertTrue(ti._lines_labels[999] is None)
+
+        # scroll to the end, the first lines are released
+        ti.cursor = (0, 999)
+        ti._update_graphics()
+        self.assertTrue(ti._lines_labels[0] is None)
+        self.assertTrue(ti._lines_labels[999] is not None)
+        self.assertTrue(ti.get_memory_usage()['rendered'] < 50)
@@ -12,11 +12,81 @@ except ImportError:
     # py27
     import thread as _thread
 
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+    from socketserver import ThreadingMixIn
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+    from SocketServer import ThreadingMixIn
+
+import threading
+from io import BytesIO
+from os import unlink, close
+from tempfile import mkstemp
 from kivy.network.urlrequest import UrlRequest
-from time import sleep
+from time import sleep, time
 from kivy.clock import Clock
 
 
+class _KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self.server.clients.add(self.client_address)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *largs):
+        pass
+
+
+class _SlowHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        sleep(.5)
+        self.send_response(200)
+        self.send_header('Content-Length', '2')
+        self.end_headers()
+        self.wfile.write(b'ok')
+
+    def log_message(self, *largs):
+        pass
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    content = b'0123456789' * 100
+
+    def do_GET(self):
+        content = self.content
+        start = 0
+        header = self.headers.get('Range')
+        if header:
+            start = int(header.split('=')[1].split('-')[0])
+            if start >= len(content):
+                body = b'range not satisfiable'
+                self.send_response(416)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            self.send_response(206)
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', str(len(content) - start))
+        self.end_headers()
+        self.wfile.write(content[start:])
+
+    def log_message(self, *largs):
+        pass
+
+
+class _ThreadingServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
 class UrlRequestTest(unittest.TestCase):
 
     def _on_success(self, req, *args):
@@ -64,3 +134,94 @@ class UrlRequestTest(unittest.TestCase):
 
         self.assertEqual(self.queue[0][2][0], 0)
         self.assertEqual(self.queue[-2][2][0], self.queue[-2][2][1])
+
+    def test_keep_alive(self):
+        server = _ThreadingServer(('127.0.0.1', 0), _KeepAliveHandler)
+        server.clients = set()
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        try:
+            url = 'http://127.0.0.1:%d/' % server.server_port
+            reqs = [UrlRequest(url) for x in range(20)]
+            for req in reqs:
+                req.wait(.01)
+                self.assertEqual(req.result, b'ok')
+            # the connections have been reused
+            self.assertTrue(
+                len(server.clients) <= UrlRequest.max_requests_per_host)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_concurrency(self):
+        server = _ThreadingServer(('127.0.0.1', 0), _SlowHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        try:
+            url = 'http://127.0.0.1:%d/' % server.server_port
+            # leave an idle worker in the pool
+            UrlRequest(url).join()
+            start = time()
+            reqs = [UrlRequest(url)
+                    for x in range(UrlRequest.max_requests_per_host)]
+            for req in reqs:
+                req.join()
+            # the requests have been run at the same time
+            self.assertTrue(time() - start < 1.5)
+            for req in reqs:
+                req.wait(.01)
+                self.assertEqual(req.result, b'ok')
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_stream(self):
+        server = _ThreadingServer(('127.0.0.1', 0), _RangeHandler)
+        thread = threading.Thread(target=server.serve_forever)
+        thread.daemon = True
+        thread.start()
+        fd, filename = mkstemp()
+        close(fd)
+        try:
+            url = 'http://127.0.0.1:%d/' % server.server_port
+            content = _RangeHandler.content
+
+            # write in a file object
+            self.queue = []
+            out = BytesIO()
+            req = UrlRequest(url, file_path=out, chunk_size=10,
+                             on_progress=self._on_progress,
+                             progress_interval=3600)
+            req.wait(.01)
+            self.assertEqual(out.getvalue(), content)
+            self.assertEqual(req.result, b'')
+            # initial, throttled and final progress
+            self.assertTrue(len(self.queue) <= 3)
+            self.assertEqual(self.queue[-1][2], (1000, 1000))
+
+            # resume a partial file
+            with open(filename, 'wb') as fd:
+                fd.write(content[:300])
+            self.queue = []
+            req = UrlRequest(url, file_path=filename, resume=True,
+                             on_progress=self._on_progress)
+            req.wait(.01)
+            self.assertEqual(req.resp_status, 206)
+            self.assertEqual(self.queue[0][2], (300, 1000))
+            with open(filename, 'rb') as fd:
+                self.assertEqual(fd.read(), content)
+
+            # resume a complete file: the 416 error is not written in it
+            req = UrlRequest(url, file_path=filename, resume=True,
+                             on_progress=self._on_progress)
+            req.wait(.01)
+            self.assertEqual(req.resp_status, 416)
+            self.assertEqual(req.result, b'range not satisfiable')
+            with open(filename, 'rb') as fd:
+                self.assertEqual(fd.read(), content)
+        finally:
+            server.shutdown()
+            server.server_close()
+            unlink(filename)
@@ -152,6 +152,56 @@ class bench_button_creation_with_tick:
         Clock.tick()
 
 
+class bench_label_creation_glyph_atlas_with_tick:
+    '''Core: label creation (10000 * 10 a-z), glyph atlas, with Clock.tick'''
+
+    def __init__(self):
+        labels = []
+        for x in range(10000):
+            label = [chr(randint(ord('a'), ord('z'))) for x in range(10)]
+            labels.append(''.join(label))
+        self.labels = labels
+
+    def run(self):
+        o = []
+        for x in self.labels:
+            o.append(Label(text=x, glyph_atlas=True))
+        # tick for texture creation
+        Clock.tick()
+
+
+class bench_label_text_update:
+    '''Core: label text update (500 labels * 10 texts), with drawing'''
+
+    glyph_atlas = False
+
+    def __init__(self):
+        self.ctx = RenderContext()
+        self.root = root = Widget()
+        for x in range(500):
+            root.add_widget(Label(glyph_atlas=self.glyph_atlas))
+        self.ctx.add(root.canvas)
+        texts = []
+        for x in range(10):
+            text = [chr(randint(ord('a'), ord('z'))) for x in range(10)]
+            texts.append(''.join(text))
+        self.texts = texts
+
+    def run(self):
+        for text in self.texts:
+            for label in self.root.children:
+                label.text = text
+            # tick for texture creation, draw for the texture upload
+            Clock.tick()
+            self.ctx.draw()
+
+
+class bench_label_text_update_glyph_atlas(bench_label_text_update):
+    '''Core: label text update (500 labels * 10 texts), glyph atlas'''
+
+    glyph_atlas = True
+
+
 if __name__ == '__main__':
 
     report = []
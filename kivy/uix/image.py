@@ -299,6 +299,9 @@ class AsyncImage(Image):
 
     def _load_source(self, *args):
         source = self.source
+        if self._coreimage is not None:
+            # don't load the previous source if it is still queued
+            self._coreimage.cancel()
         if not source:
             if self._coreimage is not None:
                 self._coreimage.unbind(on_texture=self._on_tex_change)
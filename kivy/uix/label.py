@@ -96,6 +96,17 @@ For prettier rendering, you could add a color for the reference. Replace the
 
     'Hello [ref=world][color=0000ff]World[/color][/ref]'
 
+Glyph atlas
+-----------
+
+.. versionadded:: 1.8.0
+
+By default, each label renders its text into its own texture. When a lot of
+labels are displayed or their text changes often, you can set
+:data:`Label.glyph_atlas` to True: the glyphs are then rendered once in a
+texture shared by all the labels using the same font, and the text is drawn
+from it. See :mod:`kivy.core.text.glyph_atlas` for the limitations.
+
 '''
 
 __all__ = ('Label', )
@@ -105,6 +116,9 @@ from kivy.clock import Clock
 from kivy.uix.widget import Widget
 from kivy.core.text import Label as CoreLabel
 from kivy.core.text.markup import MarkupLabel as CoreMarkupLabel
+from kivy.core.text.glyph_atlas import GlyphLabel as CoreGlyphLabel
+from kivy.graphics import InstructionGroup, Mesh, PushMatrix, PopMatrix, \
+        Translate
 from kivy.properties import StringProperty, OptionProperty, \
         NumericProperty, BooleanProperty, ReferenceListProperty, \
         ListProperty, ObjectProperty, DictProperty
@@ -122,7 +136,7 @@ class Label(Widget):
 
     _font_properties = ('text', 'font_size', 'font_name', 'bold', 'italic',
         'halign', 'valign', 'padding_x', 'padding_y', 'text_size', 'shorten',
-        'mipmap', 'markup', 'line_height')
+        'mipmap', 'markup', 'line_height', 'glyph_atlas')
 
     def __init__(self, **kwargs):
         self._trigger_texture = Clock.create_trigger(self.texture_update, -1)
@@ -137,6 +151,7 @@ class Label(Widget):
         self.bind(**dkw)
 
         self._label = None
+        self._glyph_group = None
         self._create_label()
 
         # force the texture creation
@@ -148,20 +163,21 @@ class Label(Widget):
             cls = self._label.__class__
         else:
             cls = None
-        markup = self.markup
-        if (markup and cls is not CoreMarkupLabel) or \
-           (not markup and cls is not CoreLabel):
+        if self.markup:
+            new_cls = CoreMarkupLabel
+        elif self.glyph_atlas:
+            new_cls = CoreGlyphLabel
+        else:
+            new_cls = CoreLabel
+        if cls is not new_cls:
             # markup have change, we need to change our rendering method.
             d = Label._font_properties
             dkw = dict(list(zip(d, [getattr(self, x) for x in d])))
-            if markup:
-                self._label = CoreMarkupLabel(**dkw)
-            else:
-                self._label = CoreLabel(**dkw)
+            self._label = new_cls(**dkw)
 
     def _trigger_texture_update(self, name=None, source=None, value=None):
         # check if the label core class need to be switch to a new one
-        if name == 'markup':
+        if name in ('markup', 'glyph_atlas'):
             self._create_label()
         if source:
             if name == 'text':
@@ -197,12 +213,49 @@ class Label(Widget):
                 self._label.text = text
                 self.refs = self._label.refs
                 self.anchors = self._label.anchors
+            elif self._label.__class__ is CoreGlyphLabel:
+                self._label.refresh()
+                # the text is drawn by our meshes, the texture is transparent
+                self.texture = self._label.texture_1px
+                self.texture_size = list(self._label.size)
+                self._update_glyphs()
+                return
             else:
                 self._label.refresh()
             texture = self._label.texture
             if texture is not None:
                 self.texture = self._label.texture
                 self.texture_size = list(self.texture.size)
+        self._remove_glyphs()
+
+    def _update_glyphs(self):
+        group = self._glyph_group
+        if group is None:
+            self._glyph_group = group = InstructionGroup()
+            self._glyph_translate = Translate()
+            self.canvas.add(group)
+            self.bind(pos=self._update_glyphs_pos,
+                      size=self._update_glyphs_pos)
+        group.clear()
+        group.add(PushMatrix())
+        group.add(self._glyph_translate)
+        for texture, vertices, indices in self._label.get_meshes():
+            group.add(Mesh(vertices=vertices, indices=indices,
+                           mode='triangles', texture=texture))
+        group.add(PopMatrix())
+        self._update_glyphs_pos()
+
+    def _update_glyphs_pos(self, *largs):
+        tw, th = self.texture_size
+        self._glyph_translate.xy = (int(self.center_x - tw / 2.),
+                                    int(self.center_y - th / 2.))
+
+    def _remove_glyphs(self):
+        if self._glyph_group is None:
+            return
+        self.canvas.remove(self._glyph_group)
+        self.unbind(pos=self._update_glyphs_pos, size=self._update_glyphs_pos)
+        self._glyph_group = None
 
     def on_touch_down(self, touch):
         if super(Label, self).on_touch_down(touch):
@@ -467,6 +520,20 @@ class Label(Widget):
     to False.
     '''
 
+    glyph_atlas = BooleanProperty(False)
+    '''
+    .. versionadded:: 1.8.0
+
+    If True, the text will be rendered using the
+    :class:`~kivy.core.text.glyph_atlas.GlyphLabel`: the glyphs are taken
+    from a texture shared by all the labels with the same font, instead of
+    rendering the whole text in a new texture. :data:`texture` is then a
+    transparent texture of one pixel. It is ignored if :data:`markup` is True.
+
+    :data:`glyph_atlas` is a :class:`~kivy.properties.BooleanProperty` and
+    defaults to False.
+    '''
+
     refs = DictProperty({})
     '''
     .. versionadded:: 1.1.0
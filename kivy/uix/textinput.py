@@ -135,7 +135,7 @@ Cache_register = Cache.register
 Cache_append = Cache.append
 Cache_get = Cache.get
 Cache_remove = Cache.remove
-Cache_register('textinput.label', timeout=60.)
+Cache_register('textinput.label', size_limit=16 * 1024 * 1024)
 Cache_register('textinput.width', timeout=60.)
 
 FL_IS_NEWLINE = 0x01
@@ -244,6 +244,152 @@ class TextInputCutCopyPaste(Bubble):
             anim.start(self.but_selectall)
 
 
+class _LineIndex(object):
+    # Length of each line of a TextInput, including its leading newline. The
+    # lengths are grouped in blocks, with two binary indexed trees on the
+    # number of lines and the number of characters of the blocks: the offset
+    # of a row, or the row at an offset, is found in O(log n), and changing
+    # the lines only updates the blocks around them.
+
+    block_size = 64
+
+    def __init__(self, sizes=()):
+        super(_LineIndex, self).__init__()
+        self.reset(sizes)
+
+    def reset(self, sizes):
+        sizes = list(sizes)
+        size = self.block_size
+        self._blocks = [sizes[i:i + size]
+                        for i in range(0, len(sizes), size)] or [[]]
+        self._rebuild()
+
+    @property
+    def count(self):
+        '''Number of lines.'''
+        return self._count
+
+    @property
+    def total(self):
+        '''Number of characters.'''
+        return self._total
+
+    def get_offset(self, row):
+        '''Return the offset of the first character of a row.'''
+        if row >= self._count:
+            return self._total
+        block, count, offset = self._find(self._counts, row, False)
+        return offset + sum(self._blocks[block][:row - count])
+
+    def get_row(self, offset):
+        '''Return (row, row offset) of the first row ending at or after the
+        offset, or (number of lines, total) if there is none.
+        '''
+        if offset > self._total:
+            return self._count, self._total
+        block, row, start = self._find(self._totals, offset, True)
+        for size in self._blocks[block]:
+            if start + size >= offset:
+                break
+            start += size
+            row += 1
+        return row, start
+
+    def set(self, row, size):
+        '''Set the length of a row.'''
+        block, count, offset = self._find(self._counts, row, False)
+        sizes = self._blocks[block]
+        delta = size - sizes[row - count]
+        if not delta:
+            return
+        sizes[row - count] = size
+        self._total += delta
+        self._add(self._totals, block, delta)
+
+    def splice(self, start, finish, sizes):
+        '''Replace the rows from `start` to `finish` (excluded) with rows of
+        the given lengths.
+        '''
+        blocks = self._blocks
+        counts = self._counts
+        first, first_row = self._find(counts, start, False)[:2]
+        if first == len(blocks):
+            # append after the last row
+            first -= 1
+            first_row -= len(blocks[first])
+        if finish > start:
+            last = self._find(counts, finish - 1, False)[0]
+        else:
+            last = first
+        merged = []
+        for block in blocks[first:last + 1]:
+            merged.extend(block)
+        removed = merged[start - first_row:finish - first_row]
+        merged[start - first_row:finish - first_row] = sizes
+        size = self.block_size
+        if len(merged) < size // 2 and last + 1 < len(blocks):
+            # merge the small blocks with the next one
+            last += 1
+            merged.extend(blocks[last])
+        if len(merged) > size * 2:
+            merged = [merged[i:i + size]
+                      for i in range(0, len(merged), size)]
+        elif merged or len(blocks) == last - first + 1:
+            merged = [merged]
+        else:
+            merged = []
+        if len(merged) != last - first + 1:
+            blocks[first:last + 1] = merged
+            self._rebuild()
+            return
+        # same number of blocks, only update the trees
+        for i, block in enumerate(merged, first):
+            self._add(self._counts, i, len(block) - len(blocks[i]))
+            self._add(self._totals, i, sum(block) - sum(blocks[i]))
+            blocks[i] = block
+        self._count += len(sizes) - len(removed)
+        self._total += sum(sizes) - sum(removed)
+
+    def _add(self, tree, block, delta):
+        i = block + 1
+        n = len(tree)
+        while i < n:
+            tree[i] += delta
+            i += i & -i
+
+    def _rebuild(self):
+        blocks = self._blocks
+        n = len(blocks)
+        self._counts = counts = [0] + [len(x) for x in blocks]
+        self._totals = totals = [0] + [sum(x) for x in blocks]
+        self._count = sum(counts)
+        self._total = sum(totals)
+        for i in range(1, n + 1):
+            j = i + (i & -i)
+            if j <= n:
+                counts[j] += counts[i]
+                totals[j] += totals[i]
+        self._step = 1 << (n.bit_length() - 1)
+
+    def _find(self, tree, value, strict):
+        # descend the tree, and return (block, rows before the block,
+        # characters before the block) for the block containing value
+        counts = self._counts
+        totals = self._totals
+        n = len(tree) - 1
+        block = row = offset = 0
+        step = self._step
+        while step:
+            i = block + step
+            if i <= n and (tree[i] < value if strict else tree[i] <= value):
+                block = i
+                value -= tree[i]
+                row += counts[i]
+                offset += totals[i]
+            step >>= 1
+        return block, row, offset
+
+
 class TextInput(Widget):
     '''TextInput class. See module documentation for more information.
 
@@ -284,6 +430,10 @@ class TextInput(Widget):
         self._lines_flags = []
         self._lines_labels = []
         self._lines_rects = []
+        self._lines_index = _LineIndex()
+        # rows having a label, and rectangles ready to be reused
+        self._lines_window = (0, 0)
+        self._lines_rects_pool = []
         self._hint_text_flags = []
         self._hint_text_labels = []
         self._hint_text_rects = []
@@ -345,12 +495,7 @@ class TextInput(Widget):
                 return 0
             lf = self._lines_flags
             index, cr = self.cursor
-            for row in range(cr):
-                if row >= len(l):
-                    continue
-                index += len(l[row])
-                if lf[row] & FL_IS_NEWLINE:
-                    index += 1
+            index += self._lines_index.get_offset(cr)
             if lf[cr] & FL_IS_NEWLINE:
                 index += 1
             return index
@@ -373,21 +518,16 @@ class TextInput(Widget):
     def get_cursor_from_index(self, index):
         '''Return the (row, col) of the cursor from text index.
         '''
-        index = boundary(index, 0, len(self.text))
+        lines_index = self._lines_index
+        index = boundary(index, 0, lines_index.total)
         if index <= 0:
             return 0, 0
-        lf = self._lines_flags
-        l = self._lines
-        i = 0
-        for row in range(len(l)):
-            ni = i + len(l[row])
-            if lf[row] & FL_IS_NEWLINE:
-                ni += 1
-                i += 1
-            if ni >= index:
-                return index - i, row
-            i = ni
-        return index, row
+        row, i = lines_index.get_row(index)
+        if row >= len(self._lines):
+            return index, len(self._lines) - 1
+        if self._lines_flags[row] & FL_IS_NEWLINE:
+            i += 1
+        return index - i, row
 
     def select_text(self, start, end):
         ''' Select portion of text displayed in this TextInput.
@@ -1127,14 +1267,21 @@ class TextInput(Widget):
     def _delete_line(self, idx):
         # Delete current line, and fix cursor position
         assert(idx < len(self._lines))
+        self._splice_lines_window(idx, idx + 1, 0)
+        self._lines_index.splice(idx, idx + 1, ())
         self._lines_flags.pop(idx)
         self._lines_labels.pop(idx)
+        self._lines_rects.pop(idx)
         self._lines.pop(idx)
         self.cursor = self.cursor
 
     def _set_line_text(self, line_num, text):
         # Set current line with other text than the default one.
         self._lines_labels[line_num] = self._create_line_label(text)
+        first, last = self._lines_window
+        self._lines_window = min(first, line_num), max(last, line_num + 1)
+        self._lines_index.set(line_num, len(text) +
+                              (self._lines_flags[line_num] & FL_IS_NEWLINE))
         self._lines[line_num] = text
 
     def _trigger_refresh_line_options(self, *largs):
@@ -1162,7 +1309,11 @@ class TextInput(Widget):
         self._refresh_text_from_property(*largs)
 
     def _refresh_text_from_property(self, *largs):
-        self._refresh_text(self._get_text(encode=False), *largs)
+        if len(largs) > 1:
+            # only some lines are refreshed, they are already in largs
+            self._refresh_text(None, *largs)
+        else:
+            self._refresh_text(self._get_text(encode=False), *largs)
 
     def _refresh_text(self, text, *largs):
         # Refresh all the lines from a new text.
@@ -1173,20 +1324,20 @@ class TextInput(Widget):
             #start = max(0, start)
         else:
             _lines, self._lines_flags = self._split_smart(text)
-        _lines_labels = []
-        _line_rects = []
-        _create_label = self._create_line_label
-
-        for x in _lines:
-            lbl = _create_label(x)
-            _lines_labels.append(lbl)
-            _line_rects.append(
-                Rectangle(size=(lbl.size if lbl else (0, 0))))
-            lbl = None
+        # only the first line is rendered now, for the line height. The
+        # others are rendered when they are displayed, see _update_graphics()
+        _lines_labels = [None] * len(_lines)
+        _line_rects = [None] * len(_lines)
+        if _lines:
+            _lines_labels[0] = self._create_line_label(_lines[0])
 
         if mode == 'all':
             self._lines_labels = _lines_labels
             self._lines_rects = _line_rects
+            self._lines_window = (0, 1)
+            self._lines_index.reset([
+                len(line) + (flags & FL_IS_NEWLINE)
+                for line, flags in zip(_lines, self._lines_flags)])
             self._lines = _lines
         elif mode == 'del':
             if finish > start:
@@ -1203,7 +1354,7 @@ class TextInput(Widget):
                                 len_lines, _lines_flags, _lines, _lines_labels,
                                 _line_rects)
 
-        line_label = _lines_labels[0]
+        line_label = _lines_labels[0] if _lines_labels else None
         min_line_ht = self._label_cached.get_extents('_')[1]
         if line_label is None:
             self.line_height = max(1, min_line_ht)
@@ -1224,39 +1375,81 @@ class TextInput(Widget):
 
     def _insert_lines(self, start, finish, len_lines, _lines_flags, _lines,
         _lines_labels, _line_rects):
-            self_lines_flags = self._lines_flags
-            _lins_flags = []
-            _lins_flags.extend(self_lines_flags[:start])
+            # replace the lines in place, instead of rebuilding the lists
             if len_lines:
                 # if not inserting at first line then
                 if start:
                     # make sure line flags restored for first line
                     # _split_smart assumes first line to be not a new line
-                    _lines_flags[0] = self_lines_flags[start]
-                _lins_flags.extend(_lines_flags)
-            _lins_flags.extend(self_lines_flags[finish:])
-            self._lines_flags = _lins_flags
+                    _lines_flags[0] = self._lines_flags[start]
+            else:
+                _lines_flags = _lines = _lines_labels = _line_rects = []
+            self._splice_lines_window(start, finish, len(_lines))
+            self._lines_flags[start:finish] = _lines_flags
+            self._lines_labels[start:finish] = _lines_labels
+            self._lines_rects[start:finish] = _line_rects
+            self._lines_index.splice(start, finish, [
+                len(line) + (flags & FL_IS_NEWLINE)
+                for line, flags in zip(_lines, _lines_flags)])
+            self._lines[start:finish] = _lines
+
+    def _splice_lines_window(self, start, finish, len_lines):
+        # the rows from start to finish are replaced by len_lines new rows:
+        # recycle their rectangles, and keep all the rows having a label in
+        # the window
+        pool = self._lines_rects_pool
+        for rect in self._lines_rects[start:finish]:
+            if rect is not None:
+                pool.append(rect)
+        first, last = self._lines_window
+        delta = len_lines - finish + start
+        self._lines_window = (min(first, start),
+                              max(last, last + delta, start + len_lines))
+
+    def _update_lines_window(self, first, last):
+        # release the labels of the rows outside of the new window, and
+        # render the ones inside
+        labels = self._lines_labels
+        rects = self._lines_rects
+        pool = self._lines_rects_pool
+        old_first, old_last = self._lines_window
+        for row in range(old_first, min(old_last, len(labels))):
+            if first <= row < last:
+                continue
+            labels[row] = None
+            rect = rects[row]
+            if rect is not None:
+                rects[row] = None
+                pool.append(rect)
+        lines = self._lines
+        create_label = self._create_line_label
+        for row in range(first, last):
+            if labels[row] is None:
+                labels[row] = create_label(lines[row])
+        self._lines_window = (first, last)
 
-            _lins_lbls = []
-            _lins_lbls.extend(self._lines_labels[:start])
-            if len_lines:
-                _lins_lbls.extend(_lines_labels)
-            _lins_lbls.extend(self._lines_labels[finish:])
-            self._lines_labels = _lins_lbls
+    def get_memory_usage(self):
+        '''Return a dict with the memory used by the rendered lines:
 
-            _lins_rcts = []
-            _lins_rcts.extend(self._lines_rects[:start])
-            if len_lines:
-                _lins_rcts.extend(_line_rects)
-            _lins_rcts.extend(self._lines_rects[finish:])
-            self._lines_rects = _lins_rcts
+            - `lines`: number of lines of the text
+            - `rendered`: number of lines currently rendered in a texture
+            - `size`: size of their textures, in bytes
+            - `cache_size`: size of the `textinput.label` cache, shared by all
+              the TextInput, in bytes
 
-            _lins = []
-            _lins.extend(self._lines[:start])
-            if len_lines:
-                _lins.extend(_lines)
-            _lins.extend(self._lines[finish:])
-            self._lines = _lins
+        Only the lines within the viewport, and :data:`lines_margin` lines
+        around it, are rendered.
+
+        .. versionadded:: 1.8.0
+        '''
+        first, last = self._lines_window
+        textures = set([x for x in self._lines_labels[first:last]
+                        if x is not None])
+        return {
+            'lines': len(self._lines),
+            'rendered': last - first,
+            'size': sum([x.cache_size for x in textures]),
+            'cache_size': Cache.get_stats('textinput.label')['size']}
 
     def _trigger_update_graphics(self, *largs):
         Clock.unschedule(self._update_graphics)
@@ -1298,7 +1491,19 @@ class TextInput(Widget):
         y = self.top - padding_top + sy
         miny = self.y + padding_bottom
         maxy = self.top - padding_top
-        for line_num, value in enumerate(lines):
+
+        # only go through the lines within the viewport
+        first = max(0, int((y - maxy - dy) / dy))
+        last = min(len(lines), int((y - miny) / dy) + 2)
+        virtual = lines is self._lines
+        if virtual:
+            margin = int(self.lines_margin)
+            self._update_lines_window(max(0, first - margin),
+                                      min(len(lines), last + margin))
+        pool = self._lines_rects_pool
+        y -= first * dy
+
+        for line_num in range(first, last):
             if miny <= y <= maxy + dy:
                 texture = labels[line_num]
                 if not texture:
@@ -1353,6 +1558,8 @@ class TextInput(Widget):
 
                 # add rectangle.
                 r = rects[line_num]
+                if r is None:
+                    r = rects[line_num] = pool.pop() if pool else Rectangle()
                 r.pos = int(x), int(y - mlh)
                 r.size = size
                 r.texture = texture
@@ -1397,8 +1604,8 @@ class TextInput(Widget):
         canvas_add = self.canvas.add
         selection_color = self.selection_color
         for line_num, value in enumerate(_lines[s1r:s2r], start=s1r):
-            if miny <= y <= maxy + dy:
-                r = rects[line_num]
+            r = rects[line_num]
+            if miny <= y <= maxy + dy and r is not None:
                 draw_selection(r.pos, r.size, line_num, (s1c, s1r),
                     (s2c, s2r - 1), _lines, _get_text_width, tab_width,
                     _label_cached, width, padding_left, padding_right, x,
@@ -1905,6 +2112,17 @@ class TextInput(Widget):
     0.
     '''
 
+    lines_margin = NumericProperty(20)
+    '''Number of lines rendered above and below the viewport, ready to be
+    displayed when the text is scrolled. The other lines are not rendered
+    until they are displayed, and their textures are released.
+
+    .. versionadded:: 1.8.0
+
+    :data:`lines_margin` is a :class:`~kivy.properties.NumericProperty`,
+    default to 20.
+    '''
+
     selection_color = ListProperty([0.1843, 0.6549, 0.8313, .5])
     '''Current color of the selection, in (r, g, b, a) format.
 
@@ -312,6 +312,7 @@ def determine_graphics_pxd():
         'graphics/instructions.pxd',
         'graphics/opengl_utils.pxd',
         'graphics/shader.pxd',
+        'graphics/stats.pxd',
         'graphics/texture.pxd',
         'graphics/transformation.pxd',
         'graphics/vbo.pxd',
@@ -348,6 +349,7 @@ sources = {
             base_flags, gl_flags, graphics_flags),
     'graphics/shader.pyx': merge(
             base_flags, gl_flags, graphics_flags),
+    'graphics/stats.pyx': base_flags,
     'graphics/stencil_instructions.pyx': merge(
             base_flags, gl_flags, graphics_flags),
     'graphics/texture.pyx': merge(